@@ -0,0 +1,64 @@
+"""
+Benchmark prices_to_df against the original list-of-dicts conversion.
+
+Usage:
+    poetry run python benchmarks/bench_prices_to_df.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tools.api import prices_to_df
+
+
+def legacy_prices_to_df(prices):
+    df = pd.DataFrame(prices)
+    df["Date"] = pd.to_datetime(df["time"])
+    df.set_index("Date", inplace=True)
+    numeric_cols = ["open", "close", "high", "low", "volume"]
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df.sort_index(inplace=True)
+    return df
+
+
+def make_prices(n):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    times = pd.date_range("1980-01-01", periods=n, freq="D").strftime("%Y-%m-%dT%H:%M:%SZ")
+    return [
+        {
+            "time": t,
+            "open": float(c * 0.99),
+            "close": float(c),
+            "high": float(c * 1.01),
+            "low": float(c * 0.98),
+            "volume": int(v),
+        }
+        for t, c, v in zip(times, close, rng.integers(1e5, 1e7, n))
+    ]
+
+
+def bench(label, fn, prices, repeat):
+    best = min(timeit.repeat(lambda: fn(prices), number=1, repeat=repeat))
+    print(f"  {label:<22} {best * 1000:9.2f} ms")
+    return best
+
+
+if __name__ == "__main__":
+    for n, repeat in [(10_000, 20), (100_000, 5)]:
+        prices = make_prices(n)
+        pd.testing.assert_frame_equal(
+            prices_to_df(prices), legacy_prices_to_df(prices), check_like=True
+        )
+        print(f"{n:,} bars")
+        legacy = bench("legacy", legacy_prices_to_df, prices, repeat)
+        fast = bench("prices_to_df", prices_to_df, prices, repeat)
+        fast32 = bench("prices_to_df float32", lambda p: prices_to_df(p, np.float32), prices, repeat)
+        print(f"  speedup: {legacy / fast:.1f}x (float64), {legacy / fast32:.1f}x (float32)")
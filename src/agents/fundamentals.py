@@ -6,6 +6,22 @@ import json
 
 from tools.api import get_financial_metrics
 
+# Thresholds of the fundamental checks, overridable through data["fundamentals_thresholds"]
+FUNDAMENTALS_THRESHOLDS = {
+    "return_on_equity": 0.15,  # Strong ROE above 15%
+    "net_margin": 0.20,  # Healthy profit margins
+    "operating_margin": 0.15,  # Strong operating efficiency
+    "revenue_growth": 0.10,  # 10% revenue growth
+    "earnings_growth": 0.10,  # 10% earnings growth
+    "book_value_growth": 0.10,  # 10% book value growth
+    "current_ratio": 1.5,  # Strong liquidity
+    "debt_to_equity": 0.5,  # Conservative debt levels
+    "fcf_conversion": 0.8,  # Strong FCF conversion, as a fraction of EPS
+    "price_to_earnings_ratio": 25,  # Reasonable P/E ratio
+    "price_to_book_ratio": 3,  # Reasonable P/B ratio
+    "price_to_sales_ratio": 5,  # Reasonable P/S ratio
+}
+
 
 ##### Fundamental Agent #####
 def fundamentals_agent(state: AgentState):
@@ -24,6 +40,57 @@ def fundamentals_agent(state: AgentState):
     # Pull the most recent financial metrics
     metrics = financial_metrics[0]
 
+    overall_signal, confidence, reasoning = score_fundamentals(
+        metrics, data.get("fundamentals_thresholds")
+    )
+
+    message_content = {
+        "signal": overall_signal,
+        "confidence": confidence,
+        "reasoning": reasoning,
+    }
+
+    # Create the fundamental analysis message
+    message = HumanMessage(
+        content=json.dumps(message_content),
+        name="fundamentals_agent",
+    )
+
+    # Print the reasoning if the flag is set
+    if state["metadata"]["show_reasoning"]:
+        show_agent_reasoning(message_content, "Fundamental Analysis Agent")
+
+    # Add the signal to the analyst_signals list
+    state["data"]["analyst_signals"]["fundamentals_agent"] = {
+        "signal": overall_signal,
+        "confidence": confidence,
+        "reasoning": reasoning,
+    }
+
+    return {
+        "messages": [message],
+        "data": data,
+    }
+
+
+def score_fundamentals(metrics, thresholds=None):
+    """
+    Score profitability, growth, financial health and price ratios of a report.
+
+    Args:
+        metrics: Financial metrics, as returned by get_financial_metrics
+        thresholds: Overrides of FUNDAMENTALS_THRESHOLDS
+
+    Returns:
+        tuple: Overall signal, confidence (0-100) and reasoning by aspect
+    """
+    limits = FUNDAMENTALS_THRESHOLDS
+    if thresholds:
+        unknown = set(thresholds) - set(FUNDAMENTALS_THRESHOLDS)
+        if unknown:
+            raise ValueError(f"Unknown fundamentals thresholds: {', '.join(sorted(unknown))}")
+        limits = {**FUNDAMENTALS_THRESHOLDS, **thresholds}
+
     # Initialize signals list for different fundamental aspects
     signals = []
     reasoning = {}
@@ -34,9 +101,9 @@ def fundamentals_agent(state: AgentState):
     operating_margin = metrics.get("operating_margin")
 
     thresholds = [
-        (return_on_equity, 0.15),  # Strong ROE above 15%
-        (net_margin, 0.20),  # Healthy profit margins
-        (operating_margin, 0.15),  # Strong operating efficiency
+        (return_on_equity, limits["return_on_equity"]),
+        (net_margin, limits["net_margin"]),
+        (operating_margin, limits["operating_margin"]),
     ]
     profitability_score = sum(
         metric is not None and metric > threshold for metric, threshold in thresholds
@@ -74,9 +141,9 @@ def fundamentals_agent(state: AgentState):
     book_value_growth = metrics.get("book_value_growth")
 
     thresholds = [
-        (revenue_growth, 0.10),  # 10% revenue growth
-        (earnings_growth, 0.10),  # 10% earnings growth
-        (book_value_growth, 0.10),  # 10% book value growth
+        (revenue_growth, limits["revenue_growth"]),
+        (earnings_growth, limits["earnings_growth"]),
+        (book_value_growth, limits["book_value_growth"]),
     ]
     growth_score = sum(
         metric is not None and metric > threshold for metric, threshold in thresholds
@@ -109,15 +176,15 @@ def fundamentals_agent(state: AgentState):
     earnings_per_share = metrics.get("earnings_per_share")
 
     health_score = 0
-    if current_ratio and current_ratio > 1.5:  # Strong liquidity
+    if current_ratio and current_ratio > limits["current_ratio"]:
         health_score += 1
-    if debt_to_equity and debt_to_equity < 0.5:  # Conservative debt levels
+    if debt_to_equity and debt_to_equity < limits["debt_to_equity"]:
         health_score += 1
     if (
         free_cash_flow_per_share
         and earnings_per_share
-        and free_cash_flow_per_share > earnings_per_share * 0.8
-    ):  # Strong FCF conversion
+        and free_cash_flow_per_share > earnings_per_share * limits["fcf_conversion"]
+    ):
         health_score += 1
 
     signals.append(
@@ -146,9 +213,9 @@ def fundamentals_agent(state: AgentState):
     ps_ratio = metrics.get("price_to_sales_ratio")
 
     thresholds = [
-        (pe_ratio, 25),  # Reasonable P/E ratio
-        (pb_ratio, 3),  # Reasonable P/B ratio
-        (ps_ratio, 5),  # Reasonable P/S ratio
+        (pe_ratio, limits["price_to_earnings_ratio"]),
+        (pb_ratio, limits["price_to_book_ratio"]),
+        (ps_ratio, limits["price_to_sales_ratio"]),
     ]
     price_ratio_score = sum(
         metric is not None and metric > threshold for metric, threshold in thresholds
@@ -183,30 +250,4 @@ def fundamentals_agent(state: AgentState):
     total_signals = len(signals)
     confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
 
-    message_content = {
-        "signal": overall_signal,
-        "confidence": confidence,
-        "reasoning": reasoning,
-    }
-
-    # Create the fundamental analysis message
-    message = HumanMessage(
-        content=json.dumps(message_content),
-        name="fundamentals_agent",
-    )
-
-    # Print the reasoning if the flag is set
-    if state["metadata"]["show_reasoning"]:
-        show_agent_reasoning(message_content, "Fundamental Analysis Agent")
-
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["fundamentals_agent"] = {
-        "signal": overall_signal,
-        "confidence": confidence,
-        "reasoning": reasoning,
-    }
-
-    return {
-        "messages": [message],
-        "data": data,
-    }
+    return overall_signal, confidence, reasoning
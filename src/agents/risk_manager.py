@@ -25,19 +25,11 @@ def risk_management_agent(state: AgentState):
     current_stock_value = portfolio["stock"] * current_price
     total_portfolio_value = portfolio["cash"] + current_stock_value
 
-    # 1. Liquidity Check
     avg_daily_volume = prices_df["volume"].mean()
     daily_dollar_volume = avg_daily_volume * current_price
-    
-    # Don't take more than 10% of average daily volume
-    liquidity_limit = daily_dollar_volume * 0.10
-    
-    # 2. Position Size Limits
-    # Base limit is 20% of portfolio
-    base_position_limit = total_portfolio_value * 0.20
-    
-    # Final position size is the minimum of our limits
-    max_position_size = min(liquidity_limit, base_position_limit)
+    max_position_size = calculate_position_limit(
+        current_price, avg_daily_volume, total_portfolio_value
+    )
     
     reasoning = (
         f"Position limit set to ${max_position_size:,.2f} based on:\n"
@@ -68,3 +60,29 @@ def risk_management_agent(state: AgentState):
         "messages": state["messages"] + [message],
         "data": data,
     }
+
+
+def calculate_position_limit(
+    current_price: float, avg_daily_volume: float, total_portfolio_value: float
+) -> float:
+    """
+    Largest position, in dollars, allowed by the liquidity and position size limits.
+
+    Args:
+        current_price: Latest close
+        avg_daily_volume: Average daily share volume over the lookback window
+        total_portfolio_value: Cash plus the value of the current position
+
+    Returns:
+        float: Maximum position size in dollars
+    """
+    # 1. Liquidity Check
+    # Don't take more than 10% of average daily volume
+    liquidity_limit = avg_daily_volume * current_price * 0.10
+
+    # 2. Position Size Limits
+    # Base limit is 20% of portfolio
+    base_position_limit = total_portfolio_value * 0.20
+
+    # Final position size is the minimum of our limits
+    return min(liquidity_limit, base_position_limit)
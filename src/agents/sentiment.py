@@ -20,31 +20,7 @@ def sentiment_agent(state: AgentState):
         limit=5,
     )
 
-    # Get the signals from the insider trades
-    transaction_shares = pd.Series(
-        [t.get("transaction_shares") for t in insider_trades]
-    ).dropna()
-    bearish_condition = transaction_shares < 0
-    signals = np.where(bearish_condition, "bearish", "bullish").tolist()
-
-    # Determine overall signal
-    bullish_signals = signals.count("bullish")
-    bearish_signals = signals.count("bearish")
-    if bullish_signals > bearish_signals:
-        overall_signal = "bullish"
-    elif bearish_signals > bullish_signals:
-        overall_signal = "bearish"
-    else:
-        overall_signal = "neutral"
-
-    # Calculate confidence level based on the proportion of indicators agreeing
-    total_signals = len(signals)
-    confidence = 0  # Default confidence when there are no signals
-    if total_signals > 0:
-        confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
-    reasoning = (
-        f"Bullish signals: {bullish_signals}, Bearish signals: {bearish_signals}"
-    )
+    overall_signal, confidence, reasoning = score_insider_trades(insider_trades)
 
     message_content = {
         "signal": overall_signal,
@@ -73,3 +49,41 @@ def sentiment_agent(state: AgentState):
         "messages": [message],
         "data": data,
     }
+
+
+def score_insider_trades(insider_trades):
+    """
+    Read sentiment from the direction of recent insider trades.
+
+    Args:
+        insider_trades: Insider trades, as returned by get_insider_trades
+
+    Returns:
+        tuple: Overall signal, confidence (0-100) and reasoning
+    """
+    # Get the signals from the insider trades
+    transaction_shares = pd.Series(
+        [t.get("transaction_shares") for t in insider_trades]
+    ).dropna()
+    bearish_condition = transaction_shares < 0
+    signals = np.where(bearish_condition, "bearish", "bullish").tolist()
+
+    # Determine overall signal
+    bullish_signals = signals.count("bullish")
+    bearish_signals = signals.count("bearish")
+    if bullish_signals > bearish_signals:
+        overall_signal = "bullish"
+    elif bearish_signals > bullish_signals:
+        overall_signal = "bearish"
+    else:
+        overall_signal = "neutral"
+
+    # Calculate confidence level based on the proportion of indicators agreeing
+    total_signals = len(signals)
+    confidence = 0  # Default confidence when there are no signals
+    if total_signals > 0:
+        confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
+    reasoning = (
+        f"Bullish signals: {bullish_signals}, Bearish signals: {bearish_signals}"
+    )
+    return overall_signal, confidence, reasoning
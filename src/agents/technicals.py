@@ -1,4 +1,6 @@
 import math
+import os
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
 
 from langchain_core.messages import HumanMessage
 
@@ -10,6 +12,87 @@ import numpy as np
 
 from tools.api import get_prices, prices_to_df
 
+# Bars of history needed before a date for every technical indicator to be
+# defined there: the 126-bar momentum window sums returns, which start one bar in
+WARMUP_BARS = 127
+
+
+class TechnicalStrategy(NamedTuple):
+    """A registered technical strategy and its place in the weighted ensemble."""
+
+    compute: Callable
+    weight: float
+    report_name: str
+    # Upper bound of the confidence it can report, used to skip strategies lazily
+    max_confidence: float = 1.0
+
+
+# Registered strategies by name, in the order they are reported
+TECHNICAL_STRATEGIES: Dict[str, TechnicalStrategy] = {}
+
+# Named strategy configurations: weight overrides, and whether to skip strategies
+# that can no longer change the combined signal
+STRATEGY_PROFILES = {
+    "full": {"weights": {}, "lazy": False},
+    "lean": {"weights": {"volatility": 0.0, "stat_arb": 0.0}, "lazy": True},
+}
+
+
+def technical_strategy(name: str, weight: float, report_name: str, max_confidence: float = 1.0):
+    """
+    Register a strategy function, taking (prices_df, features), for the technical analyst
+
+    Args:
+        name: Key of the strategy in signals and weights
+        weight: Default weight in the ensemble
+        report_name: Key of the strategy in the analysis report
+        max_confidence: Largest confidence the strategy can return
+    """
+
+    def register(func):
+        TECHNICAL_STRATEGIES[name] = TechnicalStrategy(func, weight, report_name, max_confidence)
+        return func
+
+    return register
+
+
+def technical_strategy_config(
+    profile: Optional[str] = None, weights: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, float], bool]:
+    """
+    Resolve the strategy weights and lazy evaluation setting for the technical analyst
+
+    The profile defaults to TECHNICAL_STRATEGY_PROFILE ("full" if unset) and
+    weight overrides to TECHNICAL_STRATEGY_WEIGHTS, e.g. "trend=0.4,stat_arb=0".
+    A weight of zero disables a strategy.
+
+    Returns:
+        tuple: Strategy name to weight, and whether undecisive strategies are skipped
+    """
+    profile = profile or os.environ.get("TECHNICAL_STRATEGY_PROFILE") or "full"
+    if profile not in STRATEGY_PROFILES:
+        raise ValueError(f"Unknown technical strategy profile: {profile}")
+    if weights is None:
+        weights = _parse_strategy_weights(os.environ.get("TECHNICAL_STRATEGY_WEIGHTS", ""))
+
+    resolved = {name: strategy.weight for name, strategy in TECHNICAL_STRATEGIES.items()}
+    for overrides in (STRATEGY_PROFILES[profile]["weights"], weights):
+        for name, weight in overrides.items():
+            if name not in resolved:
+                raise ValueError(f"Unknown technical strategy: {name}")
+            if weight < 0:
+                raise ValueError(f"Strategy weight must not be negative: {name}={weight}")
+            resolved[name] = float(weight)
+    return resolved, STRATEGY_PROFILES[profile]["lazy"]
+
+
+def _parse_strategy_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
 
 ##### Technical Analyst #####
 def technical_analyst_agent(state: AgentState):
@@ -20,86 +103,67 @@ def technical_analyst_agent(state: AgentState):
     3. Momentum
     4. Volatility Analysis
     5. Statistical Arbitrage Signals
+
+    Strategies are enabled and weighted through technical_strategy_config.
     """
     data = state["data"]
     start_date = data["start_date"]
     end_date = data["end_date"]
 
-    # Get the historical price data
-    prices = get_prices(
-        ticker=data["ticker"],
-        start_date=start_date,
-        end_date=end_date,
+    # Strategies with zero weight are disabled
+    strategy_weights, lazy = technical_strategy_config(
+        data.get("technical_profile"), data.get("technical_weights")
     )
 
-    # Convert prices to a DataFrame
-    prices_df = prices_to_df(prices)
-
-    # 1. Trend Following Strategy
-    trend_signals = calculate_trend_signals(prices_df)
-
-    # 2. Mean Reversion Strategy
-    mean_reversion_signals = calculate_mean_reversion_signals(prices_df)
-
-    # 3. Momentum Strategy
-    momentum_signals = calculate_momentum_signals(prices_df)
-
-    # 4. Volatility Strategy
-    volatility_signals = calculate_volatility_signals(prices_df)
-
-    # 5. Statistical Arbitrage Signals
-    stat_arb_signals = calculate_stat_arb_signals(prices_df)
+    # Callers that maintain indicators incrementally (e.g. the backtester) pass the signals in
+    signals = data.get("technical_signals")
+
+    # When several tickers are evaluated together, score the whole universe in
+    # one vectorized pass; inside a shared request scope it is only run once.
+    tickers = data.get("tickers") or [data["ticker"]]
+    if signals is None and len(tickers) > 1:
+        # Imported here since the panel builds on this module's indicators
+        from agents.technicals_panel import get_panel_technical_signals
+
+        signals = get_panel_technical_signals(
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date,
+        ).get(data["ticker"])
+
+    if signals is None:
+        # Get the historical price data
+        prices = get_prices(
+            ticker=data["ticker"],
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        # Convert prices to a DataFrame
+        prices_df = prices_to_df(prices)
+
+        signals = compute_technical_signals(prices_df, strategy_weights, lazy)
+    else:
+        signals = {
+            name: strategy_signals
+            for name, strategy_signals in signals.items()
+            if strategy_weights.get(name, 0) > 0
+        }
 
     # Combine all signals using a weighted ensemble approach
-    strategy_weights = {
-        "trend": 0.25,
-        "mean_reversion": 0.20,
-        "momentum": 0.25,
-        "volatility": 0.15,
-        "stat_arb": 0.15,
-    }
-
-    combined_signal = weighted_signal_combination(
-        {
-            "trend": trend_signals,
-            "mean_reversion": mean_reversion_signals,
-            "momentum": momentum_signals,
-            "volatility": volatility_signals,
-            "stat_arb": stat_arb_signals,
-        },
-        strategy_weights,
-    )
+    combined_signal = weighted_signal_combination(signals, strategy_weights)
 
     # Generate detailed analysis report
     analysis_report = {
         "signal": combined_signal["signal"],
         "confidence": round(combined_signal["confidence"] * 100),
         "strategy_signals": {
-            "trend_following": {
-                "signal": trend_signals["signal"],
-                "confidence": round(trend_signals["confidence"] * 100),
-                "metrics": normalize_pandas(trend_signals["metrics"]),
-            },
-            "mean_reversion": {
-                "signal": mean_reversion_signals["signal"],
-                "confidence": round(mean_reversion_signals["confidence"] * 100),
-                "metrics": normalize_pandas(mean_reversion_signals["metrics"]),
-            },
-            "momentum": {
-                "signal": momentum_signals["signal"],
-                "confidence": round(momentum_signals["confidence"] * 100),
-                "metrics": normalize_pandas(momentum_signals["metrics"]),
-            },
-            "volatility": {
-                "signal": volatility_signals["signal"],
-                "confidence": round(volatility_signals["confidence"] * 100),
-                "metrics": normalize_pandas(volatility_signals["metrics"]),
-            },
-            "statistical_arbitrage": {
-                "signal": stat_arb_signals["signal"],
-                "confidence": round(stat_arb_signals["confidence"] * 100),
-                "metrics": normalize_pandas(stat_arb_signals["metrics"]),
-            },
+            TECHNICAL_STRATEGIES[name].report_name: {
+                "signal": strategy_signals["signal"],
+                "confidence": round(strategy_signals["confidence"] * 100),
+                "metrics": normalize_pandas(strategy_signals["metrics"]),
+            }
+            for name, strategy_signals in signals.items()
         },
     }
 
@@ -125,29 +189,190 @@ def technical_analyst_agent(state: AgentState):
     }
 
 
-def calculate_trend_signals(prices_df):
+def compute_technical_signals(prices_df, weights=None, lazy=False):
+    """
+    Run the registered technical strategies over a price DataFrame
+
+    The strategies share one TechnicalFeatures cache, so returns, true range
+    and rolling statistics are computed once for the whole analysis.
+
+    Args:
+        prices_df: DataFrame with OHLCV data, as returned by prices_to_df
+        weights: Strategy name to ensemble weight; strategies weighted zero are
+            not computed. Defaults to every registered strategy.
+        lazy: Stop once the remaining strategies can no longer change the signal
+            of weighted_signal_combination. Its confidence then only reflects the
+            strategies that were run. Only applied once the history covers
+            WARMUP_BARS, when every indicator is defined.
+
+    Returns:
+        dict: Strategy name to its signal, confidence and metrics
+    """
+    if weights is None:
+        weights = {name: strategy.weight for name, strategy in TECHNICAL_STRATEGIES.items()}
+    enabled = [name for name in TECHNICAL_STRATEGIES if weights.get(name, 0) > 0]
+    features = TechnicalFeatures(prices_df)
+
+    if not lazy or len(prices_df) < WARMUP_BARS:
+        return {name: TECHNICAL_STRATEGIES[name].compute(prices_df, features) for name in enabled}
+
+    # Strategies with unbounded confidence can never be skipped, so run them first,
+    # then the heaviest, which narrows the range of possible outcomes fastest
+    pending = sorted(
+        enabled,
+        key=lambda name: (-TECHNICAL_STRATEGIES[name].max_confidence, -weights[name]),
+    )
+    signals = {}
+    while pending and not _combined_signal_decided(signals, weights, pending):
+        name = pending.pop(0)
+        signals[name] = TECHNICAL_STRATEGIES[name].compute(prices_df, features)
+    return {name: signals[name] for name in enabled if name in signals}
+
+
+def _combined_signal_decided(signals, weights, pending) -> bool:
+    """
+    Whether weighted_signal_combination returns the same signal whatever the pending strategies report
+
+    With weighted sums A (signed) and B over the evaluated strategies, and X the
+    largest total weight x confidence the pending ones can add, the final score
+    lies in [(A - X) / (B + X), (A + X) / (B + X)].
+    """
+    signal_values = {"bullish": 1, "neutral": 0, "bearish": -1}
+    weighted_sum = sum(
+        signal_values[signal["signal"]] * weights[name] * signal["confidence"]
+        for name, signal in signals.items()
+    )
+    total_confidence = sum(weights[name] * signal["confidence"] for name, signal in signals.items())
+    undecided = sum(weights[name] * TECHNICAL_STRATEGIES[name].max_confidence for name in pending)
+
+    if math.isinf(undecided):
+        return False
+    if total_confidence + undecided <= 0:
+        return True
+    low = (weighted_sum - undecided) / (total_confidence + undecided)
+    high = (weighted_sum + undecided) / (total_confidence + undecided)
+    return low > 0.2 or high < -0.2 or (low >= -0.2 and high <= 0.2)
+
+
+# Windows the strategies summarize each series over, with the highest moment used for each;
+# all windows of a series are computed together in one call
+ROLLING_MOMENTS = {
+    "close": {20: 2, 50: 2},
+    "volume": {21: 1},
+    "returns": {21: 2, 63: 4, 126: 1},
+    "gain": {14: 1, 28: 1},
+    "loss": {14: 1, 28: 1},
+    "true_range": {14: 1},
+    "historical_volatility": {63: 2},
+}
+
+# Highest moment each rolling statistic needs
+STAT_MOMENTS = {"sum": 1, "mean": 1, "std": 2, "skew": 3, "kurt": 4}
+
+
+class TechnicalFeatures:
+    """
+    Per-DataFrame cache of the intermediates shared by the technical strategies
+
+    Returns, true range, EMAs and rolling statistics are computed on first use
+    and reused afterwards, so each is built at most once per analysis. Series
+    are addressed by name: any price column, or one of the derived series
+    "returns", "true_range", "gain", "loss" and "historical_volatility".
+    """
+
+    def __init__(self, prices_df: pd.DataFrame):
+        self.prices_df = prices_df
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def series(self, name: str) -> pd.Series:
+        derived = {
+            "returns": lambda: self.prices_df["close"].pct_change(),
+            "true_range": lambda: pd.Series(
+                calculate_true_range(
+                    self.prices_df["high"].to_numpy(dtype=float),
+                    self.prices_df["low"].to_numpy(dtype=float),
+                    self.prices_df["close"].to_numpy(dtype=float),
+                ),
+                index=self.prices_df.index,
+                copy=False,
+            ),
+            "gain": lambda: self._price_change().where(self._price_change() > 0, 0).fillna(0),
+            "loss": lambda: (-self._price_change().where(self._price_change() < 0, 0)).fillna(0),
+            "historical_volatility": lambda: self.rolling("returns", 21, "std") * math.sqrt(252),
+        }
+        if name in derived:
+            return self._cached(name, derived[name])
+        return self.prices_df[name]
+
+    def _price_change(self) -> pd.Series:
+        return self._cached("price_change", lambda: self.prices_df["close"].diff())
+
+    def rolling(self, name: str, window: int, stat: str) -> pd.Series:
+        """Rolling `stat` ("mean", "std", "sum", "skew" or "kurt") of a series over `window` bars."""
+        # All the windows a series is used with come out of one call of the moments kernel
+        windows = ROLLING_MOMENTS.get(name, {})
+        if windows.get(window, 0) < STAT_MOMENTS[stat]:
+            windows = {window: STAT_MOMENTS[stat]}
+        moments = self._cached(
+            ("moments", name, tuple(windows.items())),
+            lambda: calculate_rolling_moments(self.series(name), windows),
+        )
+        return self._cached(
+            (name, window, stat),
+            lambda: pd.Series(
+                moments[window][stat], index=self.prices_df.index, name=self.series(name).name
+            ),
+        )
+
+    def ema(self, window: int) -> pd.Series:
+        return self._cached(("ema", window), lambda: calculate_ema(self.prices_df, window))
+
+
+@technical_strategy("trend", weight=0.25, report_name="trend_following")
+def calculate_trend_signals(prices_df, features=None):
     """
     Advanced trend following strategy using multiple timeframes and indicators
     """
-    # Calculate EMAs for multiple timeframes
-    ema_8 = calculate_ema(prices_df, 8)
-    ema_21 = calculate_ema(prices_df, 21)
-    ema_55 = calculate_ema(prices_df, 55)
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    indicators = trend_indicators(prices_df, features)
+    return score_trend(**{name: series.iloc[-1] for name, series in indicators.items()})
+
+
+def trend_indicators(prices_df, features):
+    """
+    Indicator series behind the trend following strategy, keyed by score_trend argument
+    """
+    return {
+        # Calculate EMAs for multiple timeframes
+        "ema_8": features.ema(8),
+        "ema_21": features.ema(21),
+        "ema_55": features.ema(55),
+        # Calculate ADX for trend strength
+        "adx": calculate_adx(prices_df, 14, features)["adx"],
+    }
 
-    # Calculate ADX for trend strength
-    adx = calculate_adx(prices_df, 14)
 
+def score_trend(ema_8, ema_21, ema_55, adx):
+    """
+    Trend following signal from the latest EMA 8/21/55 and ADX values
+    """
     # Determine trend direction and strength
     short_trend = ema_8 > ema_21
     medium_trend = ema_21 > ema_55
 
     # Combine signals with confidence weighting
-    trend_strength = adx["adx"].iloc[-1] / 100.0
+    trend_strength = adx / 100.0
 
-    if short_trend.iloc[-1] and medium_trend.iloc[-1]:
+    if short_trend and medium_trend:
         signal = "bullish"
         confidence = trend_strength
-    elif not short_trend.iloc[-1] and not medium_trend.iloc[-1]:
+    elif not short_trend and not medium_trend:
         signal = "bearish"
         confidence = trend_strength
     else:
@@ -158,40 +383,79 @@ def calculate_trend_signals(prices_df):
         "signal": signal,
         "confidence": confidence,
         "metrics": {
-            "adx": float(adx["adx"].iloc[-1]),
+            "adx": float(adx),
             "trend_strength": float(trend_strength),
         },
     }
 
 
-def calculate_mean_reversion_signals(prices_df):
+def score_trend_arrays(ema_8, ema_21, ema_55, adx):
+    """
+    score_trend over arrays of indicator values, returned as signal, confidence and metric columns
+    """
+    short_trend = ema_8 > ema_21
+    medium_trend = ema_21 > ema_55
+    trend_strength = adx / 100.0
+    signal = _select_signal(short_trend & medium_trend, ~short_trend & ~medium_trend)
+    return {
+        "signal": signal,
+        "confidence": np.where(signal == "neutral", 0.5, trend_strength),
+        "adx": adx,
+        "trend_strength": trend_strength,
+    }
+
+
+@technical_strategy("mean_reversion", weight=0.2, report_name="mean_reversion")
+def calculate_mean_reversion_signals(prices_df, features=None):
     """
     Mean reversion strategy using statistical measures and Bollinger Bands
     """
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    indicators = mean_reversion_indicators(prices_df, features)
+    return score_mean_reversion(**{name: series.iloc[-1] for name, series in indicators.items()})
+
+
+def mean_reversion_indicators(prices_df, features):
+    """
+    Indicator series behind the mean reversion strategy, keyed by score_mean_reversion argument
+    """
     # Calculate z-score of price relative to moving average
-    ma_50 = prices_df["close"].rolling(window=50).mean()
-    std_50 = prices_df["close"].rolling(window=50).std()
+    ma_50 = features.rolling("close", 50, "mean")
+    std_50 = features.rolling("close", 50, "std")
     z_score = (prices_df["close"] - ma_50) / std_50
 
     # Calculate Bollinger Bands
-    bb_upper, bb_lower = calculate_bollinger_bands(prices_df)
+    bb_upper, bb_lower = calculate_bollinger_bands(prices_df, features=features)
 
     # Calculate RSI with multiple timeframes
-    rsi_14 = calculate_rsi(prices_df, 14)
-    rsi_28 = calculate_rsi(prices_df, 28)
+    rsi_14 = calculate_rsi(prices_df, 14, features)
+    rsi_28 = calculate_rsi(prices_df, 28, features)
+
+    return {
+        "close": prices_df["close"],
+        "z_score": z_score,
+        "bb_upper": bb_upper,
+        "bb_lower": bb_lower,
+        "rsi_14": rsi_14,
+        "rsi_28": rsi_28,
+    }
 
+
+def score_mean_reversion(close, z_score, bb_upper, bb_lower, rsi_14, rsi_28):
+    """
+    Mean reversion signal from the latest close, 50-day z-score, Bollinger Bands and RSI
+    """
     # Mean reversion signals
-    price_vs_bb = (prices_df["close"].iloc[-1] - bb_lower.iloc[-1]) / (
-        bb_upper.iloc[-1] - bb_lower.iloc[-1]
-    )
+    price_vs_bb = (close - bb_lower) / (bb_upper - bb_lower)
 
     # Combine signals
-    if z_score.iloc[-1] < -2 and price_vs_bb < 0.2:
+    if z_score < -2 and price_vs_bb < 0.2:
         signal = "bullish"
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
-    elif z_score.iloc[-1] > 2 and price_vs_bb > 0.8:
+        confidence = min(abs(z_score) / 4, 1.0)
+    elif z_score > 2 and price_vs_bb > 0.8:
         signal = "bearish"
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
+        confidence = min(abs(z_score) / 4, 1.0)
     else:
         signal = "neutral"
         confidence = 0.5
@@ -200,36 +464,70 @@ def calculate_mean_reversion_signals(prices_df):
         "signal": signal,
         "confidence": confidence,
         "metrics": {
-            "z_score": float(z_score.iloc[-1]),
+            "z_score": float(z_score),
             "price_vs_bb": float(price_vs_bb),
-            "rsi_14": float(rsi_14.iloc[-1]),
-            "rsi_28": float(rsi_28.iloc[-1]),
+            "rsi_14": float(rsi_14),
+            "rsi_28": float(rsi_28),
         },
     }
 
 
-def calculate_momentum_signals(prices_df):
+def score_mean_reversion_arrays(close, z_score, bb_upper, bb_lower, rsi_14, rsi_28):
+    """
+    score_mean_reversion over arrays of indicator values
+    """
+    price_vs_bb = (close - bb_lower) / (bb_upper - bb_lower)
+    bullish = (z_score < -2) & (price_vs_bb < 0.2)
+    bearish = (z_score > 2) & (price_vs_bb > 0.8)
+    return {
+        "signal": _select_signal(bullish, bearish),
+        "confidence": np.where(bullish | bearish, np.minimum(np.abs(z_score) / 4, 1.0), 0.5),
+        "z_score": z_score,
+        "price_vs_bb": price_vs_bb,
+        "rsi_14": rsi_14,
+        "rsi_28": rsi_28,
+    }
+
+
+@technical_strategy("momentum", weight=0.25, report_name="momentum")
+def calculate_momentum_signals(prices_df, features=None):
     """
     Multi-factor momentum strategy
     """
-    # Price momentum
-    returns = prices_df["close"].pct_change()
-    mom_1m = returns.rolling(21).sum()
-    mom_3m = returns.rolling(63).sum()
-    mom_6m = returns.rolling(126).sum()
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    indicators = momentum_indicators(prices_df, features)
+    return score_momentum(**{name: series.iloc[-1] for name, series in indicators.items()})
 
+
+def momentum_indicators(prices_df, features):
+    """
+    Indicator series behind the momentum strategy, keyed by score_momentum argument
+    """
     # Volume momentum
-    volume_ma = prices_df["volume"].rolling(21).mean()
-    volume_momentum = prices_df["volume"] / volume_ma
+    volume_ma = features.rolling("volume", 21, "mean")
 
     # Relative strength
     # (would compare to market/sector in real implementation)
 
+    return {
+        # Price momentum
+        "mom_1m": features.rolling("returns", 21, "sum"),
+        "mom_3m": features.rolling("returns", 63, "sum"),
+        "mom_6m": features.rolling("returns", 126, "sum"),
+        "volume_momentum": prices_df["volume"] / volume_ma,
+    }
+
+
+def score_momentum(mom_1m, mom_3m, mom_6m, volume_momentum):
+    """
+    Momentum signal from the latest 1/3/6-month return sums and relative volume
+    """
     # Calculate momentum score
-    momentum_score = (0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m).iloc[-1]
+    momentum_score = 0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m
 
     # Volume confirmation
-    volume_confirmation = volume_momentum.iloc[-1] > 1.0
+    volume_confirmation = volume_momentum > 1.0
 
     if momentum_score > 0.05 and volume_confirmation:
         signal = "bullish"
@@ -245,43 +543,80 @@ def calculate_momentum_signals(prices_df):
         "signal": signal,
         "confidence": confidence,
         "metrics": {
-            "momentum_1m": float(mom_1m.iloc[-1]),
-            "momentum_3m": float(mom_3m.iloc[-1]),
-            "momentum_6m": float(mom_6m.iloc[-1]),
-            "volume_momentum": float(volume_momentum.iloc[-1]),
+            "momentum_1m": float(mom_1m),
+            "momentum_3m": float(mom_3m),
+            "momentum_6m": float(mom_6m),
+            "volume_momentum": float(volume_momentum),
         },
     }
 
 
-def calculate_volatility_signals(prices_df):
+def score_momentum_arrays(mom_1m, mom_3m, mom_6m, volume_momentum):
+    """
+    score_momentum over arrays of indicator values
+    """
+    momentum_score = 0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m
+    volume_confirmation = volume_momentum > 1.0
+    bullish = (momentum_score > 0.05) & volume_confirmation
+    bearish = (momentum_score < -0.05) & volume_confirmation
+    return {
+        "signal": _select_signal(bullish, bearish),
+        "confidence": np.where(
+            bullish | bearish, np.minimum(np.abs(momentum_score) * 5, 1.0), 0.5
+        ),
+        "momentum_1m": mom_1m,
+        "momentum_3m": mom_3m,
+        "momentum_6m": mom_6m,
+        "volume_momentum": volume_momentum,
+    }
+
+
+@technical_strategy("volatility", weight=0.15, report_name="volatility")
+def calculate_volatility_signals(prices_df, features=None):
     """
     Volatility-based trading strategy
     """
-    # Calculate various volatility metrics
-    returns = prices_df["close"].pct_change()
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    indicators = volatility_indicators(prices_df, features)
+    return score_volatility(**{name: series.iloc[-1] for name, series in indicators.items()})
 
+
+def volatility_indicators(prices_df, features):
+    """
+    Indicator series behind the volatility strategy, keyed by score_volatility argument
+    """
     # Historical volatility
-    hist_vol = returns.rolling(21).std() * math.sqrt(252)
+    hist_vol = features.series("historical_volatility")
 
     # Volatility regime detection
-    vol_ma = hist_vol.rolling(63).mean()
+    vol_ma = features.rolling("historical_volatility", 63, "mean")
     vol_regime = hist_vol / vol_ma
 
     # Volatility mean reversion
-    vol_z_score = (hist_vol - vol_ma) / hist_vol.rolling(63).std()
+    vol_z_score = (hist_vol - vol_ma) / features.rolling("historical_volatility", 63, "std")
 
     # ATR ratio
-    atr = calculate_atr(prices_df)
+    atr = calculate_atr(prices_df, features=features)
     atr_ratio = atr / prices_df["close"]
 
-    # Generate signal based on volatility regime
-    current_vol_regime = vol_regime.iloc[-1]
-    vol_z = vol_z_score.iloc[-1]
+    return {
+        "hist_vol": hist_vol,
+        "vol_regime": vol_regime,
+        "vol_z": vol_z_score,
+        "atr_ratio": atr_ratio,
+    }
+
 
-    if current_vol_regime < 0.8 and vol_z < -1:
+def score_volatility(hist_vol, vol_regime, vol_z, atr_ratio):
+    """
+    Volatility signal from the latest historical volatility, regime, z-score and ATR ratio
+    """
+    # Generate signal based on volatility regime
+    if vol_regime < 0.8 and vol_z < -1:
         signal = "bullish"  # Low vol regime, potential for expansion
         confidence = min(abs(vol_z) / 3, 1.0)
-    elif current_vol_regime > 1.2 and vol_z > 1:
+    elif vol_regime > 1.2 and vol_z > 1:
         signal = "bearish"  # High vol regime, potential for contraction
         confidence = min(abs(vol_z) / 3, 1.0)
     else:
@@ -292,36 +627,76 @@ def calculate_volatility_signals(prices_df):
         "signal": signal,
         "confidence": confidence,
         "metrics": {
-            "historical_volatility": float(hist_vol.iloc[-1]),
-            "volatility_regime": float(current_vol_regime),
+            "historical_volatility": float(hist_vol),
+            "volatility_regime": float(vol_regime),
             "volatility_z_score": float(vol_z),
-            "atr_ratio": float(atr_ratio.iloc[-1]),
+            "atr_ratio": float(atr_ratio),
         },
     }
 
 
-def calculate_stat_arb_signals(prices_df):
+def score_volatility_arrays(hist_vol, vol_regime, vol_z, atr_ratio):
+    """
+    score_volatility over arrays of indicator values
+    """
+    bullish = (vol_regime < 0.8) & (vol_z < -1)
+    bearish = (vol_regime > 1.2) & (vol_z > 1)
+    return {
+        "signal": _select_signal(bullish, bearish),
+        "confidence": np.where(bullish | bearish, np.minimum(np.abs(vol_z) / 3, 1.0), 0.5),
+        "historical_volatility": hist_vol,
+        "volatility_regime": vol_regime,
+        "volatility_z_score": vol_z,
+        "atr_ratio": atr_ratio,
+    }
+
+
+@technical_strategy("stat_arb", weight=0.15, report_name="statistical_arbitrage", max_confidence=math.inf)
+def calculate_stat_arb_signals(prices_df, features=None):
     """
     Statistical arbitrage signals based on price action analysis
     """
-    # Calculate price distribution statistics
-    returns = prices_df["close"].pct_change()
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    indicators = stat_arb_indicators(prices_df, features)
+    return score_stat_arb(
+        indicators["hurst"], indicators["skew"].iloc[-1], indicators["kurt"].iloc[-1]
+    )
 
-    # Skewness and kurtosis
-    skew = returns.rolling(63).skew()
-    kurt = returns.rolling(63).kurt()
 
+def stat_arb_indicators(prices_df, features, hurst_history=False):
+    """
+    Indicators behind the statistical arbitrage strategy, keyed by score_stat_arb argument
+
+    The Hurst exponent covers the whole series, so it is a single value unless
+    `hurst_history` asks for its value at every bar.
+    """
     # Test for mean reversion using Hurst exponent
-    hurst = calculate_hurst_exponent(prices_df["close"])
+    if hurst_history:
+        hurst = calculate_rolling_hurst(prices_df["close"])
+    else:
+        hurst = calculate_hurst_exponent(prices_df["close"])
 
     # Correlation analysis
     # (would include correlation with related securities in real implementation)
 
+    return {
+        "hurst": hurst,
+        # Skewness and kurtosis of returns
+        "skew": features.rolling("returns", 63, "skew"),
+        "kurt": features.rolling("returns", 63, "kurt"),
+    }
+
+
+def score_stat_arb(hurst, skew, kurt):
+    """
+    Statistical arbitrage signal from the Hurst exponent and latest 63-day skew/kurtosis
+    """
     # Generate signal based on statistical properties
-    if hurst < 0.4 and skew.iloc[-1] > 1:
+    if hurst < 0.4 and skew > 1:
         signal = "bullish"
         confidence = (0.5 - hurst) * 2
-    elif hurst < 0.4 and skew.iloc[-1] < -1:
+    elif hurst < 0.4 and skew < -1:
         signal = "bearish"
         confidence = (0.5 - hurst) * 2
     else:
@@ -333,12 +708,31 @@ def calculate_stat_arb_signals(prices_df):
         "confidence": confidence,
         "metrics": {
             "hurst_exponent": float(hurst),
-            "skewness": float(skew.iloc[-1]),
-            "kurtosis": float(kurt.iloc[-1]),
+            "skewness": float(skew),
+            "kurtosis": float(kurt),
         },
     }
 
 
+def score_stat_arb_arrays(hurst, skew, kurt):
+    """
+    score_stat_arb over arrays of indicator values
+    """
+    bullish = (hurst < 0.4) & (skew > 1)
+    bearish = (hurst < 0.4) & (skew < -1)
+    return {
+        "signal": _select_signal(bullish, bearish),
+        "confidence": np.where(bullish | bearish, (0.5 - hurst) * 2, 0.5),
+        "hurst_exponent": hurst,
+        "skewness": skew,
+        "kurtosis": kurt,
+    }
+
+
+def _select_signal(bullish, bearish) -> np.ndarray:
+    return np.select([bullish, bearish], ["bullish", "bearish"], "neutral")
+
+
 def weighted_signal_combination(signals, weights):
     """
     Combines multiple trading signals using a weighted approach
@@ -387,22 +781,23 @@ def normalize_pandas(obj):
     return obj
 
 
-def calculate_rsi(prices_df: pd.DataFrame, period: int = 14) -> pd.Series:
-    delta = prices_df["close"].diff()
-    gain = (delta.where(delta > 0, 0)).fillna(0)
-    loss = (-delta.where(delta < 0, 0)).fillna(0)
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
+def calculate_rsi(prices_df: pd.DataFrame, period: int = 14, features=None) -> pd.Series:
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    avg_gain = features.rolling("gain", period, "mean")
+    avg_loss = features.rolling("loss", period, "mean")
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
 
 def calculate_bollinger_bands(
-    prices_df: pd.DataFrame, window: int = 20
+    prices_df: pd.DataFrame, window: int = 20, features=None
 ) -> tuple[pd.Series, pd.Series]:
-    sma = prices_df["close"].rolling(window).mean()
-    std_dev = prices_df["close"].rolling(window).std()
+    if features is None:
+        features = TechnicalFeatures(prices_df)
+    sma = features.rolling("close", window, "mean")
+    std_dev = features.rolling("close", window, "std")
     upper_band = sma + (std_dev * 2)
     lower_band = sma - (std_dev * 2)
     return upper_band, lower_band
@@ -422,66 +817,215 @@ def calculate_ema(df: pd.DataFrame, window: int) -> pd.Series:
     return df["close"].ewm(span=window, adjust=False).mean()
 
 
-def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+def calculate_adx(df: pd.DataFrame, period: int = 14, features=None) -> pd.DataFrame:
     """
     Calculate Average Directional Index (ADX)
 
+    Works on NumPy views of the columns and leaves `df` untouched, so the
+    same frame can be shared between agents.
+
     Args:
         df: DataFrame with OHLC data
         period: Period for calculations
+        features: Optional TechnicalFeatures cache to take the true range from
 
     Returns:
         DataFrame with ADX values
     """
-    # Calculate True Range
-    df["high_low"] = df["high"] - df["low"]
-    df["high_close"] = abs(df["high"] - df["close"].shift())
-    df["low_close"] = abs(df["low"] - df["close"].shift())
-    df["tr"] = df[["high_low", "high_close", "low_close"]].max(axis=1)
+    if features is None:
+        features = TechnicalFeatures(df)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    true_range = features.series("true_range").to_numpy()
+
+    # Directional movement: the up and down moves are written straight into the
+    # +DM/-DM buffers, then zeroed where they are not the dominant positive move
+    plus_dm = np.zeros(len(high))
+    minus_dm = np.zeros(len(high))
+    up_move = np.subtract(high[1:], high[:-1], out=plus_dm[1:])
+    down_move = np.subtract(low[:-1], low[1:], out=minus_dm[1:])
+    plus_idle = ~((up_move > down_move) & (up_move > 0))
+    minus_idle = ~((down_move > up_move) & (down_move > 0))
+    up_move[plus_idle] = 0
+    down_move[minus_idle] = 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tr_mean = _ewm_mean(true_range, period)
+        plus_di = _ewm_mean(plus_dm, period)
+        plus_di /= tr_mean
+        plus_di *= 100
+        minus_di = _ewm_mean(minus_dm, period)
+        minus_di /= tr_mean
+        minus_di *= 100
+
+        # +DM has been smoothed, so its buffer is free for DX
+        dx = np.subtract(plus_di, minus_di, out=plus_dm)
+        np.abs(dx, out=dx)
+        dx *= 100
+        dx /= plus_di + minus_di
+        adx = _ewm_mean(dx, period)
+
+    return pd.DataFrame({"adx": adx, "+di": plus_di, "-di": minus_di}, index=df.index, copy=False)
+
+
+def calculate_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Calculate the True Range of each bar
 
-    # Calculate Directional Movement
-    df["up_move"] = df["high"] - df["high"].shift()
-    df["down_move"] = df["low"].shift() - df["low"]
+    The first bar has no previous close, so its range is high - low. Arrays
+    may be 1-D, or 2-D with one column per ticker.
 
-    df["plus_dm"] = np.where(
-        (df["up_move"] > df["down_move"]) & (df["up_move"] > 0), df["up_move"], 0
-    )
-    df["minus_dm"] = np.where(
-        (df["down_move"] > df["up_move"]) & (df["down_move"] > 0), df["down_move"], 0
-    )
+    Args:
+        high, low, close: Price arrays, oldest bar first
+
+    Returns:
+        np.ndarray: True range values
+    """
+    true_range = np.subtract(high, low)
+    prev_close = close[:-1]
+    current = true_range[1:]
+    gap = np.subtract(high[1:], prev_close)
+    np.abs(gap, out=gap)
+    # fmax skips NaN like DataFrame.max(axis=1)
+    np.fmax(current, gap, out=current)
+    np.subtract(low[1:], prev_close, out=gap)
+    np.abs(gap, out=gap)
+    np.fmax(current, gap, out=current)
+    return true_range
 
-    # Calculate ADX
-    df["+di"] = 100 * (
-        df["plus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean()
-    )
-    df["-di"] = 100 * (
-        df["minus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean()
-    )
-    df["dx"] = 100 * abs(df["+di"] - df["-di"]) / (df["+di"] + df["-di"])
-    df["adx"] = df["dx"].ewm(span=period).mean()
 
-    return df[["adx", "+di", "-di"]]
+def _ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    # pandas' ewm kernel over a zero-copy view; returns a new array
+    return pd.Series(values, copy=False).ewm(span=span).mean().to_numpy()
 
 
-def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+def calculate_atr(df: pd.DataFrame, period: int = 14, features=None) -> pd.Series:
     """
     Calculate Average True Range
 
     Args:
         df: DataFrame with OHLC data
         period: Period for ATR calculation
+        features: Optional TechnicalFeatures cache to share the true range through
 
     Returns:
         pd.Series: ATR values
     """
-    high_low = df["high"] - df["low"]
-    high_close = abs(df["high"] - df["close"].shift())
-    low_close = abs(df["low"] - df["close"].shift())
+    if features is None:
+        features = TechnicalFeatures(df)
+    return features.rolling("true_range", period, "mean")
 
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
 
-    return true_range.rolling(period).mean()
+def calculate_rolling_moments(values, windows: Dict[int, int]) -> dict:
+    """
+    Rolling sum, mean, std, skew and kurtosis of a series for several windows in one call
+
+    Matches pandas rolling(window) statistics: a value is NaN unless its window
+    holds `window` non-NaN values. Power sums come from cumulative sums that
+    restart every few multiples of the window and are taken around the local
+    mean, so rounding error follows the local scale of the data instead of
+    growing with the length of the history.
+
+    Args:
+        values: Array-like series
+        windows: Window length to the highest moment needed over it; 1 gives
+            sum and mean, 2 adds std, 3 skew and 4 kurtosis
+
+    Returns:
+        dict: Window to a dict of statistic name to array
+    """
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+
+    # Length of the run of equal values ending at each position: pandas reports windows
+    # of one repeated value exactly (std 0, skew 0, kurtosis -3), free of rounding error
+    position = np.arange(n)
+    changed = np.ones(n, dtype=bool)
+    changed[1:] = x[1:] != x[:-1]
+    run = position - np.maximum.accumulate(np.where(changed, position, 0)) + 1
+
+    moments = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for window, moment in windows.items():
+            sums, shift = _rolling_power_sums(x, window, moment)
+            partial = sums[0] != window
+            constant = run >= window
+            # Raw moments around the shift, then central moments divided by n
+            raw = sums[1:] / window
+            a = raw[0]
+            a2 = a * a
+            stats = {"sum": sums[1] + window * shift, "mean": np.where(constant, x, shift + a)}
+            if moment >= 2:
+                m2 = np.where(constant, 0.0, np.maximum(raw[1] - a2, 0.0))
+                stats["std"] = np.sqrt(m2 * window / (window - 1)) if window > 1 else np.full(n, np.nan)
+                # Like pandas, skew and kurtosis are undefined for nearly flat windows
+                undefined = (m2 <= 1e-14) & ~constant
+            if moment >= 3:
+                # Bias-corrected sample skewness, as pandas
+                m3 = raw[2] - a * (3 * raw[1] - 2 * a2)
+                stats["skew"] = np.full(n, np.nan)
+                if window >= 3:
+                    stats["skew"] = m3 / (m2 * np.sqrt(m2)) * (
+                        math.sqrt(window * (window - 1.0)) / (window - 2)
+                    )
+                    stats["skew"][undefined] = np.nan
+                    stats["skew"][constant] = 0.0
+            if moment >= 4:
+                # Bias-corrected excess kurtosis, as pandas
+                m4 = raw[3] - a * (4 * raw[2] - a * (6 * raw[1] - 3 * a2))
+                stats["kurt"] = np.full(n, np.nan)
+                if window >= 4:
+                    scale = (window - 2.0) * (window - 3.0)
+                    stats["kurt"] = (window * window - 1.0) / scale * m4 / (m2 * m2) - 3 * (
+                        window - 1.0
+                    ) ** 2 / scale
+                    stats["kurt"][undefined] = np.nan
+                    stats["kurt"][constant] = -3.0
+            for value in stats.values():
+                value[partial] = np.nan
+            moments[window] = stats
+    return moments
+
+
+def _rolling_power_sums(x: np.ndarray, window: int, moment: int):
+    """
+    Sums of the count and powers 1..moment of (x - shift) over the window ending at each position.
+
+    The series is cut into blocks of a few windows, each with its own shift
+    (the block's mean), so the raw moments stay close to the central moments
+    of the windows in it. Returns the (moment + 1) x n sums and the shift at
+    each position.
+    """
+    n = len(x)
+    block = max(min(n, 4 * window), 1)
+    blocks = max(-(-n // block), 1)
+
+    # Segment b holds block b and the `window` values before it, so every window ending in block b lies within it
+    padded = np.full(window + blocks * block, np.nan)
+    padded[window : window + n] = x
+    segments = np.lib.stride_tricks.as_strided(
+        padded,
+        shape=(blocks, window + block),
+        strides=(block * padded.strides[0], padded.strides[0]),
+        writeable=False,
+    )
+    valid = ~np.isnan(segments)
+    deviations = np.where(valid, segments, 0.0)
+    shift = deviations.sum(axis=1, keepdims=True) / np.maximum(valid.sum(axis=1, keepdims=True), 1)
+    deviations -= shift
+    deviations[~valid] = 0.0
+
+    powers = np.empty((moment + 1,) + segments.shape)
+    powers[0] = valid
+    powers[1] = deviations
+    for power in range(2, moment + 1):
+        np.multiply(powers[power - 1], deviations, out=powers[power])
+    running = np.zeros(powers.shape[:-1] + (window + block + 1,))
+    np.cumsum(powers, axis=-1, out=running[..., 1:])
+
+    # Sums over the windows ending at each position of each block
+    sums = running[..., window + 1 :] - running[..., 1 : block + 1]
+    return sums.reshape(moment + 1, -1)[:, :n], np.repeat(shift[:, 0], block)[:n]
 
 
 def calculate_hurst_exponent(price_series: pd.Series, max_lag: int = 20) -> float:
@@ -498,17 +1042,188 @@ def calculate_hurst_exponent(price_series: pd.Series, max_lag: int = 20) -> floa
     Returns:
         float: Hurst exponent
     """
-    lags = range(2, max_lag)
-    # Add small epsilon to avoid log(0)
-    tau = [
-        max(1e-8, np.sqrt(np.std(np.subtract(price_series[lag:], price_series[:-lag]))))
-        for lag in lags
-    ]
-
-    # Return the Hurst exponent from linear fit
-    try:
-        reg = np.polyfit(np.log(lags), np.log(tau), 1)
-        return reg[0]  # Hurst exponent is the slope
-    except (ValueError, RuntimeWarning):
-        # Return 0.5 (random walk) if calculation fails
-        return 0.5
+    prices = np.asarray(price_series, dtype=float)
+    diffs, valid, lags = _lagged_differences(prices, max_lag)
+    count = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = diffs.sum(axis=0) / count
+        variance = np.square(np.where(valid, diffs - mean, 0.0)).sum(axis=0) / count
+    # Add small epsilon to avoid log(0); lags longer than the series also get it
+    tau = np.fmax(1e-8, np.sqrt(np.sqrt(variance)))
+    return _hurst_slope(lags) @ np.log(tau)
+
+
+def calculate_rolling_hurst(
+    price_series: pd.Series, window: int = None, max_lag: int = 20
+) -> pd.Series:
+    """
+    Calculate the Hurst Exponent at every bar in one pass
+
+    Value t equals calculate_hurst_exponent over all prices up to t, or over
+    the trailing `window` prices when a window is given. Every lag's running
+    sums of differences and squared differences are cumulative sums, so the
+    whole series costs about as much as a handful of single estimates.
+
+    Args:
+        price_series: Array-like price data
+        window: Number of trailing prices per estimate; None uses all prior prices
+        max_lag: Maximum lag for R/S calculation
+
+    Returns:
+        pd.Series: Hurst exponent per bar
+    """
+    prices = np.asarray(price_series, dtype=float)
+    diffs, valid, lags = _lagged_differences(prices, max_lag)
+    missing = np.isnan(diffs)
+    present = valid & ~missing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Centre each lag's differences so the running sums of squares keep their precision
+        center = np.nan_to_num(np.where(present, diffs, 0.0).sum(axis=0) / present.sum(axis=0))
+        centered = np.where(present, diffs - center, 0.0)
+
+        sums = _cumsum_from_zero(centered)
+        squares = _cumsum_from_zero(np.square(centered))
+        counts = _cumsum_from_zero(present)
+        gaps = _cumsum_from_zero(missing)
+
+        end = np.arange(1, len(prices) + 1)[:, None]
+        if window is None:
+            start = np.zeros_like(end + lags)
+        else:
+            # Differences with both prices inside the trailing window
+            start = np.clip(end - window + lags, 0, end)
+
+        def window_total(running):
+            return np.take_along_axis(running, end + 0 * lags, axis=0) - np.take_along_axis(
+                running, start, axis=0
+            )
+
+        count = window_total(counts)
+        mean = window_total(sums) / count
+        variance = np.maximum(window_total(squares) / count - mean**2, 0.0)
+        variance[window_total(gaps) > 0] = np.nan
+
+    tau = np.fmax(1e-8, np.sqrt(np.sqrt(variance)))
+    hurst = np.log(tau) @ _hurst_slope(lags)
+    index = price_series.index if isinstance(price_series, pd.Series) else None
+    return pd.Series(hurst, index=index, name="hurst_exponent")
+
+
+def _lagged_differences(prices: np.ndarray, max_lag: int):
+    """
+    Differences prices[t] - prices[t - lag] for every bar and lag 2..max_lag-1.
+
+    Built from one strided view over the NaN-padded prices, so all lags come
+    from a single vectorized subtraction. Returns the (bars x lags) differences,
+    zeroed where t < lag, the mask of those valid entries, and the lags.
+    """
+    lags = np.arange(2, max_lag)
+    padded = np.concatenate([np.full(max_lag - 1, np.nan), prices])
+    # windows[t, -1] is prices[t] and windows[t, -1 - lag] is prices[t - lag]
+    windows = np.lib.stride_tricks.sliding_window_view(padded, max_lag)
+    valid = np.arange(len(prices))[:, None] >= lags
+    diffs = np.where(valid, windows[:, -1:] - windows[:, -1 - lags], 0.0)
+    return diffs, valid, lags
+
+
+def _hurst_slope(lags: np.ndarray) -> np.ndarray:
+    # Weights giving the least-squares slope of log(tau) against log(lag), as np.polyfit
+    log_lags = np.log(lags)
+    centered = log_lags - log_lags.mean()
+    return centered / np.square(centered).sum()
+
+
+def _cumsum_from_zero(values: np.ndarray) -> np.ndarray:
+    running = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=running[1:])
+    return running
+
+
+def calculate_technical_signal_history(prices_df: pd.DataFrame) -> dict:
+    """
+    All five strategy signals at every bar, from indicator series computed once
+
+    Row t of each frame equals compute_technical_signals on the prices up to
+    t, so a backtest can read each day's signals instead of recomputing them.
+
+    Args:
+        prices_df: DataFrame with OHLCV data, as returned by prices_to_df
+
+    Returns:
+        dict: Strategy name to a DataFrame indexed like prices_df with signal,
+            confidence and metric columns
+    """
+    features = TechnicalFeatures(prices_df)
+    strategies = {
+        "trend": (trend_indicators(prices_df, features), score_trend_arrays),
+        "mean_reversion": (mean_reversion_indicators(prices_df, features), score_mean_reversion_arrays),
+        "momentum": (momentum_indicators(prices_df, features), score_momentum_arrays),
+        "volatility": (volatility_indicators(prices_df, features), score_volatility_arrays),
+        "stat_arb": (
+            stat_arb_indicators(prices_df, features, hurst_history=True),
+            score_stat_arb_arrays,
+        ),
+    }
+    history = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for strategy, (indicators, score) in strategies.items():
+            columns = score(**{name: series.to_numpy(dtype=float) for name, series in indicators.items()})
+            history[strategy] = pd.DataFrame(columns, index=prices_df.index)
+    return history
+
+
+def calculate_stat_arb_signal_history(prices_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Statistical arbitrage signals at every bar in one call
+
+    Row t equals calculate_stat_arb_signals on the prices up to t.
+
+    Args:
+        prices_df: DataFrame with price data
+
+    Returns:
+        DataFrame indexed like prices_df with signal, confidence and metric columns
+    """
+    indicators = stat_arb_indicators(prices_df, TechnicalFeatures(prices_df), hurst_history=True)
+    columns = score_stat_arb_arrays(
+        **{name: series.to_numpy(dtype=float) for name, series in indicators.items()}
+    )
+    return pd.DataFrame(columns, index=prices_df.index)
+
+
+class TechnicalSignalHistory:
+    """
+    Technical signals for every bar of a price history, computed up front
+
+    Args:
+        prices_df: DataFrame with OHLCV data; include at least WARMUP_BARS
+            bars before the first date of interest so every indicator is defined
+    """
+
+    def __init__(self, prices_df: pd.DataFrame):
+        self.frames = calculate_technical_signal_history(prices_df)
+        self.days = bar_days(prices_df.index)
+
+    def at(self, date) -> dict:
+        """
+        Signals as of the last bar on or before `date`, in the format of compute_technical_signals
+        """
+        position = self.days.searchsorted(pd.Timestamp(date), side="right")
+        if position == 0:
+            raise ValueError(f"No price history on or before {date}")
+        signals = {}
+        for strategy, frame in self.frames.items():
+            row = frame.iloc[position - 1]
+            signals[strategy] = {
+                "signal": row["signal"],
+                "confidence": float(row["confidence"]),
+                "metrics": {name: float(row[name]) for name in frame.columns[2:]},
+            }
+        return signals
+
+
+def bar_days(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Calendar day of each bar, timezone-naive, for matching bars to simulated dates."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
@@ -0,0 +1,335 @@
+import math
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from agents.technicals import (
+    calculate_true_range,
+    score_mean_reversion_arrays,
+    score_momentum_arrays,
+    score_stat_arb_arrays,
+    score_trend_arrays,
+    score_volatility_arrays,
+)
+from tools.api import get_prices, prices_to_df
+from tools.scope import single_flight
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+# Metric columns reported by each strategy, in the order of the calculate_* functions
+PANEL_METRICS = {
+    "trend": ["adx", "trend_strength"],
+    "mean_reversion": ["z_score", "price_vs_bb", "rsi_14", "rsi_28"],
+    "momentum": ["momentum_1m", "momentum_3m", "momentum_6m", "volume_momentum"],
+    "volatility": [
+        "historical_volatility",
+        "volatility_regime",
+        "volatility_z_score",
+        "atr_ratio",
+    ],
+    "stat_arb": ["hurst_exponent", "skewness", "kurtosis"],
+}
+
+
+def price_panel(prices_by_ticker: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Align per-ticker price DataFrames into one dates x tickers frame per field.
+
+    Args:
+        prices_by_ticker: Ticker to DataFrame as returned by prices_to_df
+
+    Returns:
+        dict: high, low, close and volume panels; missing bars are NaN
+    """
+    return {
+        field: pd.DataFrame({t: df[field] for t, df in prices_by_ticker.items()}).astype(float)
+        for field in ["high", "low", "close", "volume"]
+    }
+
+
+def calculate_panel_signals(
+    high: Panel, low: Panel, close: Panel, volume: Panel
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compute all five technical strategy signals for every ticker in one pass.
+
+    Each argument is a dates x tickers panel. Every step is a NumPy operation
+    across all tickers at once: recursive indicators (EMAs, ADX) sweep the
+    dates once, and window statistics are computed only over the final
+    window, since the strategies only read the latest value.
+
+    A ticker whose history starts later can have leading NaNs, and gets the
+    same result as running the calculate_* functions on its own shorter
+    history. Every ticker needs a bar on the last date, and windows spanning
+    a gap inside a ticker's history are NaN.
+
+    Args:
+        high, low, close, volume: Price panels, e.g. from price_panel
+
+    Returns:
+        dict: Strategy name to a DataFrame indexed by ticker with signal,
+            confidence and metric columns
+    """
+    tickers = close.columns if isinstance(close, pd.DataFrame) else pd.RangeIndex(np.shape(close)[1])
+    high, low, close, volume = (np.asarray(p, dtype=float) for p in (high, low, close, volume))
+    prev_close = _shift(close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = close / prev_close - 1
+        true_range = calculate_true_range(high, low, close)
+
+        return {
+            "trend": _panel_trend(tickers, high, low, close, true_range),
+            "mean_reversion": _panel_mean_reversion(tickers, close),
+            "momentum": _panel_momentum(tickers, returns, volume),
+            "volatility": _panel_volatility(tickers, close, returns, true_range),
+            "stat_arb": _panel_stat_arb(tickers, close, returns),
+        }
+
+
+def combine_panel_signals(
+    panel_signals: Dict[str, pd.DataFrame], weights: Dict[str, float]
+) -> pd.DataFrame:
+    """
+    Vectorized weighted_signal_combination over every ticker
+
+    Returns:
+        DataFrame indexed by ticker with signal and confidence columns
+    """
+    signal_values = {"bullish": 1, "neutral": 0, "bearish": -1}
+    weighted_sum = 0
+    total_confidence = 0
+    for strategy, frame in panel_signals.items():
+        numeric_signal = frame["signal"].map(signal_values).to_numpy(dtype=float)
+        weighted_confidence = weights[strategy] * frame["confidence"].to_numpy(dtype=float)
+        weighted_sum = weighted_sum + numeric_signal * weighted_confidence
+        total_confidence = total_confidence + weighted_confidence
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        final_score = np.where(total_confidence > 0, weighted_sum / total_confidence, 0.0)
+    signal = _select(final_score > 0.2, final_score < -0.2)
+    index = next(iter(panel_signals.values())).index
+    return pd.DataFrame({"signal": signal, "confidence": np.abs(final_score)}, index=index)
+
+
+def ticker_signals(panel_signals: Dict[str, pd.DataFrame], ticker: str) -> dict:
+    """Extract one ticker's signals in the format of compute_technical_signals."""
+    signals = {}
+    for strategy, frame in panel_signals.items():
+        row = frame.loc[ticker]
+        signals[strategy] = {
+            "signal": row["signal"],
+            "confidence": float(row["confidence"]),
+            "metrics": {m: float(row[m]) for m in PANEL_METRICS[strategy]},
+        }
+    return signals
+
+
+@single_flight
+def get_panel_technical_signals(
+    tickers: List[str], start_date: str, end_date: str
+) -> Dict[str, dict]:
+    """
+    Fetch prices for a universe of tickers and score them all in one pass.
+
+    Tickers without price data are left out. Inside a request scope the
+    universe is scored once and shared by every ticker's analysis.
+
+    Returns:
+        dict: Ticker to its signals, in the format of compute_technical_signals
+    """
+    prices_by_ticker = {}
+    for ticker in tickers:
+        try:
+            prices_by_ticker[ticker] = prices_to_df(get_prices(ticker, start_date, end_date))
+        except ValueError:
+            continue
+    if not prices_by_ticker:
+        return {}
+    panel_signals = calculate_panel_signals(**price_panel(prices_by_ticker))
+    return {ticker: ticker_signals(panel_signals, ticker) for ticker in prices_by_ticker}
+
+
+def _select(bullish, bearish) -> np.ndarray:
+    return np.select([bullish, bearish], ["bullish", "bearish"], "neutral")
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    shifted = np.empty_like(x)
+    shifted[0] = np.nan
+    shifted[1:] = x[:-1]
+    return shifted
+
+
+def _tail(x: np.ndarray, window: int) -> np.ndarray:
+    """The last `window` rows, NaN-padded at the top when the history is shorter."""
+    if len(x) >= window:
+        return x[-window:]
+    pad = np.full((window - len(x),) + x.shape[1:], np.nan)
+    return np.concatenate([pad, x])
+
+
+def _tail_moments(x: np.ndarray, window: int):
+    """
+    Mean and central moments m2, m3, m4 (divided by n) of the last `window` rows.
+
+    Like pandas rolling(window), a ticker gets NaN unless all `window` values
+    are present. Deviations are taken from the window mean (two-pass), so
+    the result does not lose precision on long or high-priced histories.
+    """
+    w = _tail(x, window)
+    mean = w.mean(axis=0)
+    d = w - mean
+    d2 = d * d
+    return mean, d2.mean(axis=0), (d2 * d).mean(axis=0), (d2 * d2).mean(axis=0)
+
+
+def _tail_mean(x: np.ndarray, window: int) -> np.ndarray:
+    return _tail(x, window).mean(axis=0)
+
+
+def _tail_sum(x: np.ndarray, window: int) -> np.ndarray:
+    return _tail(x, window).sum(axis=0)
+
+
+def _tail_std(x: np.ndarray, window: int) -> np.ndarray:
+    return _tail(x, window).std(axis=0, ddof=1)
+
+
+def _tail_skew_kurt(x: np.ndarray, window: int):
+    """Bias-corrected skewness and excess kurtosis, as pandas rolling().skew()/.kurt()."""
+    n = float(window)
+    _, m2, m3, m4 = _tail_moments(x, window)
+    # pandas treats a variance this small as zero
+    m2 = np.where(m2 <= 1e-14, np.nan, m2)
+    skew = np.sqrt(n * (n - 1)) * m3 / ((n - 2) * m2**1.5)
+    kurt = ((n * n - 1) * m4 / (m2 * m2) - 3 * (n - 1) ** 2) / ((n - 2) * (n - 3))
+    return skew, kurt
+
+
+def _rolling_std(x: np.ndarray, window: int, rows: int) -> np.ndarray:
+    """Sample std over `window` rows for each of the last `rows` dates."""
+    w = np.lib.stride_tricks.sliding_window_view(_tail(x, rows + window - 1), window, axis=0)
+    return w.std(axis=-1, ddof=1)
+
+
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+    """Latest ewm(span=span, adjust=False).mean() of every column."""
+    alpha = 2.0 / (span + 1)
+    value = np.full(x.shape[1], np.nan)
+    for row in x:
+        updated = (1 - alpha) * value + alpha * row
+        value = np.where(np.isnan(value), row, np.where(np.isnan(row), value, updated))
+    return value
+
+
+def _panel_adx(high, low, true_range, period: int = 14) -> np.ndarray:
+    """Latest ADX of every column, as calculate_adx."""
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    missing = np.isnan(high)
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    plus_dm[missing] = np.nan
+    minus_dm[missing] = np.nan
+
+    # ewm(span=period) with adjust=True is a ratio of decayed sums; rows with NaN
+    # decay the sums without adding to them
+    decay = 1 - 2.0 / (period + 1)
+    zeros = np.zeros(high.shape[1])
+    tr_sum, plus_sum, minus_sum, dm_weight = zeros.copy(), zeros.copy(), zeros.copy(), zeros.copy()
+    adx_sum, adx_weight = zeros.copy(), zeros.copy()
+    for t in range(len(high)):
+        valid = ~missing[t]
+        dm_weight = dm_weight * decay + valid
+        tr_sum = tr_sum * decay + np.where(valid, true_range[t], 0.0)
+        plus_sum = plus_sum * decay + np.where(valid, plus_dm[t], 0.0)
+        minus_sum = minus_sum * decay + np.where(valid, minus_dm[t], 0.0)
+        tr_mean = tr_sum / dm_weight
+        plus_di = 100 * ((plus_sum / dm_weight) / tr_mean)
+        minus_di = 100 * ((minus_sum / dm_weight) / tr_mean)
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        dx_valid = ~np.isnan(dx)
+        adx_weight = adx_weight * decay + dx_valid
+        adx_sum = adx_sum * decay + np.where(dx_valid, dx, 0.0)
+    return adx_sum / adx_weight
+
+
+def _panel_trend(tickers, high, low, close, true_range) -> pd.DataFrame:
+    ema_8 = _ema(close, 8)
+    ema_21 = _ema(close, 21)
+    ema_55 = _ema(close, 55)
+    adx = _panel_adx(high, low, true_range)
+    return pd.DataFrame(score_trend_arrays(ema_8, ema_21, ema_55, adx), index=tickers)
+
+
+def _panel_mean_reversion(tickers, close) -> pd.DataFrame:
+    last_close = close[-1]
+    z_score = (last_close - _tail_mean(close, 50)) / _tail_std(close, 50)
+
+    sma_20 = _tail_mean(close, 20)
+    std_20 = _tail_std(close, 20)
+    bb_upper = sma_20 + std_20 * 2
+    bb_lower = sma_20 - std_20 * 2
+
+    # Gains and losses are NaN before each ticker's first bar and 0 on it, as in calculate_rsi
+    delta = close - _shift(close)
+    missing = np.isnan(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[missing] = np.nan
+    loss[missing] = np.nan
+
+    def rsi(period):
+        rs = _tail_mean(gain, period) / _tail_mean(loss, period)
+        return 100 - (100 / (1 + rs))
+
+    return pd.DataFrame(
+        score_mean_reversion_arrays(last_close, z_score, bb_upper, bb_lower, rsi(14), rsi(28)),
+        index=tickers,
+    )
+
+
+def _panel_momentum(tickers, returns, volume) -> pd.DataFrame:
+    mom_1m = _tail_sum(returns, 21)
+    mom_3m = _tail_sum(returns, 63)
+    mom_6m = _tail_sum(returns, 126)
+    volume_momentum = volume[-1] / _tail_mean(volume, 21)
+    return pd.DataFrame(
+        score_momentum_arrays(mom_1m, mom_3m, mom_6m, volume_momentum), index=tickers
+    )
+
+
+def _panel_volatility(tickers, close, returns, true_range) -> pd.DataFrame:
+    # Only the last 63 values of the 21-day volatility feed its regime statistics
+    hist_vol = _rolling_std(returns, 21, 63) * math.sqrt(252)
+    current_vol = hist_vol[-1]
+    vol_ma = hist_vol.mean(axis=0)
+    vol_regime = current_vol / vol_ma
+    vol_z = (current_vol - vol_ma) / hist_vol.std(axis=0, ddof=1)
+    atr_ratio = _tail_mean(true_range, 14) / close[-1]
+    return pd.DataFrame(
+        score_volatility_arrays(current_vol, vol_regime, vol_z, atr_ratio), index=tickers
+    )
+
+
+def _panel_hurst(close: np.ndarray, max_lag: int = 20) -> np.ndarray:
+    """Hurst exponent of every column, as calculate_hurst_exponent per ticker."""
+    lags = np.arange(2, max_lag)
+    log_lags = np.log(lags)
+    centered = log_lags - log_lags.mean()
+    log_tau = np.empty((len(lags), close.shape[1]))
+    for i, lag in enumerate(lags):
+        diffs = close[lag:] - close[:-lag]
+        count = np.sum(~np.isnan(diffs), axis=0)
+        mean = np.nansum(diffs, axis=0) / count
+        std = np.sqrt(np.nansum((diffs - mean) ** 2, axis=0) / count)
+        log_tau[i] = np.log(np.fmax(1e-8, np.sqrt(std)))
+    # Least-squares slope of log tau against log lag
+    return (centered / (centered**2).sum()) @ log_tau
+
+
+def _panel_stat_arb(tickers, close, returns) -> pd.DataFrame:
+    skew, kurt = _tail_skew_kurt(returns, 63)
+    hurst = _panel_hurst(close)
+    return pd.DataFrame(score_stat_arb_arrays(hurst, skew, kurt), index=tickers)
@@ -0,0 +1,385 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from agents.technicals import (
+    score_mean_reversion,
+    score_momentum,
+    score_stat_arb,
+    score_trend,
+    score_volatility,
+)
+
+NAN = float("nan")
+
+
+def _div(a: float, b: float) -> float:
+    """Divide like NumPy/pandas: x/0 is ±inf and 0/0 is NaN instead of raising."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class RollingWindow:
+    """
+    Rolling moments over the last `window` values, updated in O(1) per value.
+
+    Matches pandas `rolling(window)` with the default min_periods: results are
+    NaN until the window holds `window` non-NaN values. Power sums are kept
+    relative to a shift near the window mean and rebuilt from the buffer once
+    per window, so rounding error does not accumulate over long histories.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._shift = 0.0
+        self._since_rebuild = 0
+        self.nobs = 0
+        self._s1 = self._s2 = self._s3 = self._s4 = 0.0
+
+    def push(self, x: float) -> None:
+        if len(self._values) == self.window:
+            self._remove(self._values[0])
+        self._values.append(x)
+        self._add(x)
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def _add(self, x: float) -> None:
+        if math.isnan(x):
+            return
+        d = x - self._shift
+        d2 = d * d
+        self.nobs += 1
+        self._s1 += d
+        self._s2 += d2
+        self._s3 += d2 * d
+        self._s4 += d2 * d2
+
+    def _remove(self, x: float) -> None:
+        if math.isnan(x):
+            return
+        d = x - self._shift
+        d2 = d * d
+        self.nobs -= 1
+        self._s1 -= d
+        self._s2 -= d2
+        self._s3 -= d2 * d
+        self._s4 -= d2 * d2
+
+    def _rebuild(self) -> None:
+        valid = [x for x in self._values if not math.isnan(x)]
+        self._shift = sum(valid) / len(valid) if valid else 0.0
+        self.nobs = 0
+        self._s1 = self._s2 = self._s3 = self._s4 = 0.0
+        for x in valid:
+            self._add(x)
+        self._since_rebuild = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.nobs >= self.window
+
+    def sum(self) -> float:
+        return self._s1 + self.nobs * self._shift if self.ready else NAN
+
+    def mean(self) -> float:
+        return self._shift + self._s1 / self.nobs if self.ready else NAN
+
+    def _central(self):
+        """Mean offset and central moments m2, m3, m4 (divided by n)."""
+        n = self.nobs
+        a = self._s1 / n
+        m2 = self._s2 / n - a * a
+        m3 = self._s3 / n - 3 * a * self._s2 / n + 2 * a**3
+        m4 = (
+            self._s4 / n
+            - 4 * a * self._s3 / n
+            + 6 * a * a * self._s2 / n
+            - 3 * a**4
+        )
+        return max(m2, 0.0), m3, m4
+
+    def std(self) -> float:
+        if not self.ready or self.nobs < 2:
+            return NAN
+        m2, _, _ = self._central()
+        return math.sqrt(m2 * self.nobs / (self.nobs - 1))
+
+    def skew(self) -> float:
+        # Bias-corrected sample skewness, as pandas rolling().skew()
+        n = self.nobs
+        if not self.ready or n < 3:
+            return NAN
+        m2, m3, _ = self._central()
+        if m2 <= 1e-14:
+            return NAN
+        return math.sqrt(n * (n - 1.0)) * m3 / ((n - 2) * m2**1.5)
+
+    def kurt(self) -> float:
+        # Bias-corrected excess kurtosis, as pandas rolling().kurt()
+        n = self.nobs
+        if not self.ready or n < 4:
+            return NAN
+        m2, _, m4 = self._central()
+        if m2 <= 1e-14:
+            return NAN
+        k = (n * n - 1.0) * m4 / (m2 * m2) - 3 * (n - 1.0) ** 2
+        return k / ((n - 2.0) * (n - 3.0))
+
+
+class Ema:
+    """EMA matching pandas `ewm(span=span, adjust=False).mean()`."""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = NAN
+
+    def push(self, x: float) -> float:
+        if math.isnan(self.value):
+            self.value = x
+        elif not math.isnan(x):
+            self.value = (1 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+class EwmMean:
+    """EMA matching pandas `ewm(span=span).mean()`, i.e. adjust=True with NaNs skipped."""
+
+    def __init__(self, span: int):
+        self.decay = 1 - 2.0 / (span + 1)
+        self._num = 0.0
+        self._den = 0.0
+
+    def push(self, x: float) -> float:
+        self._num *= self.decay
+        self._den *= self.decay
+        if not math.isnan(x):
+            self._num += x
+            self._den += 1.0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._num / self._den if self._den > 0 else NAN
+
+
+class ExpandingHurst:
+    """
+    Hurst exponent of the whole series seen so far, as calculate_hurst_exponent.
+
+    Keeps a running (Welford) mean and variance of the lagged differences for
+    every lag, so each new close costs O(max_lag).
+    """
+
+    def __init__(self, max_lag: int = 20):
+        self.lags = np.arange(2, max_lag)
+        log_lags = np.log(self.lags)
+        centered = log_lags - log_lags.mean()
+        # Slope of a least-squares line through (log lag, log tau) is a fixed weighting of log tau
+        self._weights = centered / (centered**2).sum()
+        self._history = deque(maxlen=max_lag - 1)
+        self._count = np.zeros(len(self.lags))
+        self._mean = np.zeros(len(self.lags))
+        self._m2 = np.zeros(len(self.lags))
+
+    def push(self, close: float) -> None:
+        history = self._history
+        for i, lag in enumerate(self.lags):
+            if len(history) < lag:
+                break
+            d = close - history[-lag]
+            self._count[i] += 1
+            delta = d - self._mean[i]
+            self._mean[i] += delta / self._count[i]
+            self._m2[i] += delta * (d - self._mean[i])
+        history.append(close)
+
+    @property
+    def value(self) -> float:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self._m2 / self._count)
+        tau = np.fmax(1e-8, np.sqrt(std))
+        return float(self._weights @ np.log(tau))
+
+
+class IndicatorEngine:
+    """
+    Streaming version of the indicators behind the technical analyst.
+
+    Every indicator used by the strategies in agents/technicals.py is updated
+    from one new bar in constant time, so a backtest can advance day by day
+    instead of recomputing each window from scratch. After feeding bars
+    b0..bt, `signals()` equals compute_technical_signals on a DataFrame of
+    the same bars, up to floating-point rounding.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_index = None
+        self._prev_close = NAN
+        self._prev_high = NAN
+        self._prev_low = NAN
+        self._close = NAN
+        self._volume = NAN
+
+        # Trend
+        self._ema_8, self._ema_21, self._ema_55 = Ema(8), Ema(21), Ema(55)
+        self._tr_ewm, self._plus_dm_ewm, self._minus_dm_ewm = EwmMean(14), EwmMean(14), EwmMean(14)
+        self._adx_ewm = EwmMean(14)
+
+        # Mean reversion
+        self._close_50, self._close_20 = RollingWindow(50), RollingWindow(20)
+        self._gain_14, self._loss_14 = RollingWindow(14), RollingWindow(14)
+        self._gain_28, self._loss_28 = RollingWindow(28), RollingWindow(28)
+
+        # Momentum
+        self._ret_21, self._ret_63, self._ret_126 = RollingWindow(21), RollingWindow(63), RollingWindow(126)
+        self._volume_21 = RollingWindow(21)
+
+        # Volatility
+        self._hist_vol = NAN
+        self._hist_vol_63 = RollingWindow(63)
+        self._tr_14 = RollingWindow(14)
+
+        # Statistical arbitrage (returns skew/kurtosis share the 63-bar returns window)
+        self._hurst = ExpandingHurst()
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        """Advance every indicator by one bar."""
+        prev_close, prev_high, prev_low = self._prev_close, self._prev_high, self._prev_low
+
+        # True range; the first bar has no previous close
+        tr = high - low
+        if not math.isnan(prev_close):
+            tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+
+        # Directional movement; NaN moves on the first bar compare as False
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+
+        self._ema_8.push(close)
+        self._ema_21.push(close)
+        self._ema_55.push(close)
+        tr_mean = self._tr_ewm.push(tr)
+        plus_di = 100 * _div(self._plus_dm_ewm.push(plus_dm), tr_mean)
+        minus_di = 100 * _div(self._minus_dm_ewm.push(minus_dm), tr_mean)
+        self._adx_ewm.push(100 * _div(abs(plus_di - minus_di), plus_di + minus_di))
+
+        self._close_50.push(close)
+        self._close_20.push(close)
+        delta = close - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._gain_14.push(gain)
+        self._loss_14.push(loss)
+        self._gain_28.push(gain)
+        self._loss_28.push(loss)
+
+        ret = _div(close, prev_close) - 1 if not math.isnan(prev_close) else NAN
+        self._ret_21.push(ret)
+        self._ret_63.push(ret)
+        self._ret_126.push(ret)
+        self._volume_21.push(volume)
+
+        self._hist_vol = self._ret_21.std() * math.sqrt(252)
+        self._hist_vol_63.push(self._hist_vol)
+        self._tr_14.push(tr)
+
+        self._hurst.push(close)
+
+        self._prev_close, self._prev_high, self._prev_low = close, high, low
+        self._close, self._volume = close, volume
+        self.count += 1
+
+    def update_df(self, prices_df: pd.DataFrame) -> int:
+        """
+        Feed the rows of a price DataFrame that are newer than the last bar seen.
+
+        Args:
+            prices_df: DataFrame indexed by date with high, low, close and volume columns
+
+        Returns:
+            int: Number of bars added
+        """
+        start = 0
+        if self.last_index is not None:
+            start = prices_df.index.searchsorted(self.last_index, side="right")
+        rows = prices_df.iloc[start:]
+        for high, low, close, volume in zip(
+            rows["high"].to_numpy(dtype=float),
+            rows["low"].to_numpy(dtype=float),
+            rows["close"].to_numpy(dtype=float),
+            rows["volume"].to_numpy(dtype=float),
+        ):
+            self.update(high, low, close, volume)
+        if len(rows):
+            self.last_index = rows.index[-1]
+        return len(rows)
+
+    @staticmethod
+    def _rsi(gain: RollingWindow, loss: RollingWindow) -> float:
+        rs = _div(gain.mean(), loss.mean())
+        return 100 - _div(100, 1 + rs)
+
+    def values(self) -> dict:
+        """Latest value of every indicator."""
+        close = self._close
+        ma_50, std_50 = self._close_50.mean(), self._close_50.std()
+        sma_20, std_20 = self._close_20.mean(), self._close_20.std()
+        vol_ma, vol_std = self._hist_vol_63.mean(), self._hist_vol_63.std()
+        return {
+            "ema_8": self._ema_8.value,
+            "ema_21": self._ema_21.value,
+            "ema_55": self._ema_55.value,
+            "adx": self._adx_ewm.value,
+            "close": close,
+            "z_score": _div(close - ma_50, std_50),
+            "bb_upper": sma_20 + std_20 * 2,
+            "bb_lower": sma_20 - std_20 * 2,
+            "rsi_14": self._rsi(self._gain_14, self._loss_14),
+            "rsi_28": self._rsi(self._gain_28, self._loss_28),
+            "momentum_1m": self._ret_21.sum(),
+            "momentum_3m": self._ret_63.sum(),
+            "momentum_6m": self._ret_126.sum(),
+            "volume_momentum": _div(self._volume, self._volume_21.mean()),
+            "historical_volatility": self._hist_vol,
+            "volatility_regime": _div(self._hist_vol, vol_ma),
+            "volatility_z_score": _div(self._hist_vol - vol_ma, vol_std),
+            "atr_ratio": _div(self._tr_14.mean(), close),
+            "hurst_exponent": self._hurst.value,
+            "skewness": self._ret_63.skew(),
+            "kurtosis": self._ret_63.kurt(),
+        }
+
+    def signals(self) -> dict:
+        """
+        Strategy signals for the latest bar, in the format of compute_technical_signals.
+        """
+        if not self.count:
+            raise ValueError("No bars have been added to the indicator engine")
+        v = self.values()
+        return {
+            "trend": score_trend(v["ema_8"], v["ema_21"], v["ema_55"], v["adx"]),
+            "mean_reversion": score_mean_reversion(
+                v["close"], v["z_score"], v["bb_upper"], v["bb_lower"], v["rsi_14"], v["rsi_28"]
+            ),
+            "momentum": score_momentum(
+                v["momentum_1m"], v["momentum_3m"], v["momentum_6m"], v["volume_momentum"]
+            ),
+            "volatility": score_volatility(
+                v["historical_volatility"],
+                v["volatility_regime"],
+                v["volatility_z_score"],
+                v["atr_ratio"],
+            ),
+            "stat_arb": score_stat_arb(v["hurst_exponent"], v["skewness"], v["kurtosis"]),
+        }
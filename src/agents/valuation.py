@@ -2,7 +2,31 @@ from langchain_core.messages import HumanMessage
 from graph.state import AgentState, show_agent_reasoning
 import json
 
-from tools.api import get_financial_metrics, get_market_cap, search_line_items
+from tools.api import (
+    get_financial_metrics,
+    get_market_cap,
+    search_line_items,
+    search_line_items_batch,
+)
+
+# Line items needed for the owner earnings and DCF valuations
+VALUATION_LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "depreciation_and_amortization",
+    "capital_expenditure",
+    "working_capital",
+]
+
+# Parameters of the valuations, overridable through data["valuation_params"]
+VALUATION_PARAMS = {
+    "required_return": 0.15,  # Owner earnings discount rate
+    "margin_of_safety": 0.25,  # Haircut on the owner earnings value
+    "discount_rate": 0.10,  # DCF discount rate
+    "terminal_growth_rate": 0.03,  # DCF terminal growth rate
+    "num_years": 5,  # Years projected by both methods
+    "gap_threshold": 0.15,  # Valuation gap beyond which a stock is under/overvalued
+}
 
 ##### Valuation Agent #####
 def valuation_agent(state: AgentState):
@@ -21,19 +45,82 @@ def valuation_agent(state: AgentState):
     # Pull the most recent financial metrics
     metrics = financial_metrics[0]
 
-    # Fetch the specific line_items that we need for valuation purposes
-    financial_line_items = search_line_items(
-        ticker=data["ticker"],
-        line_items=[
-            "free_cash_flow",
-            "net_income",
-            "depreciation_and_amortization",
-            "capital_expenditure",
-            "working_capital",
-        ],
-        period="ttm",
-        limit=2,
+    # Fetch the specific line_items that we need for valuation purposes.
+    # When several tickers are evaluated together, fetch them all in batched
+    # requests; inside a shared request scope the batch is only sent once.
+    tickers = data.get("tickers") or [data["ticker"]]
+    financial_line_items = None
+    if len(tickers) > 1:
+        financial_line_items = search_line_items_batch(
+            tickers=tickers,
+            line_items=VALUATION_LINE_ITEMS,
+            period="ttm",
+            limit=2,
+            end_date=end_date,
+        ).get(data["ticker"])
+    if not financial_line_items:
+        financial_line_items = search_line_items(
+            ticker=data["ticker"],
+            line_items=VALUATION_LINE_ITEMS,
+            period="ttm",
+            limit=2,
+            end_date=end_date,
+        )
+
+    # Get the market cap
+    market_cap = get_market_cap(ticker=data["ticker"], end_date=end_date)
+
+    signal, confidence, reasoning = score_valuation(
+        metrics, financial_line_items, market_cap, data.get("valuation_params")
     )
+    message_content = {
+        "signal": signal,
+        "confidence": confidence,
+        "reasoning": reasoning,
+    }
+
+    message = HumanMessage(
+        content=json.dumps(message_content),
+        name="valuation_agent",
+    )
+
+    # Print the reasoning if the flag is set
+    if state["metadata"]["show_reasoning"]:
+        show_agent_reasoning(message_content, "Valuation Analysis Agent")
+
+    # Add the signal to the analyst_signals list
+    state["data"]["analyst_signals"]["valuation_agent"] = {
+        "signal": signal,
+        "confidence": confidence,
+        "reasoning": reasoning,
+    }
+
+    return {
+        "messages": [message],
+        "data": data,
+    }
+
+
+def score_valuation(metrics, financial_line_items, market_cap, params=None):
+    """
+    Compare owner earnings and DCF valuations with the market cap.
+
+    Args:
+        metrics: Latest financial metrics, as returned by get_financial_metrics
+        financial_line_items: Current and previous VALUATION_LINE_ITEMS reports
+        market_cap: Market cap as of the valuation date
+        params: Overrides of VALUATION_PARAMS
+
+    Returns:
+        tuple: Signal, confidence (0-100) and reasoning by method
+    """
+    values = VALUATION_PARAMS
+    if params:
+        unknown = set(params) - set(VALUATION_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown valuation parameters: {', '.join(sorted(unknown))}")
+        values = {**VALUATION_PARAMS, **params}
+    gap_threshold = values["gap_threshold"]
 
     # Pull the current and previous financial line items
     current_financial_line_item = financial_line_items[0]
@@ -51,30 +138,28 @@ def valuation_agent(state: AgentState):
         capex=current_financial_line_item.get("capital_expenditure"),
         working_capital_change=working_capital_change,
         growth_rate=metrics["earnings_growth"],
-        required_return=0.15,
-        margin_of_safety=0.25,
+        required_return=values["required_return"],
+        margin_of_safety=values["margin_of_safety"],
+        num_years=values["num_years"],
     )
 
     # DCF Valuation
     dcf_value = calculate_intrinsic_value(
         free_cash_flow=current_financial_line_item.get("free_cash_flow"),
         growth_rate=metrics["earnings_growth"],
-        discount_rate=0.10,
-        terminal_growth_rate=0.03,
-        num_years=5,
+        discount_rate=values["discount_rate"],
+        terminal_growth_rate=values["terminal_growth_rate"],
+        num_years=values["num_years"],
     )
 
-    # Get the market cap
-    market_cap = get_market_cap(ticker=data["ticker"])
-
     # Calculate combined valuation gap (average of both methods)
     dcf_gap = (dcf_value - market_cap) / market_cap
     owner_earnings_gap = (owner_earnings_value - market_cap) / market_cap
     valuation_gap = (dcf_gap + owner_earnings_gap) / 2
 
-    if valuation_gap > 0.15:  # More than 15% undervalued
+    if valuation_gap > gap_threshold:  # Undervalued by more than the threshold
         signal = "bullish"
-    elif valuation_gap < -0.15:  # More than 15% overvalued
+    elif valuation_gap < -gap_threshold:  # Overvalued by more than the threshold
         signal = "bearish"
     else:
         signal = "neutral"
@@ -83,7 +168,9 @@ def valuation_agent(state: AgentState):
     reasoning = {}
     reasoning["dcf_analysis"] = {
         "signal": (
-            "bullish" if dcf_gap > 0.15 else "bearish" if dcf_gap < -0.15 else "neutral"
+            "bullish"
+            if dcf_gap > gap_threshold
+            else "bearish" if dcf_gap < -gap_threshold else "neutral"
         ),
         "details": f"Intrinsic Value: ${dcf_value:,.2f}, Market Cap: ${market_cap:,.2f}, Gap: {dcf_gap:.1%}",
     }
@@ -91,39 +178,14 @@ def valuation_agent(state: AgentState):
     reasoning["owner_earnings_analysis"] = {
         "signal": (
             "bullish"
-            if owner_earnings_gap > 0.15
-            else "bearish" if owner_earnings_gap < -0.15 else "neutral"
+            if owner_earnings_gap > gap_threshold
+            else "bearish" if owner_earnings_gap < -gap_threshold else "neutral"
         ),
         "details": f"Owner Earnings Value: ${owner_earnings_value:,.2f}, Market Cap: ${market_cap:,.2f}, Gap: {owner_earnings_gap:.1%}",
     }
 
     confidence = round(abs(valuation_gap), 2) * 100
-    message_content = {
-        "signal": signal,
-        "confidence": confidence,
-        "reasoning": reasoning,
-    }
-
-    message = HumanMessage(
-        content=json.dumps(message_content),
-        name="valuation_agent",
-    )
-
-    # Print the reasoning if the flag is set
-    if state["metadata"]["show_reasoning"]:
-        show_agent_reasoning(message_content, "Valuation Analysis Agent")
-
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["valuation_agent"] = {
-        "signal": signal,
-        "confidence": confidence,
-        "reasoning": reasoning,
-    }
-
-    return {
-        "messages": [message],
-        "data": data,
-    }
+    return signal, confidence, reasoning
 
 
 def calculate_owner_earnings_value(
@@ -1,4 +1,8 @@
+import gzip
+import json
+import os
 from datetime import datetime, timedelta
+from pathlib import Path
 from dateutil.relativedelta import relativedelta
 import questionary
 
@@ -7,23 +11,102 @@ import pandas as pd
 from tabulate import tabulate
 from colorama import Fore, Back, Style, init
 
+from agents.technicals import WARMUP_BARS, TechnicalSignalHistory, bar_days
+from agents.technicals_stream import IndicatorEngine
+from agents.valuation import VALUATION_LINE_ITEMS
 from main import run_hedge_fund
-from tools.api import get_price_data
+from tools.api import get_prices, prices_to_df
+from tools.cache import get_cache_dir
+from tools.dataset import HistoricalDataset, dataset_scope
 from utils.display import print_backtest_results, format_backtest_row
 
 init(autoreset=True)
 
 
+def history_range(start_date, end_date):
+    """First and last day of the data a backtest over [start_date, end_date] loads (YYYY-MM-DD)."""
+    # Prices start early enough for the longest technical indicator window to be filled on the
+    # first day, the extra two weeks covering market holidays
+    dates = pd.date_range(start_date, end_date, freq="B")
+    history_start = dates[0] - pd.offsets.BDay(WARMUP_BARS) - timedelta(days=14)
+    return history_start.strftime("%Y-%m-%d"), dates[-1].strftime("%Y-%m-%d")
+
+
+def default_checkpoint_path(ticker, start_date, end_date):
+    """Checkpoint file of a backtest, in the cache directory."""
+    return get_cache_dir() / "checkpoints" / f"{ticker}_{start_date}_{end_date}.json.gz"
+
+
+def execute_trade(portfolio, action, quantity, current_price):
+    """
+    Validate and execute a trade against a portfolio, updating it in place.
+
+    Buys are cut to what the cash affords and sells to the shares held.
+
+    Args:
+        portfolio: Dict with "cash" and "stock"
+        action: "buy", "sell" or "hold"
+        quantity: Number of shares requested
+        current_price: Price the trade executes at
+
+    Returns:
+        Number of shares actually traded
+    """
+    if action == "buy" and quantity > 0:
+        cost = quantity * current_price
+        if cost <= portfolio["cash"]:
+            portfolio["stock"] += quantity
+            portfolio["cash"] -= cost
+            return quantity
+        else:
+            # Calculate maximum affordable quantity
+            max_quantity = portfolio["cash"] // current_price
+            if max_quantity > 0:
+                portfolio["stock"] += max_quantity
+                portfolio["cash"] -= max_quantity * current_price
+                return max_quantity
+            return 0
+    elif action == "sell" and quantity > 0:
+        quantity = min(quantity, portfolio["stock"])
+        if quantity > 0:
+            portfolio["cash"] += quantity * current_price
+            portfolio["stock"] -= quantity
+            return quantity
+        return 0
+    return 0
+
+
 class Backtester:
-    def __init__(self, agent, ticker, start_date, end_date, initial_capital, selected_analysts=None):
+    def __init__(
+        self,
+        agent,
+        ticker,
+        start_date,
+        end_date,
+        initial_capital,
+        selected_analysts=None,
+        indicator_mode="precomputed",
+        price_warehouse=None,
+        show_progress=True,
+        checkpoint_path=None,
+        checkpoint_every=10,
+    ):
+        if indicator_mode not in ("precomputed", "incremental"):
+            raise ValueError(f"Unknown indicator mode: {indicator_mode}")
         self.agent = agent
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
         self.selected_analysts = selected_analysts
+        self.indicator_mode = indicator_mode
+        self.price_warehouse = price_warehouse
+        self.show_progress = show_progress
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = checkpoint_every
         self.portfolio = {"cash": initial_capital, "stock": 0}
         self.portfolio_values = []
+        self.decisions = []
 
     def parse_agent_response(self, agent_output):
         try:
@@ -38,101 +121,205 @@ class Backtester:
 
     def execute_trade(self, action, quantity, current_price):
         """Validate and execute trades based on portfolio constraints"""
-        if action == "buy" and quantity > 0:
-            cost = quantity * current_price
-            if cost <= self.portfolio["cash"]:
-                self.portfolio["stock"] += quantity
-                self.portfolio["cash"] -= cost
-                return quantity
-            else:
-                # Calculate maximum affordable quantity
-                max_quantity = self.portfolio["cash"] // current_price
-                if max_quantity > 0:
-                    self.portfolio["stock"] += max_quantity
-                    self.portfolio["cash"] -= max_quantity * current_price
-                    return max_quantity
-                return 0
-        elif action == "sell" and quantity > 0:
-            quantity = min(quantity, self.portfolio["stock"])
-            if quantity > 0:
-                self.portfolio["cash"] += quantity * current_price
-                self.portfolio["stock"] -= quantity
-                return quantity
-            return 0
-        return 0
+        return execute_trade(self.portfolio, action, quantity, current_price)
+
+    def _checkpoint_config(self):
+        return {
+            "ticker": self.ticker,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "initial_capital": self.initial_capital,
+            "selected_analysts": self.selected_analysts,
+            "indicator_mode": self.indicator_mode,
+        }
+
+    def save_checkpoint(self, table_rows):
+        """
+        Write the state after the last completed day to the checkpoint file.
+
+        The file is gzipped JSON, written atomically so an interrupted run never
+        leaves a torn checkpoint.
+        """
+        # A day counts as completed once its decision is recorded
+        completed = len(self.decisions)
+        payload = {
+            "config": self._checkpoint_config(),
+            "portfolio_values": [
+                [value["Date"].strftime("%Y-%m-%d"), value["Portfolio Value"]]
+                for value in self.portfolio_values[:completed]
+            ],
+            "table_rows": table_rows[:completed],
+            "decisions": self.decisions,
+        }
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_name(f"{self.checkpoint_path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt") as f:
+            json.dump(payload, f, separators=(",", ":"), default=lambda value: value.item())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def load_checkpoint(self):
+        """
+        Restore the state saved by save_checkpoint.
+
+        Returns:
+            list: Table rows of the completed days, empty without a checkpoint
+        """
+        if not self.checkpoint_path.exists():
+            return []
+        with gzip.open(self.checkpoint_path, "rt") as f:
+            payload = json.load(f)
+        if payload["config"] != self._checkpoint_config():
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was written by a backtest with different settings"
+            )
 
-    def run_backtest(self):
+        self.decisions = payload["decisions"]
+        self.portfolio_values = [
+            {"Date": pd.Timestamp(day), "Portfolio Value": value}
+            for day, value in payload["portfolio_values"]
+        ]
+        if self.decisions:
+            self.portfolio = dict(self.decisions[-1]["portfolio"])
+        return payload["table_rows"]
+
+    def run_backtest(self, resume=False):
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
         table_rows = []
         
-        print("\nStarting backtest...")
-
-        for current_date in dates:
-            lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
-            current_date_str = current_date.strftime("%Y-%m-%d")
-
-            output = self.agent(
-                ticker=self.ticker,
-                start_date=lookback_start,
-                end_date=current_date_str,
-                portfolio=self.portfolio,
-                selected_analysts=self.selected_analysts,
-            )
-
-            agent_decision = output["decision"]
-            action, quantity = agent_decision["action"], agent_decision["quantity"]
-            df = get_price_data(self.ticker, lookback_start, current_date_str)
-            current_price = df.iloc[-1]["close"]
-
-            # Execute the trade with validation
-            executed_quantity = self.execute_trade(action, quantity, current_price)
-
-            # Update total portfolio value
-            total_value = self.portfolio["cash"] + self.portfolio["stock"] * current_price
-            self.portfolio["portfolio_value"] = total_value
-
-            # Count signals from selected analysts only
-            analyst_signals = output["analyst_signals"]
+        if resume:
+            table_rows = self.load_checkpoint()
+            if self.decisions:
+                # Days up to the last completed one are not run again
+                last_completed = pd.Timestamp(self.decisions[-1]["date"])
+                dates = dates[dates > last_completed]
+                if self.show_progress:
+                    print(f"\nResuming backtest after {last_completed.strftime('%Y-%m-%d')} ({len(self.decisions)} days completed)")
+
+        if self.show_progress:
+            print("\nStarting backtest...")
+
+        # Load every dataset the agents read for the whole period once; each day the agents are
+        # served from memory
+        history_start, history_end = history_range(self.start_date, self.end_date)
+        dataset = HistoricalDataset.load(
+            [self.ticker],
+            history_start,
+            history_end,
+            line_items=VALUATION_LINE_ITEMS + ["outstanding_shares"],
+            price_warehouse=self.price_warehouse,
+        )
+        if self.price_warehouse is not None:
+            # Memory-mapped bars, shared with every other process reading the warehouse
+            prices_df = self.price_warehouse.load(self.ticker, history_start, history_end)
+        else:
+            with dataset_scope(dataset):
+                prices_df = prices_to_df(get_prices(self.ticker, history_start, history_end))
+        bar_dates = bar_days(prices_df.index)
+
+        if self.indicator_mode == "precomputed":
+            # Every indicator series is computed once and each day reads its row
+            history = TechnicalSignalHistory(prices_df)
+        else:
+            # Technical indicators are advanced by each new bar instead of recomputed every day
+            indicators = IndicatorEngine()
 
-            # Count signals
-            bullish_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "bullish"])
-            bearish_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "bearish"])
-            neutral_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "neutral"])
+        try:
+            for current_date in dates:
+                lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
+                current_date_str = current_date.strftime("%Y-%m-%d")
+
+                df = prices_df.iloc[: bar_dates.searchsorted(current_date, side="right")]
+                if self.indicator_mode == "precomputed":
+                    technical_signals = history.at(current_date)
+                else:
+                    indicators.update_df(df)
+                    technical_signals = indicators.signals()
+
+                with dataset_scope(dataset.view(current_date_str)):
+                    output = self.agent(
+                        ticker=self.ticker,
+                        start_date=lookback_start,
+                        end_date=current_date_str,
+                        portfolio=self.portfolio,
+                        selected_analysts=self.selected_analysts,
+                        technical_signals=technical_signals,
+                    )
+
+                agent_decision = output["decision"]
+                action, quantity = agent_decision["action"], agent_decision["quantity"]
+                current_price = df.iloc[-1]["close"]
+
+                # Execute the trade with validation
+                executed_quantity = self.execute_trade(action, quantity, current_price)
+
+                # Update total portfolio value
+                total_value = self.portfolio["cash"] + self.portfolio["stock"] * current_price
+                self.portfolio["portfolio_value"] = total_value
+
+                # Count signals from selected analysts only
+                analyst_signals = output["analyst_signals"]
+
+                # Count signals
+                bullish_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "bullish"])
+                bearish_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "bearish"])
+                neutral_count = len([s for s in analyst_signals.values() if s.get("signal", "").lower() == "neutral"])
             
-            print(f"Signal counts - Bullish: {bullish_count}, Bearish: {bearish_count}, Neutral: {neutral_count}")
-
-            # Format and add row
-            table_rows.append(format_backtest_row(
-                date=current_date.strftime('%Y-%m-%d'),
-                ticker=self.ticker,
-                action=action,
-                quantity=executed_quantity,
-                price=current_price,
-                cash=self.portfolio['cash'],
-                stock=self.portfolio['stock'],
-                total_value=total_value,
-                bullish_count=bullish_count,
-                bearish_count=bearish_count,
-                neutral_count=neutral_count
-            ))
-
-            # Display the updated table
-            print_backtest_results(table_rows)
-
-            # Record the portfolio value
-            self.portfolio_values.append(
-                {"Date": current_date, "Portfolio Value": total_value}
-            )
+                if self.show_progress:
+                    print(f"Signal counts - Bullish: {bullish_count}, Bearish: {bearish_count}, Neutral: {neutral_count}")
+
+                # Format and add row
+                table_rows.append(format_backtest_row(
+                    date=current_date.strftime('%Y-%m-%d'),
+                    ticker=self.ticker,
+                    action=action,
+                    quantity=executed_quantity,
+                    price=current_price,
+                    cash=self.portfolio['cash'],
+                    stock=self.portfolio['stock'],
+                    total_value=total_value,
+                    bullish_count=bullish_count,
+                    bearish_count=bearish_count,
+                    neutral_count=neutral_count
+                ))
+
+                # Display the updated table
+                if self.show_progress:
+                    print_backtest_results(table_rows)
+
+                # Record the portfolio value
+                self.portfolio_values.append(
+                    {"Date": current_date, "Portfolio Value": total_value}
+                )
+
+                # Recording the decision, with the portfolio after it, completes the day
+                self.decisions.append({
+                    "date": current_date_str,
+                    "action": action,
+                    "quantity": quantity,
+                    "executed_quantity": executed_quantity,
+                    "price": current_price,
+                    "portfolio": dict(self.portfolio),
+                    "analyst_signals": {
+                        name: {"signal": s.get("signal"), "confidence": s.get("confidence")}
+                        for name, s in analyst_signals.items()
+                    },
+                })
+                if self.checkpoint_path is not None and len(self.decisions) % self.checkpoint_every == 0:
+                    self.save_checkpoint(table_rows)
+        except BaseException:
+            # Keep the completed days when a day fails or the run is interrupted
+            if self.checkpoint_path is not None:
+                self.save_checkpoint(table_rows)
+            raise
+        # A finished run has nothing left to resume
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.unlink(missing_ok=True)
 
     def analyze_performance(self):
         # Convert portfolio values to DataFrame
         performance_df = pd.DataFrame(self.portfolio_values).set_index("Date")
-
-        # Calculate total return
-        total_return = (
-            self.portfolio["portfolio_value"] - self.initial_capital
-        ) / self.initial_capital
-        print(f"Total Return: {total_return * 100:.2f}%")
+        metrics = compute_performance_metrics(performance_df["Portfolio Value"], self.initial_capital)
+        print(f"Total Return: {metrics['total_return'] * 100:.2f}%")
 
         # Plot the portfolio value over time
         performance_df["Portfolio Value"].plot(
@@ -142,22 +329,37 @@ class Backtester:
         plt.xlabel("Date")
         plt.show()
 
-        # Compute daily returns
         performance_df["Daily Return"] = performance_df["Portfolio Value"].pct_change()
+        print(f"Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+        print(f"Maximum Drawdown: {metrics['max_drawdown'] * 100:.2f}%")
 
-        # Calculate Sharpe Ratio (assuming 252 trading days in a year)
-        mean_daily_return = performance_df["Daily Return"].mean()
-        std_daily_return = performance_df["Daily Return"].std()
-        sharpe_ratio = (mean_daily_return / std_daily_return) * (252**0.5)
-        print(f"Sharpe Ratio: {sharpe_ratio:.2f}")
+        return performance_df
 
-        # Calculate Maximum Drawdown
-        rolling_max = performance_df["Portfolio Value"].cummax()
-        drawdown = performance_df["Portfolio Value"] / rolling_max - 1
-        max_drawdown = drawdown.min()
-        print(f"Maximum Drawdown: {max_drawdown * 100:.2f}%")
 
-        return performance_df
+def compute_performance_metrics(portfolio_values: pd.Series, initial_capital: float) -> dict:
+    """
+    Total return, annualized Sharpe ratio and maximum drawdown of a backtest.
+
+    Args:
+        portfolio_values: Portfolio value on each day of the backtest
+        initial_capital: Capital the backtest started with
+
+    Returns:
+        dict: total_return, sharpe_ratio and max_drawdown (a negative fraction)
+    """
+    total_return = (portfolio_values.iloc[-1] - initial_capital) / initial_capital
+
+    # Sharpe Ratio from daily returns (assuming 252 trading days in a year)
+    daily_returns = portfolio_values.pct_change()
+    sharpe_ratio = (daily_returns.mean() / daily_returns.std()) * (252**0.5)
+
+    # Maximum Drawdown
+    drawdown = portfolio_values / portfolio_values.cummax() - 1
+    return {
+        "total_return": total_return,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": drawdown.min(),
+    }
 
 
 ### 4. Run the Backtest #####
@@ -185,9 +387,48 @@ if __name__ == "__main__":
         default=100000,
         help="Initial capital amount (default: 100000)",
     )
+    parser.add_argument(
+        "--indicators",
+        choices=["precomputed", "incremental"],
+        default="precomputed",
+        help="Compute technical indicators once for the whole period, or bar by bar (default: precomputed)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Checkpoint file (default: one per ticker and period in the cache directory)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help="Write a checkpoint every N completed days, and when the run fails or is interrupted (default: 10)",
+    )
+    restart = parser.add_mutually_exclusive_group()
+    restart.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last completed day in the checkpoint",
+    )
+    restart.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Start over, replacing an existing checkpoint",
+    )
 
     args = parser.parse_args()
 
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+    checkpoint_path = Path(
+        args.checkpoint or default_checkpoint_path(args.ticker, args.start_date, args.end_date)
+    )
+    if checkpoint_path.exists() and not (args.resume or args.fresh):
+        parser.error(
+            f"an interrupted run left checkpoint {checkpoint_path}; "
+            "pass --resume to continue it or --fresh to start over"
+        )
+
     selected_analysts = None
     choices = questionary.checkbox(
         "Use the Space bar to select/unselect analysts.",
@@ -222,8 +463,11 @@ if __name__ == "__main__":
         end_date=args.end_date,
         initial_capital=args.initial_capital,
         selected_analysts=selected_analysts,
+        indicator_mode=args.indicators,
+        checkpoint_path=checkpoint_path,
+        checkpoint_every=args.checkpoint_every,
     )
 
     # Run the backtesting process
-    backtester.run_backtest()
+    backtester.run_backtest(resume=args.resume)
     performance_df = backtester.analyze_performance()
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+from dotenv import load_dotenv
+
+from tools import async_api
+from tools.warehouse import PriceWarehouse
+
+load_dotenv()
+
+
+async def import_prices(tickers, start_date, end_date, warehouse):
+    """
+    Fetch daily bars for every ticker concurrently and store them in the warehouse.
+
+    Bars are fetched past the price cache and each ticker's bars are written
+    as soon as they arrive, so the import keeps no second copy of the universe.
+    """
+
+    async def import_ticker(ticker):
+        prices = await async_api.fetch_prices(ticker, start_date, end_date)
+        if not prices:
+            raise ValueError("No price data returned")
+        return len(prices), warehouse.write(ticker, prices)
+
+    results = await async_api.gather_by_ticker(import_ticker, tickers)
+    for ticker, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{ticker}: failed ({result})")
+            continue
+        fetched, count = result
+        print(f"{ticker}: {fetched} bars fetched, {count} stored")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk import daily prices into the local price warehouse"
+    )
+    parser.add_argument(
+        "--tickers", type=str, required=True, help="Comma-separated ticker symbols"
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="End date in YYYY-MM-DD format",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=(datetime.now() - relativedelta(years=5)).strftime("%Y-%m-%d"),
+        help="Start date in YYYY-MM-DD format (default: 5 years ago)",
+    )
+    parser.add_argument(
+        "--warehouse-dir", type=str, help="Warehouse location (default: cache directory)"
+    )
+
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    asyncio.run(
+        import_prices(
+            tickers, args.start_date, args.end_date, PriceWarehouse(args.warehouse_dir)
+        )
+    )
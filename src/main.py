@@ -6,12 +6,13 @@ import questionary
 
 from agents.fundamentals import fundamentals_agent
 from agents.portfolio_manager import portfolio_management_agent
-from agents.technicals import technical_analyst_agent
+from agents.technicals import STRATEGY_PROFILES, technical_analyst_agent
 from agents.risk_manager import risk_management_agent
 from agents.sentiment import sentiment_agent
 from graph.state import AgentState
 from agents.valuation import valuation_agent
-from utils.display import print_trading_output
+from tools.scope import request_scope
+from utils.display import print_request_stats, print_trading_output
 
 import argparse
 from datetime import datetime
@@ -39,7 +40,27 @@ def run_hedge_fund(
     portfolio: dict,
     show_reasoning: bool = False,
     selected_analysts: list = None,
+    tickers: list = None,
+    technical_signals: dict = None,
+    technical_profile: str = None,
+    technical_weights: dict = None,
+    fundamentals_thresholds: dict = None,
+    valuation_params: dict = None,
 ):
+    """
+    Run the agent graph for one ticker.
+
+    `tickers` optionally lists the whole universe being evaluated together, so
+    agents can batch their requests. `run_hedge_fund_for_tickers` runs a
+    whole universe in a shared request scope, so the batches are sent once.
+
+    `technical_signals` optionally supplies precomputed strategy signals, in
+    the format of `compute_technical_signals`, for the technical analyst.
+    `technical_profile` and `technical_weights` select and weight its
+    strategies (see `technical_strategy_config`). `fundamentals_thresholds`
+    and `valuation_params` override FUNDAMENTALS_THRESHOLDS and
+    VALUATION_PARAMS.
+    """
     # Create a new workflow if analysts are customized
     if selected_analysts is not None:
         workflow = create_workflow(selected_analysts)
@@ -47,31 +68,67 @@ def run_hedge_fund(
     else:
         agent = app
 
-    final_state = agent.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content="Make a trading decision based on the provided data.",
-                )
-            ],
-            "data": {
-                "ticker": ticker,
-                "portfolio": portfolio,
-                "start_date": start_date,
-                "end_date": end_date,
-                "analyst_signals": {},
-            },
-            "metadata": {
-                "show_reasoning": show_reasoning,
+    # Identical API calls made by different agents in this run are only sent once
+    with request_scope() as scope:
+        final_state = agent.invoke(
+            {
+                "messages": [
+                    HumanMessage(
+                        content="Make a trading decision based on the provided data.",
+                    )
+                ],
+                "data": {
+                    "ticker": ticker,
+                    "portfolio": portfolio,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "analyst_signals": {},
+                    "tickers": tickers or [ticker],
+                    "technical_signals": technical_signals,
+                    "technical_profile": technical_profile,
+                    "technical_weights": technical_weights,
+                    "fundamentals_thresholds": fundamentals_thresholds,
+                    "valuation_params": valuation_params,
+                },
+                "metadata": {
+                    "show_reasoning": show_reasoning,
+                },
             },
-        },
-    )
+        )
     return {
         "decision": parse_hedge_fund_response(final_state["messages"][-1].content),
         "analyst_signals": final_state["data"]["analyst_signals"],
+        "request_stats": scope.stats(),
     }
 
 
+def run_hedge_fund_for_tickers(
+    tickers: list,
+    start_date: str,
+    end_date: str,
+    portfolio: dict,
+    **kwargs,
+):
+    """
+    Run the agent graph for each of `tickers`, evaluated together.
+
+    The runs share one request scope, so requests batched over the whole
+    universe (e.g. the valuation agent's line items) are sent once rather
+    than once per ticker. Keyword arguments are passed to `run_hedge_fund`.
+
+    Returns:
+        Tuple of a dict mapping each ticker to its `run_hedge_fund` result,
+        and the request stats of all the runs
+    """
+    results = {}
+    with request_scope() as scope:
+        for ticker in tickers:
+            results[ticker] = run_hedge_fund(
+                ticker, start_date, end_date, portfolio, tickers=tickers, **kwargs
+            )
+    return results, scope.stats()
+
+
 def start(state: AgentState):
     """Initialize the workflow with the input message."""
     return state
@@ -121,7 +178,12 @@ def create_workflow(selected_analysts=None):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the hedge fund trading system")
-    parser.add_argument("--ticker", type=str, required=True, help="Stock ticker symbol")
+    parser.add_argument(
+        "--ticker",
+        type=str,
+        required=True,
+        help="Stock ticker symbol, or comma-separated symbols to evaluate together",
+    )
     parser.add_argument(
         "--start-date",
         type=str,
@@ -133,6 +195,11 @@ if __name__ == "__main__":
     parser.add_argument(
         "--show-reasoning", action="store_true", help="Show reasoning from each agent"
     )
+    parser.add_argument(
+        "--technical-profile",
+        choices=sorted(STRATEGY_PROFILES),
+        help="Technical strategy profile (default: TECHNICAL_STRATEGY_PROFILE or full)",
+    )
 
     args = parser.parse_args()
 
@@ -195,12 +262,18 @@ if __name__ == "__main__":
     }
 
     # Run the hedge fund
-    result = run_hedge_fund(
-        ticker=args.ticker,
+    tickers = [t.strip().upper() for t in args.ticker.split(",") if t.strip()]
+    results, request_stats = run_hedge_fund_for_tickers(
+        tickers=tickers,
         start_date=start_date,
         end_date=end_date,
         portfolio=portfolio,
         show_reasoning=args.show_reasoning,
         selected_analysts=selected_analysts,
+        technical_profile=args.technical_profile,
     )
-    print_trading_output(result)
+    for ticker, result in results.items():
+        if len(tickers) > 1:
+            print(f"\n{Fore.WHITE}{Style.BRIGHT}{ticker}{Style.RESET_ALL}")
+        print_trading_output(result)
+    print_request_stats(request_stats)
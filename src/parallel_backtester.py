@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+import questionary
+from colorama import Fore, Style, init
+from dateutil.relativedelta import relativedelta
+from dotenv import load_dotenv
+
+from backtester import Backtester, compute_performance_metrics, history_range
+from main import run_hedge_fund
+from tools import async_api
+from tools.warehouse import PriceWarehouse
+from utils.display import print_backtest_report
+
+load_dotenv()
+
+init(autoreset=True)
+
+
+def run_ticker_backtest(
+    ticker,
+    start_date,
+    end_date,
+    initial_capital,
+    selected_analysts,
+    indicator_mode,
+    warehouse_dir,
+    agent=run_hedge_fund,
+):
+    """
+    Backtest one ticker in a worker process, reading its prices from the warehouse.
+
+    Returns:
+        pd.Series: Portfolio value on each day of the backtest
+    """
+    backtester = Backtester(
+        agent=agent,
+        ticker=ticker,
+        start_date=start_date,
+        end_date=end_date,
+        initial_capital=initial_capital,
+        selected_analysts=selected_analysts,
+        indicator_mode=indicator_mode,
+        price_warehouse=PriceWarehouse(warehouse_dir),
+        show_progress=False,
+    )
+    backtester.run_backtest()
+    values = pd.DataFrame(backtester.portfolio_values).set_index("Date")
+    return values["Portfolio Value"]
+
+
+def run_parallel_backtest(
+    tickers,
+    start_date,
+    end_date,
+    initial_capital,
+    selected_analysts=None,
+    indicator_mode="precomputed",
+    workers=None,
+    warehouse_dir=None,
+    agent=run_hedge_fund,
+):
+    """
+    Backtest every ticker independently, spreading the tickers over a process pool.
+
+    The capital is split equally between the tickers. Prices for the whole
+    period are fetched once and written to the price warehouse, which workers
+    memory-map, so the bars are shared through the page cache instead of
+    being pickled to each process.
+
+    Args:
+        tickers: Tickers to backtest
+        start_date: First day of the backtest (YYYY-MM-DD)
+        end_date: Last day of the backtest (YYYY-MM-DD)
+        initial_capital: Total capital, split equally between the tickers
+        selected_analysts: Analysts to run, or None for all of them
+        indicator_mode: "precomputed" or "incremental" (see Backtester)
+        workers: Number of worker processes (default: number of CPUs)
+        warehouse_dir: Price warehouse location (default: cache directory)
+        agent: Picklable module-level function making each day's decision
+
+    Returns:
+        Tuple of a dict mapping each ticker that completed to its daily portfolio
+        values, and the capital each ticker started with
+    """
+    warehouse = PriceWarehouse(warehouse_dir)
+    history_start, history_end = history_range(start_date, end_date)
+    prices = asyncio.run(
+        async_api.gather_by_ticker(async_api.get_prices, tickers, history_start, history_end)
+    )
+    tickers = []
+    for ticker, bars in prices.items():
+        if isinstance(bars, Exception) or not bars:
+            print(f"{Fore.RED}{ticker}: no price data, skipped ({bars}){Style.RESET_ALL}")
+            continue
+        try:
+            warehouse.write(ticker, bars)
+        except Exception as e:
+            print(f"{Fore.RED}{ticker}: failed ({e}){Style.RESET_ALL}")
+            continue
+        tickers.append(ticker)
+    capital = initial_capital / max(len(tickers), 1)
+
+    results = {}
+    # Spawned rather than forked: the parent holds a pooled HTTP session and worker threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(
+                run_ticker_backtest,
+                ticker,
+                start_date,
+                end_date,
+                capital,
+                selected_analysts,
+                indicator_mode,
+                str(warehouse.root),
+                agent,
+            ): ticker
+            for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+                print(f"{ticker}: done ({len(results)}/{len(tickers)})")
+            except Exception as e:
+                print(f"{Fore.RED}{ticker}: failed ({e}){Style.RESET_ALL}")
+    return {ticker: results[ticker] for ticker in tickers if ticker in results}, capital
+
+
+def build_backtest_report(results, capital):
+    """
+    Performance of each ticker and of the portfolio holding all of them.
+
+    Args:
+        results: Daily portfolio values by ticker, as returned by run_parallel_backtest
+        capital: Capital each ticker started with
+
+    Returns:
+        List of report rows, the combined portfolio last
+    """
+    report = []
+    for ticker, values in results.items():
+        metrics = compute_performance_metrics(values, capital)
+        report.append({"ticker": ticker, "final_value": values.iloc[-1], **metrics})
+    if results:
+        combined = pd.concat(results.values(), axis=1).sum(axis=1)
+        metrics = compute_performance_metrics(combined, capital * len(results))
+        report.append({"ticker": "Combined", "final_value": combined.iloc[-1], **metrics})
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest many tickers in parallel")
+    parser.add_argument(
+        "--tickers", type=str, required=True, help="Comma-separated ticker symbols"
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="End date in YYYY-MM-DD format",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=(datetime.now() - relativedelta(months=3)).strftime("%Y-%m-%d"),
+        help="Start date in YYYY-MM-DD format",
+    )
+    parser.add_argument(
+        "--initial-capital",
+        type=float,
+        default=100000,
+        help="Initial capital amount, split equally between the tickers (default: 100000)",
+    )
+    parser.add_argument(
+        "--indicators",
+        choices=["precomputed", "incremental"],
+        default="precomputed",
+        help="Compute technical indicators once for the whole period, or bar by bar (default: precomputed)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--warehouse-dir", type=str, help="Warehouse location (default: cache directory)"
+    )
+
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+
+    selected_analysts = None
+    choices = questionary.checkbox(
+        "Use the Space bar to select/unselect analysts.",
+        choices=[
+            questionary.Choice("Technical Analyst", value="technical_analyst"),
+            questionary.Choice("Fundamentals Analyst", value="fundamentals_analyst"),
+            questionary.Choice("Sentiment Analyst", value="sentiment_analyst"),
+            questionary.Choice("Valuation Analyst", value="valuation_analyst"),
+        ],
+        instruction="\n\nPress 'a' to toggle all.\n\nPress Enter when done to run the hedge fund.",
+        validate=lambda x: len(x) > 0 or "You must select at least one analyst.",
+        style=questionary.Style([
+            ('checkbox-selected', 'fg:green'),
+            ('selected', 'fg:green noinherit'),
+            ('highlighted', 'noinherit'),
+            ('pointer', 'noinherit'),
+        ])
+    ).ask()
+
+    if not choices:
+        print("You must select at least one analyst. Using all analysts by default.")
+    else:
+        selected_analysts = choices
+
+    results, capital = run_parallel_backtest(
+        tickers,
+        args.start_date,
+        args.end_date,
+        args.initial_capital,
+        selected_analysts=selected_analysts,
+        indicator_mode=args.indicators,
+        workers=args.workers,
+        warehouse_dir=args.warehouse_dir,
+    )
+    print_backtest_report(build_backtest_report(results, capital))
@@ -0,0 +1,399 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+from colorama import Fore, Style, init
+from dateutil.relativedelta import relativedelta
+from dotenv import load_dotenv
+
+from agents.fundamentals import FUNDAMENTALS_THRESHOLDS, score_fundamentals
+from agents.risk_manager import calculate_position_limit
+from agents.sentiment import score_insider_trades
+from agents.technicals import (
+    TECHNICAL_STRATEGIES,
+    TechnicalSignalHistory,
+    bar_days,
+    technical_strategy_config,
+    weighted_signal_combination,
+)
+from agents.valuation import VALUATION_LINE_ITEMS, VALUATION_PARAMS, score_valuation
+from backtester import compute_performance_metrics, execute_trade, history_range
+from tools.api import (
+    get_financial_metrics,
+    get_insider_trades,
+    get_market_cap,
+    get_prices,
+    prices_to_df,
+    search_line_items,
+)
+from tools.dataset import HistoricalDataset, dataset_scope
+from utils.display import print_sweep_results
+
+load_dotenv()
+
+init(autoreset=True)
+
+# Parameter groups a sweep can vary, and the names each accepts
+SWEEP_GROUPS = {
+    "technical": TECHNICAL_STRATEGIES,
+    "fundamentals": FUNDAMENTALS_THRESHOLDS,
+    "valuation": VALUATION_PARAMS,
+}
+
+DEFAULT_GRID = {
+    "technical.trend": [0.15, 0.25, 0.35],
+    "technical.mean_reversion": [0.1, 0.2, 0.3],
+    "fundamentals.return_on_equity": [0.10, 0.15, 0.20],
+    "fundamentals.price_to_earnings_ratio": [20, 25, 30],
+    "valuation.discount_rate": [0.08, 0.10, 0.12],
+    "valuation.gap_threshold": [0.10, 0.15, 0.20],
+}
+
+SIGNAL_VALUES = {"bullish": 1, "neutral": 0, "bearish": -1}
+
+
+def expand_grid(grid):
+    """
+    Every combination of a parameter grid.
+
+    Args:
+        grid: Parameter name ("group.name", e.g. "valuation.discount_rate") to
+            the values to try
+
+    Returns:
+        List of combinations, each mapping a group in SWEEP_GROUPS to overrides
+    """
+    keys = []
+    for key in grid:
+        group, _, name = key.partition(".")
+        if group not in SWEEP_GROUPS or name not in SWEEP_GROUPS[group]:
+            raise ValueError(f"Unknown sweep parameter: {key}")
+        keys.append((group, name))
+
+    combinations = []
+    for values in itertools.product(*grid.values()):
+        combination = {group: {} for group in SWEEP_GROUPS}
+        for (group, name), value in zip(keys, values):
+            combination[group][name] = value
+        combinations.append(combination)
+    return combinations
+
+
+def load_sweep_inputs(tickers, start_date, end_date):
+    """
+    Everything the scoring reads on each simulated day, fetched and computed once.
+
+    Technical strategy signals come from indicator series computed over the
+    whole history, and fundamentals from one HistoricalDataset, so a sweep
+    only has to rescore and combine them for each combination. Tickers
+    without price data are reported and left out.
+
+    Returns:
+        Dict mapping each ticker to its list of days
+    """
+    history_start, history_end = history_range(start_date, end_date)
+    dataset = HistoricalDataset.load(
+        tickers,
+        history_start,
+        history_end,
+        line_items=VALUATION_LINE_ITEMS + ["outstanding_shares"],
+    )
+
+    inputs = {}
+    for ticker in tickers:
+        try:
+            with dataset_scope(dataset):
+                prices_df = prices_to_df(get_prices(ticker, history_start, history_end))
+        except ValueError as e:
+            print(f"{Fore.RED}{ticker}: no price data, skipped ({e}){Style.RESET_ALL}")
+            continue
+        bar_dates = bar_days(prices_df.index)
+        history = TechnicalSignalHistory(prices_df)
+
+        days = []
+        for current_date in pd.date_range(start_date, end_date, freq="B"):
+            current_date_str = current_date.strftime("%Y-%m-%d")
+            # Same 30-day window the agents look back on in a backtest
+            lookback = prices_df.iloc[
+                bar_dates.searchsorted(current_date - timedelta(days=30))
+                : bar_dates.searchsorted(current_date, side="right")
+            ]
+            with dataset_scope(dataset.view(current_date_str)):
+                metrics = _fetch_or_none(get_financial_metrics, ticker, current_date_str, "ttm", 1)
+                line_items = _fetch_or_none(
+                    search_line_items,
+                    ticker,
+                    VALUATION_LINE_ITEMS,
+                    "ttm",
+                    2,
+                    end_date=current_date_str,
+                )
+                market_cap = _fetch_or_none(get_market_cap, ticker, current_date_str)
+                insider_trades = _fetch_or_none(get_insider_trades, ticker, current_date_str, 5)
+
+            days.append(
+                {
+                    "date": current_date,
+                    "price": float(lookback["close"].iloc[-1]),
+                    "avg_daily_volume": float(lookback["volume"].mean()),
+                    "technical": {
+                        name: (signals["signal"], signals["confidence"])
+                        for name, signals in history.at(current_date).items()
+                    },
+                    "metrics": metrics[0] if metrics else None,
+                    "line_items": line_items if line_items and len(line_items) >= 2 else None,
+                    "market_cap": market_cap,
+                    # No trades scores neutral with zero confidence
+                    "sentiment": score_insider_trades(insider_trades or [])[:2],
+                }
+            )
+        inputs[ticker] = days
+    return inputs
+
+
+def _fetch_or_none(fetch, *args, **kwargs):
+    # The API helpers raise ValueError when there is no data for the day
+    try:
+        return fetch(*args, **kwargs)
+    except ValueError:
+        return None
+
+
+# Per-process state of the sweep workers
+_inputs = {}
+_signal_cache = {}
+
+
+def _init_worker(inputs):
+    global _inputs
+    _inputs = inputs
+    _signal_cache.clear()
+
+
+def _analyst_signals(ticker, group, overrides):
+    # One analyst's (signal, confidence) on every day, shared by all combinations with the same
+    # overrides for that analyst
+    key = (ticker, group, tuple(sorted(overrides.items())))
+    if key in _signal_cache:
+        return _signal_cache[key]
+
+    days = _inputs[ticker]
+    if group == "technical":
+        weights, _ = technical_strategy_config("full", overrides)
+        signals = []
+        for day in days:
+            combined = weighted_signal_combination(
+                {name: {"signal": s, "confidence": c} for name, (s, c) in day["technical"].items()},
+                weights,
+            )
+            signals.append((combined["signal"], round(combined["confidence"] * 100)))
+    elif group == "fundamentals":
+        # Reports only change quarterly, so each is scored once
+        by_report = {}
+        signals = []
+        for day in days:
+            metrics = day["metrics"]
+            if metrics is None:
+                signals.append(("neutral", 0))
+                continue
+            if id(metrics) not in by_report:
+                by_report[id(metrics)] = score_fundamentals(metrics, overrides)[:2]
+            signals.append(by_report[id(metrics)])
+    else:
+        signals = []
+        for day in days:
+            if day["metrics"] is None or day["line_items"] is None or not day["market_cap"]:
+                signals.append(("neutral", 0))
+                continue
+            signals.append(
+                score_valuation(day["metrics"], day["line_items"], day["market_cap"], overrides)[:2]
+            )
+
+    _signal_cache[key] = signals
+    return signals
+
+
+def rule_based_decision(analyst_signals, portfolio, current_price, max_position_size):
+    """
+    Deterministic stand-in for the portfolio manager.
+
+    Buys up to the position limit when the confidence-weighted analyst vote is
+    bullish and sells the whole position when it is bearish.
+
+    Args:
+        analyst_signals: (signal, confidence 0-100) of each analyst
+        portfolio: Current cash and stock
+        current_price: Latest close
+        max_position_size: Position limit in dollars from the risk manager
+
+    Returns:
+        tuple: Action and quantity
+    """
+    score = sum(SIGNAL_VALUES[signal] * confidence for signal, confidence in analyst_signals)
+    if score > 0:
+        room = min(max_position_size - portfolio["stock"] * current_price, portfolio["cash"])
+        quantity = int(room // current_price) if room > 0 else 0
+        return ("buy", quantity) if quantity > 0 else ("hold", 0)
+    if score < 0 and portfolio["stock"] > 0:
+        return "sell", portfolio["stock"]
+    return "hold", 0
+
+
+def simulate(ticker, combination, initial_capital):
+    """
+    Backtest one ticker with one parameter combination from the precomputed inputs.
+
+    Returns:
+        pd.Series: Portfolio value on each day
+    """
+    analysts = [
+        _analyst_signals(ticker, group, combination[group]) for group in SWEEP_GROUPS
+    ]
+    days = _inputs[ticker]
+    portfolio = {"cash": initial_capital, "stock": 0}
+    values = []
+    for i, day in enumerate(days):
+        price = day["price"]
+        total_value = portfolio["cash"] + portfolio["stock"] * price
+        max_position_size = calculate_position_limit(price, day["avg_daily_volume"], total_value)
+        signals = [signals[i] for signals in analysts] + [day["sentiment"]]
+        action, quantity = rule_based_decision(signals, portfolio, price, max_position_size)
+        execute_trade(portfolio, action, quantity, price)
+        values.append(portfolio["cash"] + portfolio["stock"] * price)
+    return pd.Series(values, index=[day["date"] for day in days])
+
+
+def _run_combinations(task):
+    combinations, initial_capital = task
+    tickers = list(_inputs)
+    capital = initial_capital / len(tickers)
+    rows = []
+    for combination in combinations:
+        combined = sum(
+            simulate(ticker, combination, capital) for ticker in tickers
+        )
+        rows.append({**combination, **compute_performance_metrics(combined, initial_capital)})
+    return rows
+
+
+def run_sweep(
+    tickers,
+    start_date,
+    end_date,
+    initial_capital,
+    grid,
+    workers=None,
+    chunk_size=50,
+):
+    """
+    Backtest every combination of a parameter grid and rank them.
+
+    Data is fetched and technical indicators computed once; each combination
+    only rescores the analysts whose parameters it changes and replays the
+    trades. The LLM portfolio manager is replaced by rule_based_decision.
+    Combinations are spread over a process pool.
+
+    Args:
+        tickers: Tickers traded, with the capital split equally between them
+        start_date: First day of the backtest (YYYY-MM-DD)
+        end_date: Last day of the backtest (YYYY-MM-DD)
+        initial_capital: Total capital
+        grid: Parameter grid, see expand_grid
+        workers: Number of worker processes (default: number of CPUs)
+        chunk_size: Combinations per task sent to a worker
+
+    Returns:
+        List of result rows, best Sharpe ratio first, ties broken by the
+        smaller drawdown
+    """
+    combinations = expand_grid(grid)
+    inputs = load_sweep_inputs(tickers, start_date, end_date)
+    if not inputs:
+        raise ValueError("No price data for any of the tickers")
+    tasks = [
+        (combinations[i : i + chunk_size], initial_capital)
+        for i in range(0, len(combinations), chunk_size)
+    ]
+
+    # Inputs are sent once to each worker rather than with every task
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(inputs,)
+    ) as pool:
+        rows = [row for chunk in pool.map(_run_combinations, tasks) for row in chunk]
+
+    return sorted(
+        rows,
+        key=lambda row: (
+            -row["sharpe_ratio"] if math.isfinite(row["sharpe_ratio"]) else math.inf,
+            -row["max_drawdown"],
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Grid search over strategy weights, fundamentals thresholds and valuation parameters"
+    )
+    parser.add_argument(
+        "--tickers", type=str, required=True, help="Comma-separated ticker symbols"
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="End date in YYYY-MM-DD format",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=(datetime.now() - relativedelta(months=3)).strftime("%Y-%m-%d"),
+        help="Start date in YYYY-MM-DD format",
+    )
+    parser.add_argument(
+        "--initial-capital",
+        type=float,
+        default=100000,
+        help="Initial capital amount, split equally between the tickers (default: 100000)",
+    )
+    parser.add_argument(
+        "--grid",
+        type=str,
+        help='JSON file mapping parameters to values, e.g. {"valuation.discount_rate": [0.08, 0.1]}',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of best combinations to show (default: 10)"
+    )
+    parser.add_argument("--output", type=str, help="Write every result to this CSV file")
+
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    results = run_sweep(
+        tickers,
+        args.start_date,
+        args.end_date,
+        args.initial_capital,
+        grid,
+        workers=args.workers,
+    )
+    print_sweep_results(results, list(grid), args.top)
+    if args.output:
+        pd.json_normalize(results).to_csv(args.output, index=False)
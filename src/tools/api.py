@@ -1,15 +1,63 @@
 import os
-from typing import Dict, Any, List
+from datetime import date
+from typing import Dict, Any, List, Optional, Union
+import numpy as np
 import pandas as pd
-import requests
 
-import requests
+from tools.cache import (
+    CompanyFactsCache,
+    FundamentalsCache,
+    InsiderTradeStore,
+    PriceCache,
+    cache_enabled,
+)
+from tools.client import get_client
+from tools.dataset import get_active_dataset
+from tools.scope import single_flight
+from tools.streaming import PriceColumnBuffer, iter_json_array, parse_times
 
+_price_cache = PriceCache()
+_fundamentals_cache = FundamentalsCache()
+_insider_trade_store = InsiderTradeStore()
+_company_facts_cache = CompanyFactsCache()
+
+def _base_url() -> str:
+    """API root, overridable with FINANCIAL_DATASETS_BASE_URL (e.g. to use tools/mock_server.py)."""
+    return os.environ.get(
+        "FINANCIAL_DATASETS_BASE_URL", "https://api.financialdatasets.ai"
+    ).rstrip("/")
+
+@single_flight
 def get_financial_metrics(
     ticker: str,
     report_period: str,
     period: str = 'ttm',
     limit: int = 1
+) -> List[Dict[str, Any]]:
+    """Fetch financial metrics, answered point-in-time from the active dataset or the fundamentals cache."""
+    dataset = get_active_dataset()
+    financial_metrics = (
+        dataset.financial_metrics(ticker, report_period, period, limit) if dataset else None
+    )
+    if financial_metrics is None and cache_enabled():
+        financial_metrics = _fundamentals_cache.get_reports(
+            ticker,
+            f"financial_metrics:{period}",
+            report_period,
+            limit,
+            fetch=lambda lte, n: _fetch_financial_metrics(ticker, lte, period, n),
+        )
+    if financial_metrics is None:
+        financial_metrics = _fetch_financial_metrics(ticker, report_period, period, limit)
+    if not financial_metrics:
+        raise ValueError("No financial metrics returned")
+    return financial_metrics
+
+def _fetch_financial_metrics(
+    ticker: str,
+    report_period: str,
+    period: str,
+    limit: int
 ) -> List[Dict[str, Any]]:
     """Fetch financial metrics from the API."""
     headers = {}
@@ -17,53 +65,168 @@ def get_financial_metrics(
         headers["X-API-KEY"] = api_key
     
     url = (
-        f"https://api.financialdatasets.ai/financial-metrics/"
+        f"{_base_url()}/financial-metrics/"
         f"?ticker={ticker}"
         f"&report_period_lte={report_period}"
         f"&limit={limit}"
         f"&period={period}"
     )
-    response = requests.get(url, headers=headers)
+    response = get_client().get(url, headers=headers)
     if response.status_code != 200:
         raise Exception(
             f"Error fetching data: {response.status_code} - {response.text}"
         )
     data = response.json()
-    financial_metrics = data.get("financial_metrics")
-    if not financial_metrics:
-        raise ValueError("No financial metrics returned")
-    return financial_metrics
+    return data.get("financial_metrics") or []
 
+@single_flight
 def search_line_items(
     ticker: str,
     line_items: List[str],
     period: str = 'ttm',
-    limit: int = 1
+    limit: int = 1,
+    end_date: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch line items for the latest `limit` reports.
+
+    When `end_date` is given only reports with report_period <= end_date are
+    returned. Results are answered from the active dataset or the fundamentals
+    cache when possible.
+    """
+    as_of = end_date or date.today().strftime("%Y-%m-%d")
+    dataset = get_active_dataset()
+    search_results = (
+        dataset.line_items(ticker, line_items, period, limit, end_date) if dataset else None
+    )
+    if search_results is None and cache_enabled():
+        search_results = _fundamentals_cache.get_reports(
+            ticker,
+            _line_items_key(line_items, period),
+            as_of,
+            limit,
+            fetch=lambda lte, n: _post_line_items([ticker], line_items, period, n),
+        )
+    if search_results is None:
+        search_results = _as_of(
+            _post_line_items([ticker], line_items, period, _history_limit(limit, end_date)),
+            end_date,
+            limit,
+        )
+    if not search_results:
+        raise ValueError("No search results returned")
+    return search_results
+
+@single_flight
+def search_line_items_batch(
+    tickers: List[str],
+    line_items: List[str],
+    period: str = 'ttm',
+    limit: int = 1,
+    chunk_size: int = 25,
+    end_date: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch line items for many tickers, `chunk_size` tickers per request.
+
+    Args:
+        tickers: Tickers to fetch
+        line_items: Line items to fetch for every ticker
+        period: Reporting period (e.g. 'ttm')
+        limit: Number of periods per ticker
+        chunk_size: Maximum number of tickers sent in one request
+        end_date: Only return reports with report_period <= end_date
+
+    Returns:
+        Dict mapping each ticker to its search results, most recent first.
+        Tickers without results map to an empty list.
+
+    Tickers the active dataset or the fundamentals cache can answer are not
+    requested, and the history fetched for the others is added to the cache,
+    so later per-ticker `search_line_items` calls need no request either.
+    """
+    results = {}
+    dataset = get_active_dataset()
+    if dataset is not None:
+        for ticker in tickers:
+            reports = dataset.line_items(ticker, line_items, period, limit, end_date)
+            if reports is not None:
+                results[ticker] = reports
+
+    key = _line_items_key(line_items, period)
+    as_of = end_date or date.today().strftime("%Y-%m-%d")
+    use_cache = cache_enabled()
+    if use_cache:
+        for ticker in tickers:
+            if ticker not in results:
+                reports = _fundamentals_cache.cached_reports(ticker, key, as_of, limit)
+                if reports is not None:
+                    results[ticker] = reports
+
+    missing = [ticker for ticker in tickers if ticker not in results]
+    fetched = {ticker: [] for ticker in missing}
+    # Fetch the history the cache keeps, so the results can be stored
+    history_limit = (
+        max(limit, _fundamentals_cache.history_limit) if use_cache else _history_limit(limit, end_date)
+    )
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i:i + chunk_size]
+        for item in _post_line_items(chunk, line_items, period, history_limit):
+            if item.get("ticker") in fetched:
+                fetched[item["ticker"]].append(item)
+
+    for ticker, items in fetched.items():
+        reports = None
+        if use_cache:
+            _fundamentals_cache.add_reports(ticker, key, as_of, items)
+            reports = _fundamentals_cache.cached_reports(ticker, key, as_of, limit)
+        results[ticker] = _as_of(items, end_date, limit) if reports is None else reports
+    return {ticker: results[ticker] for ticker in tickers}
+
+def _line_items_key(line_items: List[str], period: str) -> str:
+    return f"line_items:{period}:{','.join(sorted(line_items))}"
+
+def _history_limit(limit: int, end_date: Optional[str]) -> int:
+    # The line-items endpoint has no date filter, so point-in-time queries
+    # fetch enough history to filter client-side
+    return limit if end_date is None else max(limit, _fundamentals_cache.history_limit)
+
+def _as_of(
+    reports: List[Dict[str, Any]],
+    end_date: Optional[str],
+    limit: int
+) -> List[Dict[str, Any]]:
+    if end_date is not None:
+        reports = [r for r in reports if r.get("report_period", "") <= end_date]
+    return reports[:limit]
+
+def _post_line_items(
+    tickers: List[str],
+    line_items: List[str],
+    period: str,
+    limit: int
 ) -> List[Dict[str, Any]]:
-    """Fetch cash flow statements from the API."""
     headers = {}
     if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
         headers["X-API-KEY"] = api_key
 
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
+    url = f"{_base_url()}/financials/search/line-items"
 
     body = {
-        "tickers": [ticker],
+        "tickers": tickers,
         "line_items": line_items,
         "period": period,
         "limit": limit
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = get_client().post(url, headers=headers, json=body)
     if response.status_code != 200:
         raise Exception(
             f"Error fetching data: {response.status_code} - {response.text}"
         )
     data = response.json()
-    search_results = data.get("search_results")
-    if not search_results:
-        raise ValueError("No search results returned")
-    return search_results
+    return data.get("search_results") or []
 
+@single_flight
 def get_insider_trades(
     ticker: str,
     end_date: str,
@@ -71,42 +234,113 @@ def get_insider_trades(
 ) -> List[Dict[str, Any]]:
     """
     Fetch insider trades for a given ticker and date range.
+
+    Trades are served from the active dataset, or from the local insider-trade
+    store, which only downloads filings newer than those it already holds.
     """
+    dataset = get_active_dataset()
+    insider_trades = dataset.insider_trades(ticker, end_date, limit) if dataset else None
+    if insider_trades is None and cache_enabled():
+        insider_trades = _insider_trade_store.get_trades(
+            ticker,
+            end_date,
+            limit,
+            fetch=lambda gte, lte, n: _fetch_insider_trades(ticker, lte, n, start_date=gte),
+        )
+    elif insider_trades is None:
+        insider_trades = _fetch_insider_trades(ticker, end_date, limit)
+    if not insider_trades:
+        raise ValueError("No insider trades returned")
+    return insider_trades
+
+def _fetch_insider_trades(
+    ticker: str,
+    end_date: str,
+    limit: int,
+    start_date: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch insider trades filed in [start_date, end_date] from the API."""
     headers = {}
     if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
         headers["X-API-KEY"] = api_key
     
     url = (
-        f"https://api.financialdatasets.ai/insider-trades/"
+        f"{_base_url()}/insider-trades/"
         f"?ticker={ticker}"
         f"&filing_date_lte={end_date}"
         f"&limit={limit}"
     )
-    response = requests.get(url, headers=headers)
+    if start_date:
+        url += f"&filing_date_gte={start_date}"
+    response = get_client().get(url, headers=headers)
     if response.status_code != 200:
         raise Exception(
             f"Error fetching data: {response.status_code} - {response.text}"
         )
     data = response.json()
-    insider_trades = data.get("insider_trades")
-    if not insider_trades:
-        raise ValueError("No insider trades returned")
-    return insider_trades
+    return data.get("insider_trades") or []
 
+@single_flight
 def get_market_cap(
     ticker: str,
-) -> List[Dict[str, Any]]:
-    """Fetch market cap from the API."""
+    end_date: Optional[str] = None,
+) -> float:
+    """
+    Fetch the market cap of a ticker, as of `end_date` when given.
+
+    The current market cap comes from the company facts, cached for
+    FINANCIAL_DATASETS_FACTS_TTL seconds. For past dates it is derived as the
+    close on or before `end_date` times the shares outstanding reported by then,
+    so historical runs do not see today's valuation.
+
+    Raises:
+        ValueError: If the company facts have no market cap where one is needed
+    """
+    today = date.today().strftime("%Y-%m-%d")
+    if end_date is None or end_date >= today:
+        return _current_market_cap(ticker)
+
+    close = _last_close(ticker, end_date)
+    try:
+        shares = search_line_items(
+            ticker, ["outstanding_shares"], period="ttm", limit=1, end_date=end_date
+        )[0].get("outstanding_shares")
+    except ValueError:
+        shares = None
+    if not shares:
+        # Without reported shares, assume the share count has not changed since
+        shares = _current_market_cap(ticker) / _last_close(ticker, today)
+    return close * shares
+
+def _current_market_cap(ticker: str) -> float:
+    market_cap = _get_company_facts(ticker).get('market_cap')
+    if market_cap is None:
+        raise ValueError("No market cap returned")
+    return market_cap
+
+def _last_close(ticker: str, end_date: str) -> float:
+    start_date = (pd.Timestamp(end_date) - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+    return get_prices(ticker, start_date, end_date)[-1]["close"]
+
+def _get_company_facts(ticker: str) -> Dict[str, Any]:
+    if cache_enabled():
+        return _company_facts_cache.get_facts(ticker, fetch=lambda: _fetch_company_facts(ticker))
+    return _fetch_company_facts(ticker)
+
+def _fetch_company_facts(
+    ticker: str,
+) -> Dict[str, Any]:
+    """Fetch company facts from the API."""
     headers = {}
     if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
         headers["X-API-KEY"] = api_key
 
     url = (
-        f'https://api.financialdatasets.ai/company/facts'
+        f'{_base_url()}/company/facts'
         f'?ticker={ticker}'
     )
 
-    response = requests.get(url, headers=headers)
+    response = get_client().get(url, headers=headers)
     if response.status_code != 200:
         raise Exception(
             f"Error fetching data: {response.status_code} - {response.text}"
@@ -115,53 +349,135 @@ def get_market_cap(
     company_facts = data.get('company_facts')
     if not company_facts:
         raise ValueError("No company facts returned")
-    return company_facts.get('market_cap')
+    return company_facts
 
+@single_flight
 def get_prices(
     ticker: str,
     start_date: str,
     end_date: str
 ) -> List[Dict[str, Any]]:
-    """Fetch price data from the API."""
+    """Fetch price data, serving the active dataset or already downloaded date ranges from the local cache."""
+    dataset = get_active_dataset()
+    prices = dataset.prices(ticker, start_date, end_date) if dataset else None
+    if prices is None and cache_enabled():
+        prices = _price_cache.get_prices(ticker, start_date, end_date, fetch=_fetch_prices)
+    elif prices is None:
+        prices = _fetch_prices(ticker, start_date, end_date)
+    if not prices:
+        raise ValueError("No price data returned")
+    return prices
+
+def _fetch_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str
+) -> List[Dict[str, Any]]:
+    """Fetch price data from the API. Returns an empty list for ranges without bars."""
+    response = _request_prices(ticker, start_date, end_date)
+    data = response.json()
+    return data.get("prices") or []
+
+def _stream_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    dtype: Union[str, np.dtype] = np.float64,
+) -> pd.DataFrame:
+    """Parse the prices array of the response incrementally into column buffers."""
+    # Closing the response returns its connection to the pool even if parsing fails
+    with _request_prices(ticker, start_date, end_date, stream=True) as response:
+        buffer = PriceColumnBuffer.for_content_length(
+            response.headers.get("Content-Length"), dtype=dtype
+        )
+        for bar in iter_json_array(response.iter_content(chunk_size=1 << 16), "prices"):
+            buffer.append(bar)
+    if not buffer.size:
+        raise ValueError("No price data returned")
+    return buffer.to_df()
+
+def _request_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    stream: bool = False
+):
     headers = {}
     if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
         headers["X-API-KEY"] = api_key
         
     url = (
-        f"https://api.financialdatasets.ai/prices/"
+        f"{_base_url()}/prices/"
         f"?ticker={ticker}"
         f"&interval=day"
         f"&interval_multiplier=1"
         f"&start_date={start_date}"
         f"&end_date={end_date}"
     )
-    response = requests.get(url, headers=headers)
+    response = get_client().get(url, headers=headers, stream=stream)
     if response.status_code != 200:
         raise Exception(
             f"Error fetching data: {response.status_code} - {response.text}"
         )
-    data = response.json()
-    prices = data.get("prices")
-    if not prices:
-        raise ValueError("No price data returned")
-    return prices
+    return response
+
+def prices_to_df(
+    prices: List[Dict[str, Any]],
+    dtype: Union[str, np.dtype] = np.float64,
+) -> pd.DataFrame:
+    """
+    Convert prices to a DataFrame.
+
+    Columns are built as typed arrays straight from the payload, timestamps are
+    parsed as ISO 8601 and the sort is skipped when bars already arrive in order.
+
+    Args:
+        prices: Price bars as returned by get_prices
+        dtype: Storage type for the open/close/high/low columns, e.g. np.float32
+            to halve memory on long histories
+
+    Returns:
+        DataFrame indexed by Date with time, open, close, high, low and volume columns
+    """
+    times = [p["time"] for p in prices]
+    columns = {"time": np.array(times, dtype=object)}
+    for col in ["open", "close", "high", "low"]:
+        columns[col] = _column(prices, col, dtype)
+    volume = _column(prices, "volume", np.float64)
+    columns["volume"] = (
+        volume.astype(np.int64) if np.isfinite(volume).all() and (volume % 1 == 0).all() else volume
+    )
 
-def prices_to_df(prices: List[Dict[str, Any]]) -> pd.DataFrame:
-    """Convert prices to a DataFrame."""
-    df = pd.DataFrame(prices)
-    df["Date"] = pd.to_datetime(df["time"])
-    df.set_index("Date", inplace=True)
-    numeric_cols = ["open", "close", "high", "low", "volume"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df.sort_index(inplace=True)
+    index = parse_times(times)
+    df = pd.DataFrame(columns, index=index, copy=False)
+    if not index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
     return df
 
+def _column(prices: List[Dict[str, Any]], key: str, dtype) -> np.ndarray:
+    values = [p.get(key) for p in prices]
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # Missing or non-numeric values become NaN, as with pd.to_numeric(errors="coerce")
+        return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=dtype)
+
 # Update the get_price_data function to use the new functions
 def get_price_data(
     ticker: str,
     start_date: str,
-    end_date: str
+    end_date: str,
+    stream: bool = False,
 ) -> pd.DataFrame:
+    """
+    Fetch prices as a DataFrame.
+
+    With `stream=True` the response is parsed incrementally into typed columns
+    instead of being loaded whole, which keeps memory close to the size of the
+    final frame on multi-year pulls. Streamed frames bypass the price cache and
+    have no `time` column.
+    """
+    if stream:
+        return _stream_prices(ticker, start_date, end_date)
     prices = get_prices(ticker, start_date, end_date)
     return prices_to_df(prices)
@@ -0,0 +1,126 @@
+"""
+Async counterparts of the tools.api fetchers.
+
+Requests run on a bounded worker pool on top of the shared pooled session from
+tools.client, so they reuse its keep-alive connections, retries, rate limiting,
+price cache and the active request scope. The pool size is the concurrency cap.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from tools import api
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("FINANCIAL_DATASETS_CONCURRENCY", 16)),
+                thread_name_prefix="financial-datasets",
+            )
+        return _executor
+
+
+async def _run(func: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context so the request scope is shared with the worker
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(ctx.run, func, *args, **kwargs)
+    )
+
+
+async def get_financial_metrics(
+    ticker: str,
+    report_period: str,
+    period: str = 'ttm',
+    limit: int = 1
+) -> List[Dict[str, Any]]:
+    return await _run(api.get_financial_metrics, ticker, report_period, period, limit)
+
+
+async def search_line_items(
+    ticker: str,
+    line_items: List[str],
+    period: str = 'ttm',
+    limit: int = 1,
+    end_date: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    return await _run(api.search_line_items, ticker, line_items, period, limit, end_date)
+
+
+async def get_insider_trades(
+    ticker: str,
+    end_date: str,
+    limit: int = 5,
+) -> List[Dict[str, Any]]:
+    return await _run(api.get_insider_trades, ticker, end_date, limit)
+
+
+async def get_market_cap(
+    ticker: str,
+    end_date: Optional[str] = None,
+) -> float:
+    return await _run(api.get_market_cap, ticker, end_date)
+
+
+async def get_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str
+) -> List[Dict[str, Any]]:
+    return await _run(api.get_prices, ticker, start_date, end_date)
+
+
+async def fetch_prices(
+    ticker: str,
+    start_date: str,
+    end_date: str
+) -> List[Dict[str, Any]]:
+    """Fetch prices from the API, bypassing the price cache (e.g. for bulk imports)."""
+    return await _run(api._fetch_prices, ticker, start_date, end_date)
+
+
+async def get_price_data(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    stream: bool = False,
+) -> pd.DataFrame:
+    return await _run(api.get_price_data, ticker, start_date, end_date, stream)
+
+
+async def gather_by_ticker(
+    func: Callable,
+    tickers: List[str],
+    *args,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Run one of the async fetchers for every ticker concurrently.
+
+    Args:
+        func: Async fetcher taking the ticker as its first argument
+        tickers: Tickers to fetch
+        *args, **kwargs: Remaining arguments passed to every call
+
+    Returns:
+        Dict mapping each ticker to its result, or to the exception it raised
+    """
+    results = await asyncio.gather(
+        *(func(ticker, *args, **kwargs) for ticker in tickers),
+        return_exceptions=True,
+    )
+    return dict(zip(tickers, results))
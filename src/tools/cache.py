@@ -0,0 +1,474 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the root directory used for on-disk data caches.
+
+    Data from a non-default FINANCIAL_DATASETS_BASE_URL (such as the local mock
+    server) is kept in a subdirectory named after its host, so it never mixes
+    with real API data.
+    """
+    root = Path(
+        os.environ.get("FINANCIAL_DATASETS_CACHE_DIR")
+        or Path.home() / ".cache" / "ai-hedge-fund"
+    )
+    base_url = os.environ.get("FINANCIAL_DATASETS_BASE_URL")
+    if base_url and urlsplit(base_url).netloc != "api.financialdatasets.ai":
+        root = root / urlsplit(base_url).netloc.replace(":", "_")
+    return root
+
+
+def cache_enabled() -> bool:
+    """Caching can be switched off with FINANCIAL_DATASETS_CACHE=0."""
+    return os.environ.get("FINANCIAL_DATASETS_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def _to_date(value: str) -> date:
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def _to_str(value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    """Write JSON atomically so an interrupted run never leaves a torn file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def merge_ranges(ranges: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Merge overlapping or adjacent inclusive date ranges."""
+    merged: List[List[date]] = []
+    for start, end in sorted((_to_date(s), _to_date(e)) for s, e in ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(_to_str(s), _to_str(e)) for s, e in merged]
+
+
+def missing_ranges(
+    covered: List[Tuple[str, str]],
+    start_date: str,
+    end_date: str,
+    coalesce_days: int = 0,
+) -> List[Tuple[str, str]]:
+    """
+    Return the parts of [start_date, end_date] not in `covered`.
+
+    Gaps separated by no more than `coalesce_days` of already covered dates
+    are fused into a single range, trading a little re-download for fewer requests.
+    """
+    start, end = _to_date(start_date), _to_date(end_date)
+    gaps: List[List[date]] = []
+    cursor = start
+    for s, e in merge_ranges(covered):
+        s, e = _to_date(s), _to_date(e)
+        if e < cursor:
+            continue
+        if s > end:
+            break
+        if s > cursor:
+            gaps.append([cursor, s - timedelta(days=1)])
+        cursor = max(cursor, e + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append([cursor, end])
+
+    coalesced: List[List[date]] = []
+    for gap in gaps:
+        if coalesced and (gap[0] - coalesced[-1][1]).days - 1 <= coalesce_days:
+            coalesced[-1][1] = gap[1]
+        else:
+            coalesced.append(gap)
+    return [(_to_str(s), _to_str(e)) for s, e in coalesced]
+
+
+class _TickerStore:
+    """Base for caches that keep one JSON file per ticker, loaded lazily and guarded per ticker."""
+
+    def __init__(self, root: Optional[Path], subdir: str):
+        self._root = Path(root) if root else None
+        self._subdir = subdir
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        # Resolved on use so settings loaded from .env after import still apply
+        return self._root or get_cache_dir() / self._subdir
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.json"
+
+    def _new_entry(self) -> Dict[str, Any]:
+        return {}
+
+    def _load(self, ticker: str) -> Dict[str, Any]:
+        if ticker not in self._entries:
+            self._entries[ticker] = _read_json(self._path(ticker)) or self._new_entry()
+        return self._entries[ticker]
+
+    def _save(self, ticker: str) -> None:
+        _write_json(self._path(ticker), self._entries[ticker])
+
+
+class PriceCache(_TickerStore):
+    """
+    On-disk store of daily price bars, one JSON file per ticker.
+
+    Each file remembers the date ranges it has already fetched, so a request
+    only downloads the gaps and any sub-range of known history is served locally.
+    """
+
+    def __init__(self, root: Optional[Path] = None, coalesce_days: int = 7):
+        super().__init__(root, "prices")
+        self.coalesce_days = coalesce_days
+        # ticker -> day of each cached bar, kept in memory alongside the loaded entry
+        self._days: Dict[str, List[str]] = {}
+
+    def _new_entry(self) -> Dict[str, Any]:
+        return {"ranges": [], "prices": []}
+
+    def get_prices(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        fetch: Callable[[str, str, str], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached bars for [start_date, end_date], fetching missing gaps first.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Inclusive start date (YYYY-MM-DD)
+            end_date: Inclusive end date (YYYY-MM-DD)
+            fetch: Callable(ticker, start_date, end_date) hitting the API
+
+        Returns:
+            List of price bars sorted by time
+        """
+        with self._lock(ticker):
+            entry = self._load(ticker)
+            gaps = missing_ranges(
+                entry["ranges"], start_date, end_date, self.coalesce_days
+            )
+            if gaps:
+                self._fill(ticker, entry, gaps, fetch)
+
+            days = self._days.get(ticker)
+            if days is None:
+                days = self._days[ticker] = [p["time"][:10] for p in entry["prices"]]
+            lo = bisect_left(days, start_date)
+            hi = bisect_right(days, end_date)
+            return entry["prices"][lo:hi]
+
+    def _fill(self, ticker, entry, gaps, fetch) -> None:
+        # Today's bar may still change, so it is never marked as covered
+        last_final_day = _to_str(date.today() - timedelta(days=1))
+
+        by_time = {p["time"]: p for p in entry["prices"]}
+        ranges = list(entry["ranges"])
+        for start, end in gaps:
+            for price in fetch(ticker, start, end):
+                by_time[price["time"]] = price
+            final_end = min(end, last_final_day)
+            if start <= final_end:
+                ranges.append((start, final_end))
+
+        entry["prices"] = [by_time[t] for t in sorted(by_time)]
+        entry["ranges"] = merge_ranges(ranges)
+        self._days[ticker] = [p["time"][:10] for p in entry["prices"]]
+        self._save(ticker)
+
+
+def _stale(fetched_on: str, as_of: str) -> bool:
+    """Whether data fetched on `fetched_on` may miss filings visible as of `as_of`."""
+    return as_of >= fetched_on and fetched_on < _to_str(date.today())
+
+
+class FundamentalsCache(_TickerStore):
+    """
+    Point-in-time store of reported periods, one JSON file per ticker.
+
+    A ticker's report history is downloaded once per dataset (e.g. TTM financial
+    metrics or a set of line items) and kept sorted by report_period, so "the
+    latest `limit` reports with report_period <= date" is a binary search.
+
+    Each fetch is bounded by the date asked about, so the requests made depend
+    only on the queries and not on the day they run. History is refetched when
+    asked about a date after the last fetch, or, once a day, about dates on or
+    after the day of the last fetch, when newly filed reports may have appeared.
+    """
+
+    def __init__(self, root: Optional[Path] = None, history_limit: int = 40):
+        super().__init__(root, "fundamentals")
+        self.history_limit = history_limit
+
+    def get_reports(
+        self,
+        ticker: str,
+        dataset: str,
+        as_of: str,
+        limit: int,
+        fetch: Callable[[str, int], List[Dict[str, Any]]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return up to `limit` reports with report_period <= as_of, most recent first.
+
+        Args:
+            ticker: Stock ticker symbol
+            dataset: Name of the report series, part of the cache key
+            as_of: Point-in-time date (YYYY-MM-DD)
+            limit: Number of reports wanted
+            fetch: Callable(report_period_lte, limit) returning reports from the API
+
+        Returns:
+            The reports, or None if the cached history cannot answer the query
+            (in which case the caller should ask the API directly)
+        """
+        with self._lock(ticker):
+            entry = self._load(ticker)
+            series = entry.get(dataset)
+            if not self._fresh(series, as_of):
+                series = self._store(ticker, entry, dataset, as_of, fetch(as_of, self.history_limit))
+                if series is None:
+                    return None
+            return self._slice(series, as_of, limit)
+
+    def cached_reports(
+        self, ticker: str, dataset: str, as_of: str, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Like `get_reports`, but only answered from the stored history.
+
+        Returns:
+            The reports, or None if the history is missing, out of date or too
+            short to answer the query without a fetch
+        """
+        with self._lock(ticker):
+            series = self._load(ticker).get(dataset)
+            if not self._fresh(series, as_of):
+                return None
+            return self._slice(series, as_of, limit)
+
+    def add_reports(
+        self, ticker: str, dataset: str, as_of: str, reports: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store reports fetched elsewhere (e.g. in a batched request) as of `as_of`.
+
+        `reports` must be the latest `history_limit` reports with
+        report_period <= as_of, as a `get_reports` fetch would return.
+        """
+        with self._lock(ticker):
+            self._store(ticker, self._load(ticker), dataset, as_of, reports)
+
+    def _fresh(self, series, as_of) -> bool:
+        return (
+            series is not None
+            and as_of <= series["fetched_through"]
+            and not _stale(series.get("fetched_on", series["fetched_through"]), as_of)
+        )
+
+    def _slice(self, series, as_of, limit):
+        periods = [r["report_period"] for r in series["reports"]]
+        hi = bisect_right(periods, as_of)
+        if hi < limit and not series["complete"]:
+            return None
+        return series["reports"][max(0, hi - limit):hi][::-1]
+
+    def _store(self, ticker, entry, dataset, as_of, reports):
+        if any("report_period" not in r for r in reports):
+            return None
+
+        previous = entry.get(dataset) or {"reports": [], "complete": False}
+        by_period = {r["report_period"]: r for r in previous["reports"]}
+        by_period.update((r["report_period"], r) for r in reports)
+        series = {
+            "fetched_through": as_of,
+            "fetched_on": _to_str(date.today()),
+            # Fewer reports than asked for means the full history is held
+            "complete": previous["complete"] or len(reports) < self.history_limit,
+            "reports": [by_period[p] for p in sorted(by_period)],
+        }
+        entry[dataset] = series
+        self._save(ticker)
+        return series
+
+
+class InsiderTradeStore(_TickerStore):
+    """
+    Incremental store of insider trades, one JSON file per ticker.
+
+    Trades are kept sorted by filing_date together with a high-water mark of
+    the filing dates already downloaded. Later dates only fetch the filings
+    after the mark, older history is paged in only when a query reaches past
+    it, and "last N trades as of a date" is a binary search.
+
+    Fetches are bounded by the date asked about, never by today, so replayed
+    runs make the same requests on any day. Filings made since the day of the
+    last fetch are fetched again, once a day, for queries reaching that day.
+    """
+
+    def __init__(self, root: Optional[Path] = None, history_limit: int = 1000):
+        super().__init__(root, "insider_trades")
+        self.history_limit = history_limit
+
+    def get_trades(
+        self,
+        ticker: str,
+        end_date: str,
+        limit: int,
+        fetch: Callable[[Optional[str], str, int], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the `limit` most recent trades filed on or before end_date, newest first.
+
+        Args:
+            ticker: Stock ticker symbol
+            end_date: Point-in-time date (YYYY-MM-DD)
+            limit: Number of trades wanted
+            fetch: Callable(filing_date_gte, filing_date_lte, limit) hitting the API
+
+        Returns:
+            The trades, fewer than `limit` only if the ticker has no older filings
+        """
+        with self._lock(ticker):
+            entry = self._load(ticker)
+            if not entry:
+                self._backfill(ticker, entry, end_date, fetch)
+            elif end_date > entry["high_water"] or _stale(
+                entry.get("fetched_on", entry["high_water"]), end_date
+            ):
+                self._catch_up(ticker, entry, end_date, fetch)
+
+            hi = bisect_right(entry["filing_dates"], end_date)
+            while hi < limit and not entry["complete"]:
+                self._extend_back(ticker, entry, end_date, fetch)
+                hi = bisect_right(entry["filing_dates"], end_date)
+            return entry["trades"][max(0, hi - limit):hi][::-1]
+
+    def _backfill(self, ticker, entry, end_date, fetch) -> None:
+        trades = fetch(None, end_date, self.history_limit)
+        entry["complete"] = len(trades) < self.history_limit
+        entry["fetched_on"] = _to_str(date.today())
+        self._merge(ticker, entry, [(None, end_date, trades)], end_date)
+
+    def _extend_back(self, ticker, entry, end_date, fetch) -> None:
+        # Page backwards from the oldest stored filing so the history stays contiguous
+        oldest = entry["filing_dates"][0] if entry["filing_dates"] else end_date
+        trades = fetch(None, oldest, self.history_limit)
+        pages = [(None, oldest, trades)]
+        if self._single_day(trades, oldest):
+            # The oldest day alone fills a page; step past it so paging can go on
+            oldest = _to_str(_to_date(oldest) - timedelta(days=1))
+            trades = fetch(None, oldest, self.history_limit)
+            pages.append((None, oldest, trades))
+        known = len(entry["trades"])
+        self._merge(ticker, entry, pages, entry["high_water"])
+        # A short page, or one adding nothing new, means the history is exhausted
+        if len(trades) < self.history_limit or len(entry["trades"]) == known:
+            entry["complete"] = True
+            self._save(ticker)
+
+    def _catch_up(self, ticker, entry, end_date, fetch) -> None:
+        # Filings up to the mark, or up to the day of the last fetch, are already held
+        gte = min(entry["high_water"], entry.get("fetched_on", entry["high_water"]))
+        pages = []
+        lte = end_date
+        while True:
+            page = fetch(gte, lte, self.history_limit)
+            pages.append((gte, lte, page))
+            if len(page) < self.history_limit:
+                break
+            # Full page: keep paging backwards towards the high-water mark
+            oldest = min(t["filing_date"] for t in page)
+            if oldest <= gte:
+                break
+            if self._single_day(page, lte):
+                # The whole page is one day; step past it so paging can go on
+                oldest = _to_str(_to_date(lte) - timedelta(days=1))
+                if oldest < gte:
+                    break
+            lte = oldest
+        entry["fetched_on"] = _to_str(date.today())
+        self._merge(ticker, entry, pages, end_date)
+
+    def _single_day(self, page, day) -> bool:
+        return len(page) >= self.history_limit and all(t.get("filing_date") == day for t in page)
+
+    def _merge(self, ticker, entry, pages, high_water) -> None:
+        # Trades carry no id, and two identical records can be distinct trades, so each
+        # fetched page replaces everything stored in the filing-date window it covers.
+        # A full page may stop partway through its oldest day; that day is then only
+        # as complete as the page, until the next page back replaces it again.
+        trades = entry.get("trades", [])
+        for gte, lte, page in pages:
+            lo = gte or ""
+            if len(page) >= self.history_limit:
+                lo = min(t.get("filing_date") or "" for t in page)
+            trades = [
+                t for t in trades if not lo <= (t.get("filing_date") or "") <= lte
+            ] + page
+        ordered = sorted(trades, key=lambda t: t.get("filing_date") or "")
+        entry["trades"] = ordered
+        entry["filing_dates"] = [t.get("filing_date") or "" for t in ordered]
+        entry["high_water"] = high_water
+        entry.setdefault("complete", False)
+        self._save(ticker)
+
+
+class CompanyFactsCache(_TickerStore):
+    """On-disk company facts per ticker, refetched once older than `ttl` seconds."""
+
+    def __init__(self, root: Optional[Path] = None, ttl: Optional[float] = None):
+        super().__init__(root, "company_facts")
+        self._ttl = ttl
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        return float(os.environ.get("FINANCIAL_DATASETS_FACTS_TTL", 24 * 60 * 60))
+
+    def get_facts(
+        self,
+        ticker: str,
+        fetch: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        with self._lock(ticker):
+            entry = self._load(ticker)
+            if not entry or time.time() - entry["fetched_at"] > self.ttl:
+                entry["facts"] = fetch()
+                entry["fetched_at"] = time.time()
+                self._save(ticker)
+            return entry["facts"]
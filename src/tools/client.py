@@ -0,0 +1,179 @@
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tools.fixtures import FixtureStore, MissingFixtureError, request_signature
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# "live" talks to the API, "record" also stores every response as a fixture,
+# "replay" serves stored fixtures without touching the network
+CLIENT_MODES = ("live", "record", "replay")
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate across all threads.
+
+    Args:
+        rate: Tokens added per second; 0 disables limiting
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ApiClient:
+    """
+    Pooled HTTP client with retries and client-side rate limiting.
+
+    A single keep-alive session is shared by every caller, so repeated requests
+    reuse TCP/TLS connections. Throttled (429) and 5xx responses, as well as
+    connection errors and timeouts, are retried with jittered exponential backoff.
+
+    In "record" mode every final response is also written to a FixtureStore, and
+    in "replay" mode responses are served from it with no network access.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        rate_limit: float = 0.0,
+        burst: Optional[float] = None,
+        pool_size: int = 16,
+        timeout: float = 30.0,
+        mode: str = "live",
+        fixtures: Optional[FixtureStore] = None,
+    ):
+        if mode not in CLIENT_MODES:
+            raise ValueError(f"Unknown client mode {mode!r}, expected one of {CLIENT_MODES}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must not be negative, got {max_retries}")
+        self.mode = mode
+        self.fixtures = fixtures or FixtureStore()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        # Full jitter keeps concurrent clients from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.mode == "live":
+            return self._send(method, url, **kwargs)
+
+        signature = request_signature(
+            method, url, kwargs.get("params"), kwargs.get("json")
+        )
+        if self.mode == "replay":
+            fixture = self.fixtures.load(signature)
+            if fixture is None:
+                raise MissingFixtureError(f"No recorded response for {method} {url}")
+            return _build_response(url, *fixture)
+
+        response = self._send(method, url, **kwargs)
+        self.fixtures.save(signature, response.status_code, response.content)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt, None))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            time.sleep(self._backoff(attempt, response))
+            response.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+def _build_response(url: str, status_code: int, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+_client: Optional[ApiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ApiClient:
+    """Return the process-wide client, configured from the environment on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient(
+                max_retries=int(os.environ.get("FINANCIAL_DATASETS_MAX_RETRIES", 3)),
+                backoff_base=float(os.environ.get("FINANCIAL_DATASETS_BACKOFF", 0.5)),
+                rate_limit=float(os.environ.get("FINANCIAL_DATASETS_RATE_LIMIT", 0)),
+                pool_size=int(os.environ.get("FINANCIAL_DATASETS_POOL_SIZE", 16)),
+                timeout=float(os.environ.get("FINANCIAL_DATASETS_TIMEOUT", 30)),
+                mode=os.environ.get("FINANCIAL_DATASETS_MODE", "live"),
+                fixtures=FixtureStore(os.environ.get("FINANCIAL_DATASETS_FIXTURE_DIR")),
+            )
+        return _client
+
+
+def set_client(client: Optional[ApiClient]) -> None:
+    """Replace the process-wide client, e.g. to point tests at a stub server."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,219 @@
+import copy
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+
+class HistoricalDataset:
+    """
+    Every dataset a backtest reads, loaded once and answered from memory.
+
+    Queries are answered point in time: price bars up to the query's end
+    date, and reports or insider trades dated on or before it. A view made
+    with `view(as_of)` also caps every query at `as_of`, so agents cannot see
+    past the simulated day. Queries the loaded data cannot fully answer
+    return None and the API functions fall back to their usual path.
+    """
+
+    def __init__(self, as_of: Optional[str] = None):
+        self.as_of = as_of
+        # ticker -> (first day, last day, bar days, bars)
+        self._prices: Dict[str, tuple] = {}
+        # (ticker, period) -> (reports newest first, whether the full history is held)
+        self._financial_metrics: Dict[tuple, tuple] = {}
+        # (ticker, period) -> (line items held, reports newest first, full history held)
+        self._line_items: Dict[tuple, tuple] = {}
+        # ticker -> (trades newest first, whether the full history is held)
+        self._insider_trades: Dict[str, tuple] = {}
+
+    @classmethod
+    def load(
+        cls,
+        tickers: Sequence[str],
+        start_date: str,
+        end_date: str,
+        line_items: Sequence[str] = (),
+        period: str = "ttm",
+        insider_trade_limit: int = 1000,
+        price_warehouse=None,
+    ) -> "HistoricalDataset":
+        """
+        Fetch prices, financial metrics, line items and insider trades for a period.
+
+        Datasets a ticker has no data for are left out, so queries for them
+        reach the API as before.
+
+        Args:
+            tickers: Tickers to load
+            start_date: First day queries will be made for (YYYY-MM-DD)
+            end_date: Last day queries will be made for (YYYY-MM-DD)
+            line_items: Line items to load, covering every line item query
+            period: Reporting period of the financial metrics and line items
+            insider_trade_limit: Most recent insider trades to load per ticker
+            price_warehouse: Optional PriceWarehouse to read prices from instead
+                of the API, holding every ticker's bars for the whole period
+        """
+        # Imported here since the API functions consult the active dataset
+        from tools.api import (
+            get_financial_metrics,
+            get_insider_trades,
+            get_prices,
+            search_line_items,
+        )
+
+        # Reports filed over the period, plus those the first day looks back on
+        days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days
+        report_limit = days // 90 + 4
+
+        dataset = cls()
+        for ticker in tickers:
+            try:
+                if price_warehouse is not None:
+                    prices = price_warehouse.prices(ticker, start_date, end_date)
+                else:
+                    prices = get_prices(ticker, start_date, end_date)
+                dataset.add_prices(ticker, start_date, end_date, prices)
+            except ValueError:
+                pass
+            try:
+                metrics = get_financial_metrics(ticker, end_date, period, report_limit)
+                dataset.add_financial_metrics(
+                    ticker, period, metrics, complete=len(metrics) < report_limit
+                )
+            except ValueError:
+                pass
+            if line_items:
+                try:
+                    reports = search_line_items(
+                        ticker, list(line_items), period, report_limit, end_date=end_date
+                    )
+                    dataset.add_line_items(
+                        ticker, period, line_items, reports, complete=len(reports) < report_limit
+                    )
+                except ValueError:
+                    pass
+            try:
+                trades = get_insider_trades(ticker, end_date, insider_trade_limit)
+                dataset.add_insider_trades(
+                    ticker, trades, complete=len(trades) < insider_trade_limit
+                )
+            except ValueError:
+                pass
+        return dataset
+
+    def view(self, as_of: str) -> "HistoricalDataset":
+        """The same data with every query capped at `as_of`."""
+        view = copy.copy(self)
+        view.as_of = as_of
+        return view
+
+    def add_prices(
+        self, ticker: str, start_date: str, end_date: str, prices: List[Dict[str, Any]]
+    ) -> None:
+        bars = sorted(prices, key=lambda p: p["time"])
+        self._prices[ticker] = (start_date, end_date, [p["time"][:10] for p in bars], bars)
+
+    def add_financial_metrics(
+        self, ticker: str, period: str, reports: List[Dict[str, Any]], complete: bool
+    ) -> None:
+        self._financial_metrics[(ticker, period)] = (_newest_first(reports, "report_period"), complete)
+
+    def add_line_items(
+        self,
+        ticker: str,
+        period: str,
+        line_items: Sequence[str],
+        reports: List[Dict[str, Any]],
+        complete: bool,
+    ) -> None:
+        self._line_items[(ticker, period)] = (
+            frozenset(line_items),
+            _newest_first(reports, "report_period"),
+            complete,
+        )
+
+    def add_insider_trades(self, ticker: str, trades: List[Dict[str, Any]], complete: bool) -> None:
+        self._insider_trades[ticker] = (_newest_first(trades, "filing_date"), complete)
+
+    def prices(self, ticker: str, start_date: str, end_date: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._prices.get(ticker)
+        if entry is None:
+            return None
+        first_day, last_day, days, bars = entry
+        end_date = self._cap(end_date)
+        if start_date < first_day or end_date > last_day:
+            return None
+        return bars[bisect_left(days, start_date) : bisect_right(days, end_date)]
+
+    def financial_metrics(
+        self, ticker: str, report_period: str, period: str, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        entry = self._financial_metrics.get((ticker, period))
+        if entry is None:
+            return None
+        return _latest(*entry, "report_period", self._cap(report_period), limit)
+
+    def line_items(
+        self,
+        ticker: str,
+        line_items: Sequence[str],
+        period: str,
+        limit: int,
+        end_date: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        entry = self._line_items.get((ticker, period))
+        if entry is None or not set(line_items) <= entry[0]:
+            return None
+        return _latest(entry[1], entry[2], "report_period", self._cap(end_date), limit)
+
+    def insider_trades(self, ticker: str, end_date: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        entry = self._insider_trades.get(ticker)
+        if entry is None:
+            return None
+        return _latest(*entry, "filing_date", self._cap(end_date), limit)
+
+    def _cap(self, end_date: Optional[str]) -> Optional[str]:
+        if self.as_of is None:
+            return end_date
+        return self.as_of if end_date is None else min(end_date, self.as_of)
+
+
+def _newest_first(items: List[Dict[str, Any]], date_field: str) -> List[Dict[str, Any]]:
+    return sorted(items, key=lambda item: item.get(date_field) or "", reverse=True)
+
+
+def _latest(
+    items: List[Dict[str, Any]],
+    complete: bool,
+    date_field: str,
+    as_of: Optional[str],
+    limit: int,
+) -> Optional[List[Dict[str, Any]]]:
+    # The `limit` newest items dated on or before as_of, unless older ones were not loaded
+    if as_of is not None:
+        items = [item for item in items if (item.get(date_field) or "")[:10] <= as_of]
+    if len(items) < limit and not complete:
+        return None
+    return items[:limit]
+
+
+_active_dataset: ContextVar[Optional[HistoricalDataset]] = ContextVar(
+    "historical_dataset", default=None
+)
+
+
+def get_active_dataset() -> Optional[HistoricalDataset]:
+    return _active_dataset.get()
+
+
+@contextmanager
+def dataset_scope(dataset: HistoricalDataset) -> Iterator[HistoricalDataset]:
+    """Answer API calls made in this context from `dataset` where it can."""
+    token = _active_dataset.set(dataset)
+    try:
+        yield dataset
+    finally:
+        _active_dataset.reset(token)
@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from tools.cache import get_cache_dir
+
+
+class MissingFixtureError(Exception):
+    """Raised in replay mode when no response was recorded for a request."""
+
+
+def request_signature(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_body: Any = None,
+) -> str:
+    """
+    Hash a request into a stable signature.
+
+    Query parameters are sorted, and the host and headers are ignored, so the
+    signature depends neither on argument order, the API key nor the base URL.
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    query += sorted((k, str(v)) for k, v in (params or {}).items())
+    canonical = "\n".join(
+        [
+            method.upper(),
+            f"{parts.path.rstrip('/')}?{urlencode(sorted(query))}",
+            json.dumps(json_body, sort_keys=True, separators=(",", ":")),
+        ]
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class FixtureStore:
+    """
+    Recorded API responses, one gzipped file per request signature.
+
+    The signature is the file name, so a lookup is a single file open.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else get_cache_dir() / "fixtures"
+
+    def _path(self, signature: str) -> Path:
+        return self.root / signature[:2] / f"{signature}.json.gz"
+
+    def save(self, signature: str, status_code: int, content: bytes) -> None:
+        path = self._path(signature)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"status_code": status_code, "content": content.decode("utf-8")}
+        # Unique per call, so concurrent recordings from threads or processes never share a file
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            try:
+                with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+            except BaseException:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+        os.replace(tmp.name, path)
+
+    def load(self, signature: str) -> Optional[Tuple[int, bytes]]:
+        try:
+            with gzip.open(self._path(signature), "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        return payload["status_code"], payload["content"].encode("utf-8")
@@ -0,0 +1,435 @@
+"""
+Local stand-in for the financialdatasets.ai endpoints used by tools/api.py.
+
+Data is synthetic but deterministic: the same ticker and date always produce
+the same prices, metrics, line items and insider trades. Latency, server
+errors and 429 throttling can be injected to load-test the pipeline.
+
+Usage:
+    poetry run python src/tools/mock_server.py --port 8765 --latency-ms 50 --error-rate 0.01
+    FINANCIAL_DATASETS_BASE_URL=http://127.0.0.1:8765 poetry run python src/main.py --ticker AAPL
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# First day of synthetic history
+EPOCH = date(2000, 1, 3)
+
+INSIDER_NAMES = [
+    ("Alex Morgan", "Chief Executive Officer", False),
+    ("Sam Lee", "Chief Financial Officer", False),
+    ("Jordan Patel", "Director", True),
+    ("Casey Kim", "Director", True),
+    ("Riley Chen", "General Counsel", False),
+]
+
+
+def _parse_date(value: Optional[str], default: date) -> date:
+    return datetime.strptime(value[:10], "%Y-%m-%d").date() if value else default
+
+
+def _quarter_ends(until: date) -> List[date]:
+    """Quarter-end report periods from EPOCH up to `until`, oldest first."""
+    periods = []
+    year = EPOCH.year
+    while True:
+        for month, day in ((3, 31), (6, 30), (9, 30), (12, 31)):
+            period = date(year, month, day)
+            if period > until:
+                return periods
+            periods.append(period)
+        year += 1
+
+
+class SyntheticMarket:
+    """Deterministic synthetic data keyed by ticker and date."""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._paths: Dict[str, Dict[str, list]] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(":".join(str(k) for k in (self.seed,) + key))
+
+    def _path(self, ticker: str, until: date) -> Dict[str, list]:
+        """Daily bars for business days from EPOCH to `until`, extended on demand."""
+        with self._lock:
+            path = self._paths.get(ticker)
+            if path is None:
+                rng = self._rng("prices", ticker)
+                path = {
+                    "rng": rng,
+                    "dates": [],
+                    "bars": [],
+                    "close": 20 + rng.random() * 180,
+                    "next": EPOCH,
+                }
+                self._paths[ticker] = path
+            rng = path["rng"]
+            while path["next"] <= until:
+                day = path["next"]
+                path["next"] += timedelta(days=1)
+                if day.weekday() >= 5:
+                    continue
+                prev_close = path["close"]
+                close = prev_close * math.exp(rng.gauss(0.0003, 0.018))
+                open_ = prev_close * math.exp(rng.gauss(0, 0.004))
+                high = max(open_, close) * (1 + abs(rng.gauss(0, 0.006)))
+                low = min(open_, close) * (1 - abs(rng.gauss(0, 0.006)))
+                path["close"] = close
+                path["dates"].append(day)
+                path["bars"].append(
+                    {
+                        "time": f"{day.isoformat()}T00:00:00Z",
+                        "open": round(open_, 4),
+                        "close": round(close, 4),
+                        "high": round(high, 4),
+                        "low": round(low, 4),
+                        "volume": int(rng.lognormvariate(15.5, 0.4)),
+                    }
+                )
+            return path
+
+    def prices(self, ticker: str, start: date, end: date) -> List[Dict[str, Any]]:
+        path = self._path(ticker, end)
+        return [b for d, b in zip(path["dates"], path["bars"]) if start <= d <= end]
+
+    def last_close(self, ticker: str, as_of: date) -> float:
+        bars = self.prices(ticker, as_of - timedelta(days=7), as_of)
+        return bars[-1]["close"] if bars else self._path(ticker, EPOCH)["close"]
+
+    def shares_outstanding(self, ticker: str, period: date) -> float:
+        base = 2e8 + self._rng("shares", ticker).random() * 5e9
+        # Slow buybacks: roughly 1% fewer shares a year
+        return round(base * 0.99 ** ((period - EPOCH).days / 365))
+
+    def financial_metrics(self, ticker: str, period: date, period_type: str) -> Dict[str, Any]:
+        rng = self._rng("metrics", ticker, period, period_type)
+        return {
+            "ticker": ticker,
+            "report_period": period.isoformat(),
+            "period": period_type,
+            "return_on_equity": rng.uniform(-0.05, 0.45),
+            "net_margin": rng.uniform(-0.05, 0.35),
+            "operating_margin": rng.uniform(0.0, 0.4),
+            "revenue_growth": rng.uniform(-0.1, 0.3),
+            "earnings_growth": rng.uniform(-0.15, 0.35),
+            "book_value_growth": rng.uniform(-0.05, 0.2),
+            "current_ratio": rng.uniform(0.6, 3.0),
+            "debt_to_equity": rng.uniform(0.05, 2.0),
+            "free_cash_flow_per_share": rng.uniform(0.5, 12.0),
+            "earnings_per_share": rng.uniform(0.5, 12.0),
+            "price_to_earnings_ratio": rng.uniform(8, 45),
+            "price_to_book_ratio": rng.uniform(0.8, 12),
+            "price_to_sales_ratio": rng.uniform(0.5, 15),
+        }
+
+    def line_items(
+        self, ticker: str, period: date, period_type: str, items: List[str]
+    ) -> Dict[str, Any]:
+        result = {
+            "ticker": ticker,
+            "report_period": period.isoformat(),
+            "period": period_type,
+            "currency": "USD",
+        }
+        scale = 1e9 + self._rng("scale", ticker).random() * 2e10
+        for item in items:
+            rng = self._rng("line_item", ticker, period, period_type, item)
+            if item == "outstanding_shares":
+                result[item] = self.shares_outstanding(ticker, period)
+            elif item in ("working_capital", "capital_expenditure", "depreciation_and_amortization"):
+                result[item] = round(scale * rng.uniform(0.02, 0.2))
+            else:
+                result[item] = round(scale * rng.uniform(-0.05, 0.3))
+        return result
+
+    def insider_trades(self, ticker: str, day: date) -> List[Dict[str, Any]]:
+        """Trades filed on `day`; most business days have none."""
+        rng = self._rng("insider", ticker, day)
+        if day.weekday() >= 5 or rng.random() > 0.12:
+            return []
+        trades = []
+        for _ in range(1 + int(rng.random() < 0.3)):
+            name, title, is_director = rng.choice(INSIDER_NAMES)
+            shares = int(rng.lognormvariate(8, 1.2)) * (1 if rng.random() < 0.4 else -1)
+            price = round(self.last_close(ticker, day), 2)
+            owned_before = int(rng.lognormvariate(12, 1))
+            transaction_date = day - timedelta(days=rng.randint(0, 3))
+            trades.append(
+                {
+                    "ticker": ticker,
+                    "issuer": f"{ticker} Inc.",
+                    "name": name,
+                    "title": title,
+                    "is_board_director": is_director,
+                    "transaction_date": transaction_date.isoformat(),
+                    "transaction_shares": shares,
+                    "transaction_price_per_share": price,
+                    "transaction_value": round(abs(shares) * price, 2),
+                    "shares_owned_before_transaction": owned_before,
+                    "shares_owned_after_transaction": max(0, owned_before + shares),
+                    "security_title": "Common Stock",
+                    "filing_date": day.isoformat(),
+                }
+            )
+        return trades
+
+    def company_facts(self, ticker: str) -> Dict[str, Any]:
+        today = date.today()
+        return {
+            "ticker": ticker,
+            "name": f"{ticker} Inc.",
+            "cik": str(self._rng("cik", ticker).randint(100000, 9999999)),
+            "market_cap": round(
+                self.last_close(ticker, today) * self.shares_outstanding(ticker, today), 2
+            ),
+            "number_of_employees": self._rng("employees", ticker).randint(500, 200000),
+            "weighted_average_shares": self.shares_outstanding(ticker, today),
+        }
+
+
+class FaultInjector:
+    """Decides per request whether to delay, fail or throttle it."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_rps: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max(max_rps, 1.0)
+        self._updated = time.monotonic()
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def outcome(self) -> Optional[int]:
+        """Return an error status to send instead of data, or None."""
+        with self._lock:
+            if self.max_rps > 0:
+                now = time.monotonic()
+                self._tokens = min(
+                    max(self.max_rps, 1.0), self._tokens + (now - self._updated) * self.max_rps
+                )
+                self._updated = now
+                if self._tokens < 1:
+                    return 429
+                self._tokens -= 1
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+class MockFinancialDatasetsServer:
+    """
+    Threaded HTTP server serving synthetic financialdatasets responses.
+
+    Can be used as a context manager, serving from a background thread:
+
+        with MockFinancialDatasetsServer(latency_ms=20) as server:
+            os.environ["FINANCIAL_DATASETS_BASE_URL"] = server.base_url
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+        **faults,
+    ):
+        self.market = SyntheticMarket(seed)
+        self.faults = FaultInjector(seed=seed, **faults)
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockFinancialDatasetsServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def route(self, method: str, path: str, query: Dict[str, str], body: Any):
+        """Return (status, payload) for a request."""
+        market = self.market
+        ticker = query.get("ticker", "").upper()
+        today = date.today()
+
+        if method == "GET" and path == "/_stats":
+            with self._stats_lock:
+                return 200, dict(self.stats)
+
+        if method == "GET" and path == "/prices":
+            start = _parse_date(query.get("start_date"), EPOCH)
+            end = min(_parse_date(query.get("end_date"), today), today)
+            return 200, {"ticker": ticker, "prices": market.prices(ticker, start, end)}
+
+        if method == "GET" and path == "/financial-metrics":
+            lte = _parse_date(query.get("report_period_lte"), today)
+            limit = int(query.get("limit", 1))
+            period_type = query.get("period", "ttm")
+            periods = _quarter_ends(lte)[::-1][:limit]
+            return 200, {
+                "financial_metrics": [
+                    market.financial_metrics(ticker, p, period_type) for p in periods
+                ]
+            }
+
+        if method == "POST" and path == "/financials/search/line-items":
+            body = body or {}
+            limit = int(body.get("limit", 1))
+            periods = _quarter_ends(today)[::-1][:limit]
+            return 200, {
+                "search_results": [
+                    market.line_items(t.upper(), p, body.get("period", "ttm"), body.get("line_items", []))
+                    for t in body.get("tickers", [])
+                    for p in periods
+                ]
+            }
+
+        if method == "GET" and path == "/insider-trades":
+            lte = min(_parse_date(query.get("filing_date_lte"), today), today)
+            gte = _parse_date(query.get("filing_date_gte"), EPOCH)
+            limit = int(query.get("limit", 100))
+            trades: List[Dict[str, Any]] = []
+            day = lte
+            while day >= gte and len(trades) < limit:
+                trades.extend(market.insider_trades(ticker, day))
+                day -= timedelta(days=1)
+            return 200, {"insider_trades": trades[:limit]}
+
+        if method == "GET" and path == "/company/facts":
+            return 200, {"company_facts": market.company_facts(ticker)}
+
+        return 404, {"error": f"Unknown endpoint {method} {path}"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method: str) -> None:
+                parts = urlsplit(self.path)
+                path = parts.path.rstrip("/") or "/"
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+
+                time.sleep(server.faults.delay())
+                error = None if path == "/_stats" else server.faults.outcome()
+                if error is not None:
+                    server._count(f"{path} {error}")
+                    status = error
+                    payload = {"error": "Too Many Requests" if error == 429 else "Internal Server Error"}
+                else:
+                    try:
+                        body = json.loads(raw_body) if raw_body else None
+                        status, payload = server.route(method, path, query, body)
+                    except (ValueError, TypeError) as e:
+                        status, payload = 400, {"error": str(e)}
+                    server._count(f"{path} {status}")
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a local mock of the financialdatasets.ai API"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic data and faults")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Requests per second before answering 429")
+
+    args = parser.parse_args()
+
+    server = MockFinancialDatasetsServer(
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+    )
+    print(f"Mock financialdatasets API listening on {server.base_url}")
+    print(f"Use it with: FINANCIAL_DATASETS_BASE_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,106 @@
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+
+class RequestScope:
+    """
+    Coalesces identical API calls made while the scope is active.
+
+    The first caller for a given key performs the request; concurrent callers
+    wait on its result and later callers reuse it, so each distinct request
+    reaches the API once. Failed requests are not remembered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._futures.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_active_scope: ContextVar[Optional[RequestScope]] = ContextVar(
+    "request_scope", default=None
+)
+
+
+def get_request_scope() -> Optional[RequestScope]:
+    return _active_scope.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestScope]:
+    """
+    Open a request scope, or join the one already active in this context.
+
+    Threads started through langgraph copy the current context, so concurrent
+    graph branches share the scope of the run that spawned them.
+    """
+    scope = _active_scope.get()
+    if scope is not None:
+        yield scope
+        return
+
+    scope = RequestScope()
+    token = _active_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _active_scope.reset(token)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def single_flight(func: Callable) -> Callable:
+    """Route calls to `func` through the active request scope, if any."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        scope = _active_scope.get()
+        if scope is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__, _freeze(bound.arguments))
+        return scope.call(key, lambda: func(*args, **kwargs))
+
+    return wrapper
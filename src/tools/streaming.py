@@ -0,0 +1,159 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+# Rough size of one serialized price bar, used to presize buffers from Content-Length
+_BYTES_PER_BAR = 110
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the elements of the `key` array of a JSON document, one at a time.
+
+    Only the current element and the undecoded tail of the last chunk are held
+    in memory, so arbitrarily long arrays can be consumed from a response stream.
+
+    Args:
+        chunks: Raw bytes of the document, e.g. response.iter_content()
+        key: Name of the array to read, e.g. "prices"
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buf, pos, in_array = "", 0, False
+
+    for chunk in chunks:
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        if not in_array:
+            match = start.search(buf)
+            if match is None:
+                # Keep enough of the tail for a key split across two chunks
+                buf = buf[-(len(key) + 64):]
+                continue
+            pos, in_array = match.end(), True
+
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                break
+            yield item
+
+    if in_array:
+        raise ValueError(f"Truncated JSON: {key!r} array was not closed")
+
+
+def zone_suffix_utc(suffixes: Set[str]) -> Optional[bool]:
+    """
+    Classify the text following fixed-width "YYYY-MM-DD[ HH:MM:SS]" timestamps.
+
+    Returns True for UTC markers ("Z", " UTC", " GMT"), False for no suffix or
+    zone abbreviations that pandas drops (" EST", " EDT"), and None when the
+    timestamps need a general ISO 8601 parser.
+    """
+    if suffixes and suffixes <= {"Z", " UTC", " GMT"}:
+        return True
+    if all(s == "" or (s[:1] == " " and s[1:].isalpha()) for s in suffixes):
+        return False
+    return None
+
+
+def parse_times(times: List[str]) -> pd.DatetimeIndex:
+    """Parse bar timestamps into the Date index used by prices_to_df."""
+    # Timestamps share a fixed-width "YYYY-MM-DD[ HH:MM:SS]" prefix, so NumPy can
+    # parse them directly, several times faster than pandas' per-element parser
+    if times:
+        width = 10 if len(times[0]) == 10 else 19
+        utc = zone_suffix_utc({t[width:] for t in times})
+        if utc is not None:
+            try:
+                stamps = np.array(times, dtype=f"U{width}").astype("datetime64[ns]")
+            except ValueError:
+                pass
+            else:
+                index = pd.DatetimeIndex(stamps, name="Date")
+                return index.tz_localize("UTC") if utc else index
+    return pd.DatetimeIndex(pd.to_datetime(times, format="ISO8601"), name="Date")
+
+
+class PriceColumnBuffer:
+    """
+    Growable typed column buffers for price bars.
+
+    Bars are appended straight into NumPy arrays, so no list of dicts is ever
+    built. Open/close/high/low share one row-major matrix that becomes the
+    DataFrame block without a copy; buffers grow by doubling and are trimmed
+    in place when finished, keeping peak memory close to the final arrays.
+    """
+
+    PRICE_COLUMNS = ["open", "close", "high", "low"]
+
+    def __init__(self, capacity: int = 1024, dtype=np.float64):
+        self.size = 0
+        self.times = np.empty(capacity, dtype="S40")
+        self.prices = np.empty((capacity, len(self.PRICE_COLUMNS)), dtype=dtype)
+        self.volume = np.empty(capacity, dtype=np.float64)
+        self._width = None
+        self._suffixes: Set[str] = set()
+
+    @classmethod
+    def for_content_length(cls, content_length: Optional[str], dtype=np.float64):
+        capacity = int(content_length) // _BYTES_PER_BAR + 1 if content_length else 1024
+        return cls(capacity=capacity, dtype=dtype)
+
+    def append(self, bar: Dict[str, Any]) -> None:
+        if self.size == len(self.times):
+            self._resize(2 * self.size or 1)
+        i = self.size
+        time = bar["time"]
+        if self._width is None:
+            self._width = 10 if len(time) == 10 else 19
+        self._suffixes.add(time[self._width:])
+        self.times[i] = time.encode()
+        row = self.prices[i]
+        for j, col in enumerate(self.PRICE_COLUMNS):
+            value = bar.get(col)
+            row[j] = np.nan if value is None else value
+        volume = bar.get("volume")
+        self.volume[i] = np.nan if volume is None else volume
+        self.size += 1
+
+    def _resize(self, capacity: int) -> None:
+        # Resizing along the first axis keeps existing rows in place
+        self.times.resize(capacity, refcheck=False)
+        self.prices.resize((capacity, len(self.PRICE_COLUMNS)), refcheck=False)
+        self.volume.resize(capacity, refcheck=False)
+
+    def to_df(self) -> pd.DataFrame:
+        """Return the bars as a DataFrame indexed by Date, like prices_to_df without `time`."""
+        self._resize(self.size)
+        utc = zone_suffix_utc(self._suffixes) if self.size else False
+        if utc is None:
+            stamps = pd.to_datetime(np.char.decode(self.times), format="ISO8601")
+        else:
+            stamps = self.times.astype(f"S{self._width or 10}").astype("datetime64[ns]")
+        index = pd.DatetimeIndex(stamps, name="Date")
+        if utc:
+            index = index.tz_localize("UTC")
+
+        df = pd.DataFrame(self.prices, index=index, columns=self.PRICE_COLUMNS, copy=False)
+        volume = self.volume
+        if np.isfinite(volume).all() and (volume % 1 == 0).all():
+            volume = volume.astype(np.int64)
+        df["volume"] = volume
+        if not index.is_monotonic_increasing:
+            df.sort_index(inplace=True)
+        return df
@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tools.cache import get_cache_dir
+from tools.streaming import parse_times
+
+# Column order of the stored OHLCV matrix
+PRICE_COLUMNS = ["open", "close", "high", "low", "volume"]
+
+
+class PriceWarehouse:
+    """
+    Columnar store of daily OHLCV bars backed by memory-mapped NumPy files.
+
+    Each ticker is a directory holding `dates.npy` (datetime64[ns], UTC for
+    timezone-aware bars), `ohlcv.npy`, a float64 matrix with one contiguous row
+    per column in PRICE_COLUMNS, `times.npy` with the bars' original timestamps
+    and `meta.json` recording the timezone of the index. Loading maps the files
+    instead of reading them, so the price columns of DataFrames returned by
+    `load` are views onto the page cache rather than copies.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else get_cache_dir() / "warehouse"
+
+    def _dir(self, ticker: str) -> Path:
+        return self.root / ticker.upper()
+
+    def tickers(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "dates.npy").exists())
+
+    def has(self, ticker: str) -> bool:
+        return (self._dir(ticker) / "dates.npy").exists()
+
+    def write(self, ticker: str, prices: List[Dict[str, Any]]) -> int:
+        """
+        Merge price bars into the ticker's columns, replacing bars with equal dates.
+
+        Args:
+            ticker: Stock ticker symbol
+            prices: Price bars as returned by get_prices
+
+        Returns:
+            int: Number of bars stored for the ticker
+        """
+        # Parsed exactly as prices_to_df does, so loaded frames have the same index
+        times = [p["time"] for p in prices]
+        index = parse_times(times)
+        tz = None if index.tz is None else str(index.tz)
+        if tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        dates = index.values.astype("datetime64[ns]")
+        times = np.array(times, dtype=str)
+        values = np.array(
+            [[np.nan if p.get(col) is None else p[col] for p in prices] for col in PRICE_COLUMNS],
+            dtype=np.float64,
+        ).reshape(len(PRICE_COLUMNS), len(prices))
+
+        if self.has(ticker):
+            old_tz = self._tz(ticker)
+            if old_tz != tz:
+                raise ValueError(
+                    f"Bars for {ticker} are stored with timezone {old_tz}, got bars with {tz}"
+                )
+            old_dates, old_values = self._open(ticker, mmap_mode=None)
+            old_times = self._times(ticker, old_dates)
+            keep = ~np.isin(old_dates, dates)
+            dates = np.concatenate([old_dates[keep], dates])
+            values = np.concatenate([old_values[:, keep], values], axis=1)
+            times = np.concatenate([old_times[keep], times])
+
+        order = np.argsort(dates, kind="stable")
+        self._save(
+            ticker, dates[order], np.ascontiguousarray(values[:, order]), times[order], tz
+        )
+        return len(dates)
+
+    def _save(
+        self,
+        ticker: str,
+        dates: np.ndarray,
+        values: np.ndarray,
+        times: np.ndarray,
+        tz: Optional[str],
+    ) -> None:
+        directory = self._dir(ticker)
+        tmp_dir = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        np.save(tmp_dir / "dates.npy", dates)
+        np.save(tmp_dir / "ohlcv.npy", values)
+        np.save(tmp_dir / "times.npy", times)
+        with open(tmp_dir / "meta.json", "w") as f:
+            json.dump({"tz": tz}, f)
+        # Swap the whole directory so readers never see mismatched columns
+        if directory.exists():
+            old_dir = directory.with_name(f"{directory.name}.{os.getpid()}.old")
+            os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir)
+        else:
+            os.replace(tmp_dir, directory)
+
+    def _open(self, ticker: str, mmap_mode: Optional[str] = "r"):
+        directory = self._dir(ticker)
+        dates = np.load(directory / "dates.npy", mmap_mode=mmap_mode)
+        values = np.load(directory / "ohlcv.npy", mmap_mode=mmap_mode)
+        if values.shape != (len(PRICE_COLUMNS), len(dates)):
+            raise ValueError(f"Corrupt warehouse entry for {ticker}")
+        return dates, values
+
+    def _tz(self, ticker: str) -> Optional[str]:
+        path = self._dir(ticker) / "meta.json"
+        if not path.exists():
+            # Entries written before timezones were recorded hold UTC dates
+            return "UTC"
+        with open(path) as f:
+            return json.load(f)["tz"]
+
+    def _times(self, ticker: str, dates: np.ndarray) -> np.ndarray:
+        path = self._dir(ticker) / "times.npy"
+        if path.exists():
+            return np.load(path)
+        return np.char.add(np.datetime_as_string(dates, unit="s"), "Z")
+
+    def load(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Return bars for [start_date, end_date] in the same shape as prices_to_df.
+
+        The frame is indexed by `Date` with the open, close, high, low and volume
+        columns. The price columns are zero-copy, read-only views of the
+        memory-mapped files; volume is stored as float64 and, as in
+        prices_to_df, converted to int64 when every value is a whole number.
+        """
+        if not self.has(ticker):
+            raise ValueError(f"No price data in warehouse for {ticker}")
+        dates, values = self._open(ticker)
+
+        lo, hi = _bounds(dates, start_date, end_date)
+        index = pd.DatetimeIndex(dates[lo:hi], name="Date")
+        tz = self._tz(ticker)
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        # (n, 4) view whose columns are the contiguous rows of the stored matrix
+        df = pd.DataFrame(values[:4, lo:hi].T, index=index, columns=PRICE_COLUMNS[:4], copy=False)
+        volume = values[4, lo:hi]
+        if np.isfinite(volume).all() and (volume % 1 == 0).all():
+            volume = volume.astype(np.int64)
+        df["volume"] = volume
+        return df
+
+    def prices(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return bars for [start_date, end_date] in the format returned by get_prices."""
+        df = self.load(ticker, start_date, end_date)
+        dates, _ = self._open(ticker)
+        lo, hi = _bounds(dates, start_date, end_date)
+        times = self._times(ticker, dates)[lo:hi].tolist()
+        columns = [df[col].tolist() for col in PRICE_COLUMNS]
+        return [
+            {"time": time, **dict(zip(PRICE_COLUMNS, bar))}
+            for time, bar in zip(times, zip(*columns))
+        ]
+
+
+def _bounds(dates: np.ndarray, start_date: Optional[str], end_date: Optional[str]):
+    # Positions of the first bar on or after start_date and past the last one on or before end_date
+    lo = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date), "left")
+    hi = len(dates) if end_date is None else np.searchsorted(
+        dates, np.datetime64(end_date) + np.timedelta64(1, "D"), "left"
+    )
+    return lo, hi
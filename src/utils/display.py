@@ -148,3 +148,83 @@ def format_backtest_row(
         f"{Fore.RED}{bearish_count}{Style.RESET_ALL}",
         f"{Fore.BLUE}{neutral_count}{Style.RESET_ALL}",
     ]
+
+
+def print_request_stats(stats: Dict[str, int]) -> None:
+    """
+    Print how many API requests were coalesced during a run.
+
+    Args:
+        stats (Dict[str, int]): Hit and miss counters from the request scope
+    """
+    hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+    print(
+        f"\n{Fore.WHITE}{Style.BRIGHT}API Requests:{Style.RESET_ALL} "
+        f"{Fore.CYAN}{misses} sent{Style.RESET_ALL}, "
+        f"{Fore.GREEN}{hits} deduplicated{Style.RESET_ALL}"
+    )
+
+
+def print_backtest_report(report: List[Dict]) -> None:
+    """
+    Print the per-ticker and combined performance of a multi-ticker backtest.
+
+    Args:
+        report (List[Dict]): Rows with ticker, final_value, total_return,
+            sharpe_ratio and max_drawdown, the combined portfolio last
+    """
+    table_data = []
+    for row in report:
+        return_color = Fore.GREEN if row["total_return"] >= 0 else Fore.RED
+        table_data.append(
+            [
+                f"{Fore.CYAN}{row['ticker']}{Style.RESET_ALL}",
+                f"{Fore.YELLOW}{row['final_value']:.2f}{Style.RESET_ALL}",
+                f"{return_color}{row['total_return'] * 100:.2f}%{Style.RESET_ALL}",
+                f"{Fore.WHITE}{row['sharpe_ratio']:.2f}{Style.RESET_ALL}",
+                f"{Fore.RED}{row['max_drawdown'] * 100:.2f}%{Style.RESET_ALL}",
+            ]
+        )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}BACKTEST REPORT:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            table_data,
+            headers=["Ticker", "Final Value", "Return", "Sharpe Ratio", "Max Drawdown"],
+            tablefmt="grid",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
+
+
+def print_sweep_results(results: List[Dict], parameters: List[str], top: int = 10) -> None:
+    """
+    Print the best combinations of a parameter sweep.
+
+    Args:
+        results (List[Dict]): Ranked sweep results, as returned by run_sweep
+        parameters (List[str]): Swept parameters, as "group.name"
+        top (int): Number of combinations to show
+    """
+    table_data = []
+    for rank, row in enumerate(results[:top], start=1):
+        values = [row[group][name] for group, _, name in (p.partition(".") for p in parameters)]
+        return_color = Fore.GREEN if row["total_return"] >= 0 else Fore.RED
+        table_data.append(
+            [rank]
+            + values
+            + [
+                f"{return_color}{row['total_return'] * 100:.2f}%{Style.RESET_ALL}",
+                f"{Fore.WHITE}{row['sharpe_ratio']:.2f}{Style.RESET_ALL}",
+                f"{Fore.RED}{row['max_drawdown'] * 100:.2f}%{Style.RESET_ALL}",
+            ]
+        )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}TOP {len(table_data)} OF {len(results)} COMBINATIONS:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            table_data,
+            headers=["Rank"] + parameters + ["Return", "Sharpe Ratio", "Max Drawdown"],
+            tablefmt="grid",
+        )
+    )
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modules import each other as top-level packages (e.g. `from tools.api import ...`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def synthetic_prices(n=300, seed=0, start="2023-01-02"):
+    """Random-walk daily bars shaped like prices_to_df output."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spread = close * rng.uniform(0.002, 0.03, n)
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "close": close,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "volume": rng.integers(500_000, 5_000_000, n),
+        },
+        index=pd.bdate_range(start, periods=n, name="Date"),
+    )
+
+
+@pytest.fixture
+def make_prices():
+    return synthetic_prices
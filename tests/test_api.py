@@ -0,0 +1,76 @@
+import pytest
+
+import main
+from tools import api
+from tools.cache import FundamentalsCache
+from tools.mock_server import MockFinancialDatasetsServer
+from tools.scope import request_scope
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL"]
+LINE_ITEMS = ["free_cash_flow", "net_income"]
+LINE_ITEMS_POST = "/financials/search/line-items 200"
+
+
+@pytest.fixture
+def mock_api(tmp_path, monkeypatch):
+    with MockFinancialDatasetsServer() as server:
+        monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+        monkeypatch.setattr(api, "_fundamentals_cache", FundamentalsCache(tmp_path))
+        yield server
+
+
+def valuation_run(ticker, start_date, end_date, portfolio, tickers):
+    """Fetch line items the way the valuation agent does within one run."""
+    with request_scope():
+        return api.search_line_items_batch(
+            tickers=tickers, line_items=LINE_ITEMS, period="ttm", limit=2, end_date=end_date
+        )[ticker]
+
+
+def test_runs_over_a_universe_send_one_batch(mock_api, monkeypatch):
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "0")
+    monkeypatch.setattr(main, "run_hedge_fund", valuation_run)
+
+    results, stats = main.run_hedge_fund_for_tickers(TICKERS, "2024-01-02", "2024-03-01", {})
+
+    assert list(results) == TICKERS
+    assert all(len(reports) == 2 for reports in results.values())
+    assert mock_api.stats[LINE_ITEMS_POST] == 1
+    assert stats == {"hits": len(TICKERS) - 1, "misses": 1}
+
+
+def test_batched_line_items_are_cached(mock_api, monkeypatch):
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "1")
+
+    batch = api.search_line_items_batch(TICKERS, LINE_ITEMS, "ttm", 2, end_date="2024-03-01")
+    assert mock_api.stats[LINE_ITEMS_POST] == 1
+
+    # Per-ticker queries and later batches are answered from the cache
+    for ticker in TICKERS:
+        reports = api.search_line_items(ticker, LINE_ITEMS, "ttm", 2, end_date="2024-03-01")
+        assert reports == batch[ticker]
+        assert all(r["report_period"] <= "2024-03-01" for r in reports)
+    assert api.search_line_items_batch(TICKERS, LINE_ITEMS, "ttm", 1, end_date="2023-12-31") == {
+        ticker: batch[ticker][:1] for ticker in TICKERS
+    }
+    assert mock_api.stats[LINE_ITEMS_POST] == 1
+
+    # Only tickers missing from the cache are requested
+    api.search_line_items_batch(TICKERS + ["META"], LINE_ITEMS, "ttm", 2, end_date="2024-03-01")
+    assert mock_api.stats[LINE_ITEMS_POST] == 2
+
+
+@pytest.mark.parametrize("facts, market_cap", [({"market_cap": 1_000.0}, 500.0), ({"market_cap": None}, None)])
+def test_past_market_cap_without_reported_shares(monkeypatch, facts, market_cap):
+    monkeypatch.setattr(api, "search_line_items", lambda *args, **kwargs: [{"outstanding_shares": None}])
+    monkeypatch.setattr(api, "_get_company_facts", lambda ticker: facts)
+    # Closed at 5 on the day asked about and at 10 today
+    monkeypatch.setattr(api, "_last_close", lambda ticker, end_date: 5.0 if end_date == "2020-01-02" else 10.0)
+
+    if market_cap is None:
+        with pytest.raises(ValueError, match="No market cap returned"):
+            api.get_market_cap("AAPL", "2020-01-02")
+        with pytest.raises(ValueError, match="No market cap returned"):
+            api.get_market_cap("AAPL")
+    else:
+        assert api.get_market_cap("AAPL", "2020-01-02") == pytest.approx(market_cap)
@@ -0,0 +1,31 @@
+import asyncio
+import inspect
+
+import pytest
+
+from tools import api, async_api
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "get_financial_metrics",
+        "search_line_items",
+        "get_insider_trades",
+        "get_market_cap",
+        "get_prices",
+        "get_price_data",
+    ],
+)
+def test_signatures_mirror_the_sync_api(name):
+    assert inspect.signature(getattr(async_api, name)) == inspect.signature(getattr(api, name))
+
+
+def test_search_line_items_forwards_every_argument(monkeypatch):
+    calls = []
+    monkeypatch.setattr(api, "search_line_items", lambda *args: calls.append(args) or [])
+
+    asyncio.run(
+        async_api.search_line_items("AAPL", ["net_income"], "annual", 3, end_date="2024-03-01")
+    )
+    assert calls == [("AAPL", ["net_income"], "annual", 3, "2024-03-01")]
@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backtester import Backtester, default_checkpoint_path, execute_trade
+from tools.mock_server import MockFinancialDatasetsServer
+
+
+@pytest.mark.parametrize(
+    "action, quantity, traded, portfolio",
+    [
+        ("buy", 10, 10, {"cash": 0.0, "stock": 15}),
+        # Cut to what the cash affords
+        ("buy", 50, 10, {"cash": 0.0, "stock": 15}),
+        ("sell", 3, 3, {"cash": 1300.0, "stock": 2}),
+        # Cut to the shares held
+        ("sell", 50, 5, {"cash": 1500.0, "stock": 0}),
+        ("hold", 10, 0, {"cash": 1000.0, "stock": 5}),
+        ("buy", 0, 0, {"cash": 1000.0, "stock": 5}),
+    ],
+)
+def test_execute_trade(action, quantity, traded, portfolio):
+    state = {"cash": 1000.0, "stock": 5}
+    assert execute_trade(state, action, quantity, 100.0) == traded
+    assert state == portfolio
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    with MockFinancialDatasetsServer() as server:
+        monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+        monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "0")
+        yield server
+
+
+def make_agent(fail_on=None):
+    """Trade the trend signal instead of calling the LLM, optionally failing on one day."""
+
+    def agent(ticker, start_date, end_date, portfolio, selected_analysts, technical_signals):
+        agent.calls.append(end_date)
+        if end_date == fail_on:
+            raise RuntimeError("LLM request failed")
+        trend = technical_signals["trend"]["signal"]
+        action = {"bullish": "buy", "bearish": "sell"}.get(trend, "hold")
+        return {
+            "decision": {"action": action, "quantity": 10},
+            "analyst_signals": {"technical_analyst": {"signal": trend, "confidence": 50}},
+        }
+
+    agent.calls = []
+    return agent
+
+
+def run(agent, checkpoint_path=None, resume=False):
+    backtester = Backtester(
+        agent,
+        "AAPL",
+        "2024-01-02",
+        "2024-02-05",
+        10_000,
+        show_progress=False,
+        checkpoint_path=checkpoint_path,
+    )
+    backtester.run_backtest(resume=resume)
+    return backtester
+
+
+def test_resume_after_failure_matches_uninterrupted_run(mock_api, tmp_path, monkeypatch, capsys):
+    reference = run(make_agent())
+    checkpoint_path = tmp_path / "AAPL.json.gz"
+
+    saves = []
+    save = Backtester.save_checkpoint
+    monkeypatch.setattr(
+        Backtester, "save_checkpoint", lambda self, rows: saves.append(len(rows)) or save(self, rows)
+    )
+    with pytest.raises(RuntimeError):
+        run(make_agent(fail_on="2024-01-19"), checkpoint_path)
+    # Every 10 days by default, and once more when the run stops
+    assert saves == [10, 13]
+    with gzip.open(checkpoint_path, "rt") as f:
+        assert len(json.load(f)["decisions"]) == 13
+
+    capsys.readouterr()
+    agent = make_agent()
+    resumed = run(agent, checkpoint_path, resume=True)
+    assert agent.calls[0] == "2024-01-19"
+    assert resumed.portfolio_values == reference.portfolio_values
+    assert resumed.portfolio == reference.portfolio
+    assert capsys.readouterr().out == ""
+    # A finished run leaves nothing to resume, so the same command can run again
+    assert not checkpoint_path.exists()
+
+
+def test_finished_run_removes_its_checkpoint(mock_api, tmp_path):
+    checkpoint_path = tmp_path / "AAPL.json.gz"
+    run(make_agent(), checkpoint_path)
+    assert not checkpoint_path.exists()
+
+
+def test_cli_keeps_the_checkpoint_of_an_interrupted_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("FINANCIAL_DATASETS_BASE_URL", raising=False)
+    checkpoint_path = default_checkpoint_path("AAPL", "2024-01-02", "2024-02-05")
+    checkpoint_path.parent.mkdir(parents=True)
+    checkpoint_path.write_bytes(b"saved progress")
+
+    script = Path(__file__).resolve().parent.parent / "src" / "backtester.py"
+    args = ["--ticker", "AAPL", "--start-date", "2024-01-02", "--end-date", "2024-02-05"]
+    python_path = os.pathsep.join([str(script.parent), os.environ.get("PYTHONPATH", "")])
+    result = subprocess.run(
+        [sys.executable, str(script), *args],
+        capture_output=True,
+        text=True,
+        stdin=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONPATH": python_path},
+    )
+
+    assert result.returncode == 2
+    assert "--resume" in result.stderr and "--fresh" in result.stderr
+    assert checkpoint_path.read_bytes() == b"saved progress"
@@ -0,0 +1,126 @@
+import pytest
+import requests
+
+from tools import client
+from tools.client import ApiClient, RateLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep, recording every sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(client.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(client.time, "sleep", clock.sleep)
+    return clock
+
+
+class StubSession:
+    """Answers requests with queued status codes, or raises queued exceptions."""
+
+    def __init__(self, outcomes, clock):
+        self.outcomes = list(outcomes)
+        self.clock = clock
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append(self.clock.now)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status_code, headers = outcome if isinstance(outcome, tuple) else (outcome, {})
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers)
+        response._content = b"{}"
+        response._content_consumed = True
+        return response
+
+
+def make_client(clock, outcomes, **kwargs):
+    api_client = ApiClient(backoff_base=1.0, **kwargs)
+    api_client.session = StubSession(outcomes, clock)
+    return api_client
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+def test_retries_honor_retry_after(clock, status_code):
+    api_client = make_client(clock, [(status_code, {"Retry-After": "7"}), 200])
+
+    assert api_client.get("https://example.com/prices/").status_code == 200
+    assert clock.sleeps == [7.0]
+
+
+def test_retry_after_is_capped(clock):
+    api_client = make_client(clock, [(429, {"Retry-After": "120"}), 200], backoff_max=30.0)
+
+    assert api_client.get("https://example.com/prices/").status_code == 200
+    assert clock.sleeps == [30.0]
+
+
+def test_backoff_without_retry_after_grows_with_full_jitter(clock, monkeypatch):
+    monkeypatch.setattr(client.random, "uniform", lambda low, high: high)
+    api_client = make_client(clock, [503, requests.ConnectionError(), 500, 200])
+
+    assert api_client.get("https://example.com/prices/").status_code == 200
+    assert clock.sleeps == [1.0, 2.0, 4.0]
+
+
+def test_gives_up_after_max_retries(clock):
+    api_client = make_client(clock, [500] * 3, max_retries=2)
+
+    assert api_client.get("https://example.com/prices/").status_code == 500
+    assert len(api_client.session.sent) == 3
+    assert not api_client.session.outcomes
+
+
+def test_connection_errors_raise_after_max_retries(clock):
+    api_client = make_client(clock, [requests.ConnectionError()] * 2, max_retries=1)
+
+    with pytest.raises(requests.ConnectionError):
+        api_client.get("https://example.com/prices/")
+    assert len(api_client.session.sent) == 2
+
+
+def test_other_errors_are_not_retried(clock):
+    api_client = make_client(clock, [404, 200])
+
+    assert api_client.get("https://example.com/prices/").status_code == 404
+    assert clock.sleeps == []
+
+
+def test_rate_limit_spaces_requests(clock):
+    api_client = make_client(clock, [200] * 5, rate_limit=2.0, burst=1.0)
+
+    for _ in range(5):
+        api_client.get("https://example.com/prices/")
+    assert api_client.session.sent == pytest.approx([0.0, 0.5, 1.0, 1.5, 2.0])
+
+
+def test_rate_limiter_allows_a_burst_then_refills(clock):
+    limiter = RateLimiter(rate=4.0, capacity=3.0)
+
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.now == 0.0
+    limiter.acquire()
+    assert clock.now == pytest.approx(0.25)
+
+    # Idle time refills the bucket, up to its capacity
+    clock.now += 10.0
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.now == pytest.approx(10.25)
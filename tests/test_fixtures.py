@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from tools import api, cache
+from tools.cache import FundamentalsCache, InsiderTradeStore, PriceCache
+from tools.client import ApiClient, set_client
+from tools.fixtures import FixtureStore, request_signature
+from tools.mock_server import MockFinancialDatasetsServer
+
+
+def test_concurrent_saves_of_one_signature(tmp_path):
+    store = FixtureStore(tmp_path)
+    signature = request_signature("GET", "https://example.com/prices/", {"ticker": "AAPL"})
+    contents = [f'{{"n": {i}, "pad": "{"x" * 10000}"}}'.encode() for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda content: store.save(signature, 200, content), contents))
+
+    status_code, content = store.load(signature)
+    assert status_code == 200
+    assert content in contents
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_signature_ignores_host_and_parameter_order():
+    a = request_signature("GET", "https://a.example/prices/?b=2", {"a": 1})
+    b = request_signature("get", "http://b.example/prices?a=1", {"b": "2"})
+    assert a == b
+
+
+class FrozenDate(date):
+    today_value = date(2024, 6, 3)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+@pytest.fixture
+def api_caches(monkeypatch):
+    """Point the API's caches at a new directory, as a fresh FINANCIAL_DATASETS_CACHE_DIR would."""
+
+    def use(root):
+        monkeypatch.setattr(api, "_price_cache", PriceCache(root / "prices"))
+        monkeypatch.setattr(api, "_fundamentals_cache", FundamentalsCache(root / "fundamentals"))
+        monkeypatch.setattr(api, "_insider_trade_store", InsiderTradeStore(root / "insider_trades"))
+
+    return use
+
+
+def fetch_everything():
+    return (
+        api.get_financial_metrics("AAPL", "2024-03-01", "ttm", 4),
+        api.search_line_items("AAPL", ["net_income"], "ttm", 2, end_date="2024-03-01"),
+        api.get_insider_trades("AAPL", "2024-03-01", 20),
+        api.get_prices("AAPL", "2024-01-02", "2024-02-29"),
+    )
+
+
+def test_replay_on_a_later_day(tmp_path, monkeypatch, api_caches):
+    monkeypatch.setattr(cache, "date", FrozenDate)
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "1")
+    fixtures = FixtureStore(tmp_path / "fixtures")
+    try:
+        with MockFinancialDatasetsServer() as server:
+            monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+            set_client(ApiClient(mode="record", fixtures=fixtures))
+            api_caches(tmp_path / "record")
+            recorded = fetch_everything()
+
+        # A month later, with a fresh cache and no server
+        monkeypatch.setattr(FrozenDate, "today_value", date(2024, 7, 3))
+        set_client(ApiClient(mode="replay", fixtures=fixtures))
+        api_caches(tmp_path / "replay")
+        assert fetch_everything() == recorded
+    finally:
+        set_client(None)
@@ -0,0 +1,34 @@
+from datetime import date
+
+from tools import cache
+from tools.cache import FundamentalsCache
+
+
+class FrozenDate(date):
+    today_value = date(2024, 1, 8)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_fundamentals_are_fetched_as_of_the_query_and_refreshed_when_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "date", FrozenDate)
+    reports = [{"report_period": "2023-09-30"}, {"report_period": "2023-12-31"}]
+    calls = []
+
+    def fetch(lte, limit):
+        calls.append(lte)
+        return [r for r in reports if r["report_period"] <= lte][::-1][:limit]
+
+    store = FundamentalsCache(tmp_path)
+    assert len(store.get_reports("AAPL", "metrics", "2024-01-08", 4, fetch)) == 2
+    assert calls == ["2024-01-08"]
+    # Earlier dates come from the cache
+    store.get_reports("AAPL", "metrics", "2023-12-31", 1, fetch)
+    assert calls == ["2024-01-08"]
+
+    monkeypatch.setattr(FrozenDate, "today_value", date(2024, 1, 9))
+    reports.append({"report_period": "2024-01-05"})
+    assert store.get_reports("AAPL", "metrics", "2024-01-08", 1, fetch) == [reports[-1]]
+    assert calls == ["2024-01-08", "2024-01-08"]
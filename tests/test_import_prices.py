@@ -0,0 +1,23 @@
+import asyncio
+
+from import_prices import import_prices
+from tools import api
+from tools.cache import PriceCache
+from tools.mock_server import MockFinancialDatasetsServer
+from tools.warehouse import PriceWarehouse
+
+
+def test_import_bypasses_the_price_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("FINANCIAL_DATASETS_CACHE", "1")
+    monkeypatch.setattr(api, "_price_cache", PriceCache(tmp_path / "prices"))
+    warehouse = PriceWarehouse(tmp_path / "warehouse")
+
+    with MockFinancialDatasetsServer() as server:
+        monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+        asyncio.run(import_prices(["AAPL", "MSFT"], "2024-01-02", "2024-03-01", warehouse))
+        bars = api._fetch_prices("AAPL", "2024-01-02", "2024-03-01")
+
+    assert warehouse.tickers() == ["AAPL", "MSFT"]
+    assert warehouse.prices("AAPL", "2024-01-02", "2024-03-01") == bars
+    assert not (tmp_path / "prices").exists()
+    assert f"AAPL: {len(bars)} bars fetched, {len(bars)} stored" in capsys.readouterr().out
@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+
+from tools import cache
+from tools.cache import InsiderTradeStore
+
+
+def make_api(trades):
+    """Fake insider-trades endpoint: newest first, at most `limit` trades."""
+    calls = []
+
+    def fetch(gte, lte, limit):
+        calls.append((gte, lte, limit))
+        window = [
+            t for t in trades if (gte is None or t["filing_date"] >= gte) and t["filing_date"] <= lte
+        ]
+        return sorted(window, key=lambda t: t["filing_date"], reverse=True)[:limit]
+
+    return fetch, calls
+
+
+def trade(day, shares=100):
+    return {"ticker": "AAPL", "filing_date": day, "transaction_shares": shares}
+
+
+@pytest.fixture
+def trades():
+    # Two identical records on the same day are two separate trades
+    return [
+        trade("2024-01-02"),
+        trade("2024-01-03", 50),
+        trade("2024-01-03", 50),
+        trade("2024-01-05"),
+        trade("2024-01-08", 10),
+    ]
+
+
+def test_identical_trades_are_kept(tmp_path, trades):
+    fetch, _ = make_api(trades)
+    store = InsiderTradeStore(tmp_path)
+    result = store.get_trades("AAPL", "2024-01-08", 10, fetch)
+    assert result == sorted(trades, key=lambda t: t["filing_date"], reverse=True)
+
+
+def test_catch_up_replaces_the_overlapping_day(tmp_path, trades):
+    fetch, calls = make_api(trades)
+    store = InsiderTradeStore(tmp_path)
+    store.get_trades("AAPL", "2024-01-03", 10, fetch)
+
+    # Stored high-water day is fetched again; it must not be double counted
+    entry = store._load("AAPL")
+    entry["high_water"] = "2024-01-03"
+    trades.append(trade("2024-01-09"))
+    result = store.get_trades("AAPL", "2099-01-01", 10, fetch)
+
+    assert calls[-1][0] == "2024-01-03"
+    assert result == sorted(trades, key=lambda t: t["filing_date"], reverse=True)
+
+
+@pytest.mark.parametrize("history_limit", [2, 3, 1000])
+def test_paging_keeps_every_trade(tmp_path, trades, history_limit):
+    fetch, _ = make_api(trades)
+    store = InsiderTradeStore(tmp_path, history_limit=history_limit)
+    result = store.get_trades("AAPL", "2099-01-01", 10, fetch)
+    assert result == sorted(trades, key=lambda t: t["filing_date"], reverse=True)
+
+
+def test_paging_steps_past_a_day_larger_than_a_page(tmp_path, trades):
+    fetch, _ = make_api(trades)
+    store = InsiderTradeStore(tmp_path, history_limit=1)
+    result = store.get_trades("AAPL", "2099-01-01", 10, fetch)
+    # 2024-01-03 has more trades than fit in a page, but older days are still reached
+    assert [t["filing_date"] for t in result] == [
+        "2024-01-08",
+        "2024-01-05",
+        "2024-01-03",
+        "2024-01-02",
+    ]
+
+
+class FrozenDate(date):
+    today_value = date(2024, 1, 8)
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+def test_fetches_are_bounded_by_the_query_date(tmp_path, trades, monkeypatch):
+    monkeypatch.setattr(cache, "date", FrozenDate)
+    fetch, calls = make_api(trades)
+    store = InsiderTradeStore(tmp_path)
+    store.get_trades("AAPL", "2024-01-05", 10, fetch)
+    assert calls == [(None, "2024-01-05", 1000)]
+
+
+def test_filings_since_the_last_fetch_are_refreshed_the_next_day(tmp_path, trades, monkeypatch):
+    monkeypatch.setattr(cache, "date", FrozenDate)
+    fetch, calls = make_api(trades)
+    store = InsiderTradeStore(tmp_path)
+    store.get_trades("AAPL", "2024-01-08", 10, fetch)
+
+    # Filed later on the day of the fetch
+    trades.append(trade("2024-01-08", 7))
+    assert len(store.get_trades("AAPL", "2024-01-08", 10, fetch)) == 5
+    assert len(calls) == 1
+
+    monkeypatch.setattr(FrozenDate, "today_value", date(2024, 1, 9))
+    # Historical queries are still answered from the store
+    store.get_trades("AAPL", "2024-01-05", 2, fetch)
+    assert len(calls) == 1
+    assert len(store.get_trades("AAPL", "2024-01-08", 10, fetch)) == 6
+    assert calls[-1] == ("2024-01-08", "2024-01-08", 1000)
+    store.get_trades("AAPL", "2024-01-08", 10, fetch)
+    assert len(calls) == 2
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import parallel_backtester
+from parallel_backtester import run_parallel_backtest
+from tools.warehouse import PriceWarehouse
+
+BARS = [
+    {"time": "2024-01-02 00:00:00 EST", "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0, "volume": 10}
+]
+
+
+def test_failed_warehouse_write_skips_only_that_ticker(monkeypatch, tmp_path):
+    async def gather_by_ticker(func, tickers, *args):
+        return {ticker: BARS for ticker in tickers}
+
+    write = PriceWarehouse.write
+
+    def failing_write(self, ticker, bars):
+        if ticker == "BAD":
+            raise OSError("No space left on device")
+        return write(self, ticker, bars)
+
+    monkeypatch.setattr(parallel_backtester.async_api, "gather_by_ticker", gather_by_ticker)
+    monkeypatch.setattr(PriceWarehouse, "write", failing_write)
+    # Run the workers in threads so the patched backtest is used
+    monkeypatch.setattr(
+        parallel_backtester,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+    monkeypatch.setattr(
+        parallel_backtester, "run_ticker_backtest", lambda ticker, *args: pd.Series([args[2]])
+    )
+
+    results, capital = run_parallel_backtest(
+        ["AAA", "BAD", "CCC"], "2024-01-02", "2024-01-05", 90_000, workers=1, warehouse_dir=tmp_path
+    )
+
+    assert list(results) == ["AAA", "CCC"]
+    assert capital == 45_000
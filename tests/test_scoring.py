@@ -0,0 +1,132 @@
+import pytest
+
+from agents.fundamentals import score_fundamentals
+from agents.risk_manager import calculate_position_limit
+from agents.sentiment import score_insider_trades
+from agents.valuation import score_valuation
+
+METRICS = {
+    "return_on_equity": 0.18,
+    "net_margin": 0.22,
+    "operating_margin": 0.12,
+    "revenue_growth": 0.08,
+    "earnings_growth": 0.12,
+    "book_value_growth": 0.05,
+    "current_ratio": 1.2,
+    "debt_to_equity": 0.4,
+    "free_cash_flow_per_share": 5.0,
+    "earnings_per_share": 6.0,
+    "price_to_earnings_ratio": 28.0,
+    "price_to_book_ratio": 2.5,
+    "price_to_sales_ratio": 6.0,
+}
+
+LINE_ITEMS = [
+    {
+        "free_cash_flow": 9e9,
+        "net_income": 1e10,
+        "depreciation_and_amortization": 2e9,
+        "capital_expenditure": 3e9,
+        "working_capital": 5e9,
+    },
+    {
+        "free_cash_flow": 8e9,
+        "net_income": 9e9,
+        "depreciation_and_amortization": 1.8e9,
+        "capital_expenditure": 2.5e9,
+        "working_capital": 4e9,
+    },
+]
+
+MARKET_CAP = 1.5e11
+
+
+def test_score_fundamentals_defaults():
+    assert score_fundamentals(METRICS) == (
+        "bullish",
+        75.0,
+        {
+            "profitability_signal": {
+                "signal": "bullish",
+                "details": "ROE: 18.00%, Net Margin: 22.00%, Op Margin: 12.00%",
+            },
+            "growth_signal": {
+                "signal": "neutral",
+                "details": "Revenue Growth: 8.00%, Earnings Growth: 12.00%",
+            },
+            "financial_health_signal": {
+                "signal": "bullish",
+                "details": "Current Ratio: 1.20, D/E: 0.40",
+            },
+            "price_ratios_signal": {
+                "signal": "bullish",
+                "details": "P/E: 28.00, P/B: 2.50, P/S: 6.00",
+            },
+        },
+    )
+
+
+def test_score_fundamentals_overrides():
+    # Loosening the growth thresholds turns the growth aspect bullish
+    signal, confidence, reasoning = score_fundamentals(
+        METRICS, {"revenue_growth": 0.05, "book_value_growth": 0.04}
+    )
+    assert reasoning["growth_signal"]["signal"] == "bullish"
+    assert (signal, confidence) == ("bullish", 100.0)
+
+
+def test_score_valuation_defaults():
+    assert score_valuation(METRICS, LINE_ITEMS, MARKET_CAP) == (
+        "bearish",
+        26.0,
+        {
+            "dcf_analysis": {
+                "signal": "neutral",
+                "details": "Intrinsic Value: $171,810,903,626.80, Market Cap: $150,000,000,000.00, Gap: 14.5%",
+            },
+            "owner_earnings_analysis": {
+                "signal": "bearish",
+                "details": "Owner Earnings Value: $50,166,887,683.48, Market Cap: $150,000,000,000.00, Gap: -66.6%",
+            },
+        },
+    )
+
+
+def test_score_valuation_overrides():
+    signal, confidence, _ = score_valuation(METRICS, LINE_ITEMS, MARKET_CAP, {"gap_threshold": 0.3})
+    assert (signal, confidence) == ("neutral", 26.0)
+
+
+@pytest.mark.parametrize(
+    "score",
+    [
+        lambda: score_fundamentals(METRICS, {"return_on_equity": 0.1, "roe": 0.1}),
+        lambda: score_valuation(METRICS, LINE_ITEMS, MARKET_CAP, {"discount": 0.1}),
+    ],
+    ids=["fundamentals", "valuation"],
+)
+def test_unknown_overrides_raise(score):
+    with pytest.raises(ValueError, match="Unknown"):
+        score()
+
+
+def test_score_insider_trades():
+    trades = [
+        {"transaction_shares": 1000},
+        {"transaction_shares": -500},
+        {"transaction_shares": 200},
+        {"transaction_shares": None},
+    ]
+    assert score_insider_trades(trades) == (
+        "bullish",
+        67.0,
+        "Bullish signals: 2, Bearish signals: 1",
+    )
+    assert score_insider_trades([])[:2] == ("neutral", 0)
+
+
+def test_calculate_position_limit():
+    # 20% of the portfolio
+    assert calculate_position_limit(150.0, 1_000_000, 100_000) == 20_000
+    # 10% of the average daily dollar volume
+    assert calculate_position_limit(10.0, 10_000, 100_000) == 10_000
@@ -0,0 +1,55 @@
+import json
+
+import pandas as pd
+import pytest
+
+from tools import api
+from tools.api import get_price_data, prices_to_df
+
+
+class FakeResponse:
+    def __init__(self, content, fail_after=None):
+        self.content = content
+        self.headers = {"Content-Length": str(len(content))}
+        self.status_code = 200
+        self.fail_after = fail_after
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), 16):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.content[i : i + 16]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+BARS = [
+    {"time": f"2024-01-0{d} 00:00:00 EST", "open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 100}
+    for d in range(2, 6)
+]
+
+
+@pytest.fixture
+def response(monkeypatch):
+    fake = FakeResponse(json.dumps({"prices": BARS}).encode())
+    monkeypatch.setattr(api, "_request_prices", lambda *args, **kwargs: fake)
+    return fake
+
+
+def test_streamed_prices_match_and_close_the_response(response):
+    df = get_price_data("AAPL", "2024-01-01", "2024-01-31", stream=True)
+    expected = prices_to_df(BARS).drop(columns="time")
+    pd.testing.assert_frame_equal(df, expected)
+    assert response.closed
+
+
+def test_response_is_closed_when_parsing_fails(response):
+    response.fail_after = 32
+    with pytest.raises(ConnectionError):
+        get_price_data("AAPL", "2024-01-01", "2024-01-31", stream=True)
+    assert response.closed
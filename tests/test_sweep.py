@@ -0,0 +1,78 @@
+import contextlib
+
+import pytest
+
+import sweep
+from sweep import _init_worker, expand_grid, load_sweep_inputs, simulate
+
+
+def test_expand_grid():
+    combinations = expand_grid(
+        {"technical.trend": [0.1, 0.2], "valuation.discount_rate": [0.08, 0.1, 0.12]}
+    )
+    assert len(combinations) == 6
+    assert combinations[0] == {
+        "technical": {"trend": 0.1},
+        "fundamentals": {},
+        "valuation": {"discount_rate": 0.08},
+    }
+
+
+@pytest.mark.parametrize("key", ["technical.unknown", "unknown.trend", "valuation"])
+def test_expand_grid_rejects_unknown_parameters(key):
+    with pytest.raises(ValueError, match="Unknown sweep parameter"):
+        expand_grid({key: [1]})
+
+
+class FakeDataset:
+    def view(self, as_of):
+        return self
+
+
+def no_data(*args, **kwargs):
+    raise ValueError("No data returned")
+
+
+@pytest.fixture
+def offline_sweep(monkeypatch, make_prices):
+    """Serve load_sweep_inputs synthetic prices for every ticker but NOPE, and no fundamentals."""
+    prices_df = make_prices(200, start="2023-06-01")
+    bars = [
+        {"time": date.strftime("%Y-%m-%d"), **row}
+        for date, row in zip(prices_df.index, prices_df.to_dict("records"))
+    ]
+
+    def get_prices(ticker, *args):
+        if ticker == "NOPE":
+            raise ValueError("No price data returned")
+        return bars
+
+    monkeypatch.setattr(sweep.HistoricalDataset, "load", lambda *args, **kwargs: FakeDataset())
+    monkeypatch.setattr(sweep, "dataset_scope", lambda dataset: contextlib.nullcontext())
+    monkeypatch.setattr(sweep, "get_prices", get_prices)
+    for name in ["get_financial_metrics", "search_line_items", "get_market_cap", "get_insider_trades"]:
+        monkeypatch.setattr(sweep, name, no_data)
+
+
+def test_days_without_fundamentals_score_neutral(offline_sweep):
+    inputs = load_sweep_inputs(["AAPL"], "2024-01-02", "2024-01-31")
+
+    days = inputs["AAPL"]
+    assert len(days) == 22
+    for day in days:
+        assert day["metrics"] is None
+        assert day["line_items"] is None
+        assert day["market_cap"] is None
+        assert day["sentiment"] == ("neutral", 0)
+
+    _init_worker(inputs)
+    values = simulate("AAPL", expand_grid({})[0], 10_000)
+    assert len(values) == len(days)
+    assert values.iloc[0] == pytest.approx(10_000)
+
+
+def test_tickers_without_prices_are_skipped(offline_sweep, capsys):
+    inputs = load_sweep_inputs(["AAPL", "NOPE"], "2024-01-02", "2024-01-31")
+
+    assert list(inputs) == ["AAPL"]
+    assert "NOPE: no price data, skipped (No price data returned)" in capsys.readouterr().out
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.technicals import (
+    TECHNICAL_STRATEGIES,
+    TechnicalSignalHistory,
+    calculate_hurst_exponent,
+    calculate_rolling_hurst,
+    calculate_rolling_moments,
+    compute_technical_signals,
+    weighted_signal_combination,
+)
+from agents.technicals_panel import (
+    calculate_panel_signals,
+    combine_panel_signals,
+    price_panel,
+    ticker_signals,
+)
+from agents.technicals_stream import IndicatorEngine
+
+RTOL = 1e-6
+ATOL = 1e-9
+
+
+def assert_signals_match(actual, expected):
+    """Same signals, confidences and metrics as compute_technical_signals, up to rounding."""
+    assert actual.keys() == expected.keys()
+    for name, want in expected.items():
+        got = actual[name]
+        assert got["signal"] == want["signal"], name
+        np.testing.assert_allclose(
+            got["confidence"], want["confidence"], rtol=RTOL, atol=ATOL, err_msg=name
+        )
+        assert got["metrics"].keys() == want["metrics"].keys(), name
+        np.testing.assert_allclose(
+            list(got["metrics"].values()),
+            list(want["metrics"].values()),
+            rtol=RTOL,
+            atol=ATOL,
+            err_msg=name,
+        )
+
+
+def test_indicator_engine_matches_batch_at_every_bar(make_prices):
+    prices_df = make_prices(200)
+    engine = IndicatorEngine()
+    for t, (high, low, close, volume) in enumerate(
+        prices_df[["high", "low", "close", "volume"]].itertuples(index=False), start=1
+    ):
+        engine.update(high, low, close, volume)
+        assert_signals_match(engine.signals(), compute_technical_signals(prices_df.iloc[:t]))
+
+
+def test_indicator_engine_update_df_only_feeds_new_bars(make_prices):
+    prices_df = make_prices(160, seed=1)
+    engine = IndicatorEngine()
+    assert engine.update_df(prices_df.iloc[:100]) == 100
+    assert engine.update_df(prices_df.iloc[:130]) == 30
+    assert engine.update_df(prices_df) == 30
+    assert engine.update_df(prices_df) == 0
+    assert_signals_match(engine.signals(), compute_technical_signals(prices_df))
+
+
+@pytest.fixture
+def prices_by_ticker(make_prices):
+    full = make_prices(300, seed=2)
+    return {
+        "AAA": full,
+        "BBB": make_prices(300, seed=3),
+        # Starts later than the others: leading NaNs in the panel
+        "CCC": make_prices(180, seed=4, start=full.index[120].strftime("%Y-%m-%d")),
+        # Shorter than the warmup, so several indicators are undefined
+        "DDD": make_prices(60, seed=5, start=full.index[240].strftime("%Y-%m-%d")),
+    }
+
+
+def test_panel_signals_match_each_ticker_alone(prices_by_ticker):
+    panel = calculate_panel_signals(**price_panel(prices_by_ticker))
+    for ticker, prices_df in prices_by_ticker.items():
+        assert_signals_match(ticker_signals(panel, ticker), compute_technical_signals(prices_df))
+
+
+def test_combined_panel_signals_match_weighted_combination(prices_by_ticker):
+    weights = {name: strategy.weight for name, strategy in TECHNICAL_STRATEGIES.items()}
+    combined = combine_panel_signals(calculate_panel_signals(**price_panel(prices_by_ticker)), weights)
+    for ticker, prices_df in prices_by_ticker.items():
+        expected = weighted_signal_combination(compute_technical_signals(prices_df), weights)
+        assert combined.loc[ticker, "signal"] == expected["signal"], ticker
+        np.testing.assert_allclose(
+            combined.loc[ticker, "confidence"], expected["confidence"], rtol=RTOL, atol=ATOL
+        )
+
+
+@pytest.mark.parametrize("window", [None, 63])
+def test_rolling_hurst_matches_single_estimates(make_prices, window):
+    close = make_prices(200, seed=6)["close"]
+    rolling = calculate_rolling_hurst(close, window=window)
+    assert rolling.index.equals(close.index)
+    starts = [0 if window is None else max(0, t + 1 - window) for t in range(len(close))]
+    expected = [calculate_hurst_exponent(close.iloc[start : t + 1]) for t, start in enumerate(starts)]
+    np.testing.assert_allclose(rolling.to_numpy(), expected, rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize("tz", [None, "UTC"])
+def test_signal_history_matches_recomputation(make_prices, tz):
+    prices_df = make_prices(180, seed=7)
+    if tz:
+        prices_df.index = prices_df.index.tz_localize(tz)
+    history = TechnicalSignalHistory(prices_df)
+    bar_dates = pd.DatetimeIndex(prices_df.index.date)
+    # Calendar days, so weekends read the Friday bar
+    for date in pd.date_range("2023-01-02", "2023-09-30"):
+        expected = compute_technical_signals(prices_df[bar_dates <= date])
+        assert_signals_match(history.at(date.strftime("%Y-%m-%d")), expected)
+
+
+def test_signal_history_before_first_bar_raises(make_prices):
+    history = TechnicalSignalHistory(make_prices(30))
+    with pytest.raises(ValueError):
+        history.at("2022-12-30")
+
+
+def rolling_series():
+    rng = np.random.default_rng(8)
+    values = 1e4 + np.cumsum(rng.normal(0, 1, 600))
+    values[100:130] = values[100]  # flat run longer than the shorter windows
+    values[300:305] = np.nan  # gap
+    values[400] = np.nan
+    return pd.Series(values)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [rolling_series(), rolling_series().iloc[:40], rolling_series().pct_change(fill_method=None)],
+    ids=["levels", "shorter_than_window", "returns"],
+)
+def test_rolling_moments_match_pandas(series):
+    windows = {4: 4, 21: 2, 63: 4, 126: 1}
+    moments = calculate_rolling_moments(series, windows)
+    for window, moment in windows.items():
+        stats = ["sum", "mean", "std", "skew", "kurt"][: moment + 1]
+        rolling = series.rolling(window)
+        for stat in stats:
+            np.testing.assert_allclose(
+                moments[window][stat],
+                getattr(rolling, stat)().to_numpy(),
+                rtol=RTOL,
+                atol=ATOL,
+                err_msg=f"{stat} over {window}",
+            )
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from tools.api import prices_to_df
+from tools.warehouse import PriceWarehouse
+
+TIME_FORMATS = {
+    "est": "{day} 00:00:00 EST",
+    "utc": "{day}T05:00:00Z",
+    "date": "{day}",
+}
+
+
+def make_bars(days, time_format, volume_offset=0.0):
+    return [
+        {
+            "time": time_format.format(day=day),
+            "open": 100.0 + i,
+            "close": 101.0 + i,
+            "high": 102.0 + i,
+            "low": 99.0 + i,
+            "volume": 1_000_000 + i + volume_offset,
+        }
+        for i, day in enumerate(days)
+    ]
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return PriceWarehouse(tmp_path)
+
+
+@pytest.mark.parametrize("time_format", TIME_FORMATS.values(), ids=TIME_FORMATS.keys())
+def test_round_trip_matches_prices_to_df(warehouse, time_format):
+    days = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-01-02", periods=10)]
+    bars = make_bars(days, time_format)
+    warehouse.write("AAPL", bars)
+
+    expected = prices_to_df(bars)
+    pd.testing.assert_frame_equal(warehouse.load("AAPL"), expected.drop(columns="time"))
+    assert warehouse.prices("AAPL") == bars
+    pd.testing.assert_frame_equal(prices_to_df(warehouse.prices("AAPL")), expected)
+
+
+@pytest.mark.parametrize("time_format", TIME_FORMATS.values(), ids=TIME_FORMATS.keys())
+def test_date_range_selects_bars_by_day(warehouse, time_format):
+    days = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-01-02", periods=10)]
+    warehouse.write("AAPL", make_bars(days, time_format))
+
+    bars = warehouse.prices("AAPL", "2024-01-04", "2024-01-09")
+    assert [bar["time"][:10] for bar in bars] == days[2:6]
+    assert len(warehouse.load("AAPL", "2024-01-04", "2024-01-09")) == 4
+
+
+def test_write_merges_and_replaces_overlapping_bars(warehouse):
+    days = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2024-01-02", periods=10)]
+    warehouse.write("AAPL", make_bars(days[:6], TIME_FORMATS["est"]))
+    newer = make_bars(days[4:], TIME_FORMATS["est"])
+    count = warehouse.write("AAPL", newer)
+
+    assert count == 10
+    bars = warehouse.prices("AAPL")
+    assert [bar["time"][:10] for bar in bars] == days
+    assert bars[4:] == newer
+
+
+def test_fractional_volume_stays_float(warehouse):
+    bars = make_bars(["2024-01-02", "2024-01-03"], TIME_FORMATS["est"], volume_offset=0.5)
+    warehouse.write("AAPL", bars)
+
+    df = warehouse.load("AAPL")
+    assert df["volume"].dtype == "float64"
+    pd.testing.assert_frame_equal(df, prices_to_df(bars).drop(columns="time"))
+
+
+def test_mixing_timezones_raises(warehouse):
+    warehouse.write("AAPL", make_bars(["2024-01-02"], TIME_FORMATS["est"]))
+    with pytest.raises(ValueError):
+        warehouse.write("AAPL", make_bars(["2024-01-03"], TIME_FORMATS["utc"]))